@@ -0,0 +1,69 @@
+"""Microbenchmark of Bosch message codec.
+
+Run: python benchmarks/codec_throughput.py [--messages 50000]
+
+Encodes GET and PUT requests with codec of every device type, parses them
+back like a test server does, and parses responses with and without
+Seq-No like connectors do. Reports messages per second of each step, so
+changes of framing or parsing might be compared.
+"""
+import argparse
+import time
+
+from bosch_thermostat_client.connectors.codec import (
+    EasycontrolCodec,
+    IVTCodec,
+    NefitCodec,
+    decode_request,
+    decode_response,
+    encode_response,
+)
+from bosch_thermostat_client.const import GET, PUT
+from bosch_thermostat_client.encryption import IVTEncryption
+
+ACCESS_KEY = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+PATH = "/heatingCircuits/hc1/temperatureRoomSetpoint"
+
+
+def rate(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def bench(codec_class, count, payload, body, with_seqno):
+    codec = codec_class()
+    gets = rate(lambda _: codec.encode_request(GET, PATH), range(count))
+    puts = rate(lambda _: codec.encode_request(PUT, PATH, payload), range(count))
+    requests = [codec.encode_request(GET, PATH).message for _ in range(count)]
+    parsed = rate(decode_request, requests)
+    responses = [
+        encode_response(200, "OK", body, seqno=i if with_seqno else None)
+        for i in range(count)
+    ]
+    decoded = rate(decode_response, responses)
+    name = codec_class.__name__
+    print(
+        f"{name:<17} encode GET {gets:9.0f}/s, PUT {puts:9.0f}/s, "
+        f"decode request {parsed:9.0f}/s, response {decoded:9.0f}/s"
+    )
+
+
+def main(count):
+    encryption = IVTEncryption(ACCESS_KEY)
+    payload = encryption.encrypt('{"value": 21.5}')
+    body = encryption.encrypt(
+        '{"id": "%s", "type": "floatValue", "value": 21.5}' % PATH
+    ).decode()
+    print(f"{count} messages per step")
+    bench(IVTCodec, count, payload, body, True)
+    bench(NefitCodec, count, payload, body, False)
+    bench(EasycontrolCodec, count, payload, body, True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000)
+    args = parser.parse_args()
+    main(args.messages)
@@ -0,0 +1,73 @@
+"""Benchmark of HttpConnector poll cycle against local gateway stand-in.
+
+Run: python benchmarks/http_concurrency.py [--refs 40] [--latency 0.05]
+
+Every request to the stand-in sleeps for given latency, so with strict serial
+communication cycle time is roughly refs * latency. It should drop as
+max_concurrency grows.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+from aiohttp import web
+
+from bosch_thermostat_client.connectors import HttpConnector
+from bosch_thermostat_client.encryption import IVTEncryption
+
+ACCESS_KEY = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+
+
+def create_app(encryption, latency):
+    async def handler(request):
+        await asyncio.sleep(latency)
+        payload = json.dumps({"id": request.path, "type": "floatValue", "value": 21.5})
+        return web.Response(
+            body=encryption.encrypt(payload), content_type="application/json"
+        )
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    return app
+
+
+async def run_cycle(connector, paths):
+    start = time.perf_counter()
+    await asyncio.gather(*[connector.get(path) for path in paths])
+    return time.perf_counter() - start
+
+
+async def main(refs, latency, cycles):
+    encryption = IVTEncryption(ACCESS_KEY)
+    runner = web.AppRunner(create_app(encryption, latency))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    paths = [f"/heatingCircuits/hc1/ref{i}" for i in range(refs)]
+    print(f"{refs} refs, {latency * 1000:.0f} ms per request, {cycles} cycles")
+    async with aiohttp.ClientSession() as session:
+        for max_concurrency in (1, 2, 4, 8, 16):
+            connector = HttpConnector(
+                host=f"127.0.0.1:{port}",
+                encryption=encryption,
+                loop=session,
+                max_concurrency=max_concurrency,
+            )
+            timings = [await run_cycle(connector, paths) for _ in range(cycles)]
+            print(
+                f"max_concurrency={max_concurrency:>2}: "
+                f"cycle {sum(timings) / len(timings) * 1000:8.1f} ms"
+            )
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--refs", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--cycles", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.refs, args.latency, args.cycles))
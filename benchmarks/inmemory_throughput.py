@@ -0,0 +1,125 @@
+"""Throughput of gateway operations over in-memory transport.
+
+Run: python benchmarks/inmemory_throughput.py [--circuits 4] [--latency 0.02]
+     [--cycles 3] [--encrypted]
+
+Builds synthetic IVT gateway (RC30, firmware 01.10.03) with given number of
+heating circuits and serves it from InMemoryTransport, so no sockets or real
+gateway are involved. Reports time of circuit update cycle and of full raw
+scan for several max_concurrency values.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from bosch_thermostat_client.connectors import InMemoryTransport
+from bosch_thermostat_client.const import HC
+from bosch_thermostat_client.encryption import IVTEncryption
+from bosch_thermostat_client.gateway.ivt import IVTGateway
+
+ACCESS_KEY = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+DB_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "bosch_thermostat_client", "db", "default", "011003.json"
+)
+
+
+def string_value(path, value, allowed=None):
+    response = {"id": path, "type": "stringValue", "value": value}
+    if allowed:
+        response["allowedValues"] = allowed
+    return response
+
+
+def ref_enum(path, children):
+    return {
+        "id": path,
+        "type": "refEnum",
+        "references": [{"id": child, "uri": f"http://127.0.0.1{child}"} for child in children],
+    }
+
+
+def build_responses(circuits):
+    responses = {
+        "/gateway/uuid": string_value("/gateway/uuid", "123456789"),
+        "/gateway/versionFirmware": string_value("/gateway/versionFirmware", "01.10.03"),
+        "/system/bus": string_value("/system/bus", "EMS"),
+        "/system/info": {"id": "/system/info", "type": "arrayData", "values": [{"Id": "67"}]},
+    }
+    with open(DB_FILE) as db_file:
+        refs = json.load(db_file)["heatingCircuits"]["refs"]
+    names = [f"/heatingCircuits/hc{i}" for i in range(1, circuits + 1)]
+    responses["/heatingCircuits"] = ref_enum("/heatingCircuits", names)
+    for name in names:
+        children = [f"{name}/{ref['id']}" for ref in refs.values()]
+        children += [f"{name}/operationMode", f"{name}/activeSwitchProgram"]
+        responses[name] = ref_enum(name, children)
+        for child in children:
+            responses[child] = {
+                "id": child,
+                "type": "floatValue",
+                "value": 21.5,
+                "unitOfMeasure": "C",
+                "minValue": 5,
+                "maxValue": 30,
+            }
+        responses[f"{name}/operationMode"] = string_value(
+            f"{name}/operationMode", "auto", ["day", "night", "auto", "off"]
+        )
+        responses[f"{name}/activeSwitchProgram"] = string_value(
+            f"{name}/activeSwitchProgram", "A", ["A", "B"]
+        )
+    return responses
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+
+async def main(circuits, latency, cycles, encrypted):
+    responses = build_responses(circuits)
+    print(
+        f"{circuits} circuits, {len(responses)} paths, "
+        f"{latency * 1000:.0f} ms per request, encrypted={encrypted}"
+    )
+    for max_concurrency in (1, 2, 4, 8):
+        transport = InMemoryTransport(
+            responses,
+            encryption=IVTEncryption(ACCESS_KEY),
+            latency=latency,
+            encrypted=encrypted,
+            max_concurrency=max_concurrency,
+            autotune=False,
+        )
+        gateway = IVTGateway(
+            session_type="HTTP", host="mem", access_token=ACCESS_KEY, connector=transport
+        )
+        await gateway.initialize()
+        await gateway.initialize_circuits(HC)
+        update = [
+            await timed(
+                asyncio.gather(*(circuit.update() for circuit in gateway.heating_circuits))
+            )
+            for _ in range(cycles)
+        ]
+        requests = transport.requests
+        scan = await timed(gateway.rawscan())
+        scanned = transport.requests - requests
+        print(
+            f"max_concurrency={max_concurrency}: "
+            f"update cycle {sum(update) / len(update) * 1000:8.1f} ms, "
+            f"rawscan {scanned / scan:8.1f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--circuits", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--encrypted", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.circuits, args.latency, args.cycles, args.encrypted))
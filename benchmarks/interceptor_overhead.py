@@ -0,0 +1,58 @@
+"""Microbenchmark of connector interceptor chain.
+
+Run: python benchmarks/interceptor_overhead.py [--calls 100000]
+
+Awaits GET through chains of 0 to 8 pass-through interceptors around a
+trivial terminal, then through InMemoryTransport with its stock chain
+alone and with extra interceptors. Reports time per call and the cost of
+one interceptor layer.
+"""
+import argparse
+import asyncio
+import time
+
+from bosch_thermostat_client.connectors import InMemoryTransport, Interceptor
+from bosch_thermostat_client.connectors.interceptors import build_chain
+
+
+class PassThrough(Interceptor):
+    async def get(self, path, call_next):
+        return await call_next(path)
+
+
+async def terminal(path):
+    return path
+
+
+async def timed(call, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        await call("/a")
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+async def main(calls):
+    print(f"{calls} calls each")
+    base = await timed(terminal, calls)
+    print(f"terminal alone        {base:8.0f} ns/call")
+    for layers in (0, 1, 4, 8):
+        chain = build_chain([PassThrough() for _ in range(layers)], "get", terminal)
+        took = await timed(chain, calls)
+        per_layer = f", {(took - base) / layers:5.0f} ns/layer" if layers else ""
+        print(f"chain of {layers}            {took:8.0f} ns/call{per_layer}")
+
+    responses = {"/a": {"id": "/a", "value": 1}}
+    transport = InMemoryTransport(responses)
+    stock = await timed(transport.get, calls // 10)
+    print(f"InMemoryTransport     {stock:8.0f} ns/call (stock chain)")
+    for _ in range(4):
+        transport.add_interceptor(PassThrough())
+    extra = await timed(transport.get, calls // 10)
+    print(f"  + 4 interceptors    {extra:8.0f} ns/call ({(extra - stock) / stock:+.1%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
@@ -0,0 +1,150 @@
+"""Benchmark of slixmpp and LiteXMPPClient on local XMPP server.
+
+Run: PYTHONPATH=. python benchmarks/xmpp_clients.py [--connections 50] [--messages 5000]
+
+Local test server runs in its own process. For both clients it reports
+memory allocated per connected IVT connector, rate of raw chat messages
+echoed through a single client, and rate of GETs through connector
+(which includes decryption of responses).
+"""
+import argparse
+import asyncio
+import gc
+import json
+import multiprocessing
+import time
+import tracemalloc
+
+from bosch_thermostat_client.connectors import IVTXMPPConnector
+from bosch_thermostat_client.connectors.codec import decode_request, encode_response
+from bosch_thermostat_client.encryption import IVTEncryption
+from tests.xmpp_test_server import XMPPTestServer, connect_to
+
+ACCESS_KEY = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+
+
+def cached_responder(encryption):
+    """Answer GETs with body encrypted once per path, so server keeps up."""
+    bodies = {}
+
+    def respond(message):
+        if not message.startswith(("GET", "PUT")):
+            return message
+        request = decode_request(message)
+        if request.path not in bodies:
+            data = {"id": request.path, "type": "floatValue", "value": 21.5}
+            bodies[request.path] = encryption.encrypt(json.dumps(data)).decode()
+        return encode_response(200, "OK", bodies[request.path], seqno=request.seqno)
+
+    return respond
+
+
+def serve(ports):
+    async def main():
+        server = XMPPTestServer(cached_responder(IVTEncryption(ACCESS_KEY)))
+        await server.start()
+        ports.put(server.port)
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+class Port:
+    def __init__(self, port):
+        self.port = port
+
+
+def make_connector(port, lite_client):
+    connector = IVTXMPPConnector(
+        host="1234",
+        access_key="abc",
+        encryption=IVTEncryption(ACCESS_KEY),
+        keepalive_interval=0,
+        lite_client=lite_client,
+        max_concurrency=32,
+    )
+    connect_to(connector, port)
+    return connector
+
+
+async def memory(port, lite_client, connections):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    connectors = [make_connector(port, lite_client) for _ in range(connections)]
+    try:
+        for connector in connectors:
+            await connector._session.wait_connected(timeout=30)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+        for connector in connectors:
+            await connector.close(force=False)
+    return used / connections
+
+
+async def echo_rate(port, lite_client, count):
+    connector = make_connector(port, lite_client)
+    client = connector.client
+    received = 0
+    done = asyncio.get_running_loop().create_future()
+
+    def on_message(msg):
+        nonlocal received
+        received += 1
+        if received == count:
+            done.set_result(None)
+
+    try:
+        await connector._session.wait_connected(timeout=30)
+        client.add_event_handler("message", on_message)
+        start = time.perf_counter()
+        for i in range(count):
+            client.send_message(mto=connector._to, mbody=f"ping {i}", mtype="chat")
+        await asyncio.wait_for(done, 120)
+        took = time.perf_counter() - start
+    finally:
+        await connector.close(force=False)
+    return count / took
+
+
+async def get_rate(port, lite_client, count):
+    connector = make_connector(port, lite_client)
+    paths = [f"/heatingCircuits/hc1/ref{i}" for i in range(count)]
+    try:
+        await connector._session.wait_connected(timeout=30)
+        start = time.perf_counter()
+        await connector.get_many(paths)
+        took = time.perf_counter() - start
+    finally:
+        await connector.close(force=False)
+    return count / took
+
+
+async def main(connections, messages):
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(ports,), daemon=True)
+    server.start()
+    port = Port(ports.get(timeout=30))
+    print(f"{connections} connections, {messages} messages")
+    try:
+        for lite_client in (False, True):
+            name = "lite" if lite_client else "slixmpp"
+            per_connection = await memory(port, lite_client, connections)
+            echoes = await echo_rate(port, lite_client, messages)
+            gets = await get_rate(port, lite_client, messages // 5)
+            print(
+                f"{name:<8} {per_connection / 1024:8.1f} KiB/connection, "
+                f"{echoes:8.0f} messages/s, {gets:7.0f} GETs/s"
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.connections, args.messages))
@@ -0,0 +1,87 @@
+"""Microbenchmark of XMPP response dispatch.
+
+Run: python benchmarks/xmpp_dispatch.py [--stanzas 5000] [--pending 32]
+
+Feeds synthetic encrypted stanzas through XMPPBaseConnector.main_listener
+while given number of requests is pending. Reports full listener throughput
+(including decryption) and dispatch table alone (lookup plus registering
+and removing requests).
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from bosch_thermostat_client.connectors import IVTXMPPConnector, NefitConnector
+from bosch_thermostat_client.connectors.dispatch import PendingRequest
+from bosch_thermostat_client.const import GET
+from bosch_thermostat_client.encryption import IVTEncryption
+
+ACCESS_KEY = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+
+
+def build_stanzas(encryption, paths, count, with_seqno):
+    stanzas = []
+    for i in range(count):
+        path = paths[i % len(paths)]
+        body = encryption.encrypt(json.dumps({"id": path, "value": i})).decode()
+        headers = ["HTTP/1.0 200 OK", "Content-Type: application/json"]
+        if with_seqno:
+            headers.append(f"Seq-No: {i % len(paths)}")
+        stanzas.append({"type": "chat", "body": "\n".join(headers + ["", body])})
+    return stanzas
+
+
+async def bench(connector_class, pending_count, count, with_seqno):
+    encryption = IVTEncryption(ACCESS_KEY)
+    connector = connector_class(host="1234", access_key="abc", encryption=encryption)
+    table = connector._dispatch_table
+    paths = [f"/heatingCircuits/hc1/ref{i}" for i in range(pending_count)]
+    stanzas = build_stanzas(encryption, paths, count, with_seqno)
+
+    def refill():
+        for i, path in enumerate(paths):
+            table.add(PendingRequest(GET, path, i if with_seqno else None))
+
+    start = time.perf_counter()
+    for i, stanza in enumerate(stanzas):
+        if i % pending_count == 0:
+            for pending in list(table._pending.values()):
+                table.remove(pending)
+            refill()
+        connector.main_listener(stanza)
+    listener_time = time.perf_counter() - start
+
+    decrypted = [
+        (i % pending_count if with_seqno else None, {"id": paths[i % pending_count]})
+        for i in range(count)
+    ]
+    start = time.perf_counter()
+    for i, (seqno, body) in enumerate(decrypted):
+        if i % pending_count == 0:
+            for pending in list(table._pending.values()):
+                table.remove(pending)
+            refill()
+        table.dispatch(seqno, body, "HTTP/1.0 200 OK")
+    dispatch_time = time.perf_counter() - start
+    name = connector_class.__name__
+    print(
+        f"{name:<17} seqno={str(with_seqno):<5} "
+        f"listener {count / listener_time:10.0f} stanzas/s, "
+        f"dispatch {count / dispatch_time:10.0f} responses/s "
+        f"({dispatch_time / count * 1e6:.2f} us each)"
+    )
+
+
+async def main(count, pending_count):
+    print(f"{count} stanzas, {pending_count} pending requests")
+    await bench(IVTXMPPConnector, pending_count, count, True)
+    await bench(NefitConnector, pending_count, count, False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stanzas", type=int, default=5000)
+    parser.add_argument("--pending", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.stanzas, args.pending))
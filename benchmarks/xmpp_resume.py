@@ -0,0 +1,62 @@
+"""Benchmark of XMPP reconnect after dropped connection.
+
+Run: PYTHONPATH=. python benchmarks/xmpp_resume.py [--rounds 20] [--latency 0.02]
+
+Connects IVT XMPP connector to local XMPP server, then repeatedly breaks
+the connection and measures time from the drop to the first response of
+a GET sent right after it. Compares resumed stream (XEP-0198) with login
+from scratch when server refuses resumption. Server delays its writes by
+given latency to stand in for round trips to the cloud.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from bosch_thermostat_client.connectors import IVTXMPPConnector
+from bosch_thermostat_client.encryption import IVTEncryption
+from tests.xmpp_test_server import XMPPTestServer, bosch_responder, connect_to
+
+ACCESS_KEY = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+
+
+async def bench(resumption, rounds, latency):
+    encryption = IVTEncryption(ACCESS_KEY)
+    server = XMPPTestServer(
+        bosch_responder(encryption), resumption=resumption, latency=latency
+    )
+    await server.start()
+    connector = IVTXMPPConnector(
+        host="1234", access_key="abc", encryption=encryption, keepalive_interval=0
+    )
+    connector._session._min_backoff = 0
+    connect_to(connector, server)
+    await connector.get("/gateway/uuid")
+    times = []
+    for i in range(rounds):
+        server.drop_connections()
+        start = time.perf_counter()
+        await connector.get(f"/heatingCircuits/hc1/ref{i}")
+        times.append(time.perf_counter() - start)
+    await connector.close(force=False)
+    await server.close()
+    name = "resume" if resumption else "full reconnect"
+    print(
+        f"{name:<15} median {statistics.median(times) * 1000:7.1f} ms, "
+        f"max {max(times) * 1000:7.1f} ms, "
+        f"logins {server.logins}, resumed {server.resumed}"
+    )
+
+
+async def main(rounds, latency):
+    print(f"{rounds} dropped connections, {latency * 1000:.0f} ms server latency")
+    await bench(True, rounds, latency)
+    await bench(False, rounds, latency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.latency))
@@ -3,6 +3,7 @@ from __future__ import annotations
 from bosch_thermostat_client.switches import Switches
 from bosch_thermostat_client.schedule import Schedule
 import logging
+from datetime import datetime
 from bosch_thermostat_client.const import (
     ID,
     CURRENT_TEMP,
@@ -30,6 +31,8 @@ from bosch_thermostat_client.const import (
     DEFAULT_MIN_TEMP,
 )
 from bosch_thermostat_client.helper import BoschSingleEntity
+from bosch_thermostat_client.connectors.deadline import accepts_deadline
+from bosch_thermostat_client.connectors.priority import interactive_write
 from bosch_thermostat_client.exceptions import DeviceException
 from bosch_thermostat_client.sensors import Sensors
 
@@ -145,6 +148,15 @@ class Circuit(BasicCircuit):
         val = await self._connector.put(uri, value)
         return val
 
+    def submit_service_call(self, uri, value):
+        """Start service call without waiting for gateway.
+
+        WARNING! It doesn't check if value you send is good!
+        Returns completion handle of the write.
+        """
+        _LOGGER.info(f"Submitting service call {uri} with {value}")
+        return self._connector.put_nowait(f"{self._main_uri}/{uri}", value)
+
     async def set_operation_mode(self, new_mode):
         """Set operation_mode of Heating Circuit."""
         if self._op_mode.current_mode == new_mode:
@@ -203,6 +215,7 @@ class Circuit(BasicCircuit):
             return 1
         return 0
 
+    @interactive_write
     async def set_ha_mode(self, ha_mode):
         """Helper to set operation mode."""
         old_setpoint = self._temp_setpoint
@@ -279,23 +292,37 @@ class Circuit(BasicCircuit):
         """Set temperature of Circuit."""
         raise NotImplementedError
 
+    @accepts_deadline
     async def update(self):
-        """Update info about Circuit asynchronously."""
+        """Update info about Circuit asynchronously.
+
+        Optional `deadline` keyword (time.monotonic() seconds) drops requests
+        which couldn't be sent in time, their values stay unchanged.
+        """
         _LOGGER.debug("Updating circuit %s", self.name)
         last_item = list(self._data.keys())[-1]
+        keys = [
+            key
+            for key in self._data
+            if not (self._omit_updates and key in self._omit_updates)
+        ]
+        self._route_responses(keys)
+        results = await self._connector.get_many(
+            [self._data[key][URI] for key in keys]
+        )
 
-        async def fetch_data(key) -> dict | None:
-            try:
-                result = await self._connector.get(item[URI])
-                self.process_results(result, key)
-                return result
-            except DeviceException:
-                pass
-            return None
+        def get_result(key) -> dict | None:
+            result = results.get(self._data[key][URI])
+            if isinstance(result, DeviceException):
+                return None
+            if isinstance(result, Exception):
+                raise result
+            self.process_results(result, key)
+            return result
 
         for key, item in self._data.items():
-            if not (self._omit_updates and key in self._omit_updates):
-                result = await fetch_data(key)
+            if key in keys:
+                result = get_result(key)
                 is_operation_type = item[TYPE] == OPERATION_MODE
                 if is_operation_type and result:
                     op_mode = self.process_results(result, key, True)
@@ -306,6 +333,14 @@ class Circuit(BasicCircuit):
 
             if key == last_item:
                 self._state = True
+                self._last_update = datetime.now()
+
+    def _process_received(self, key, result):
+        super()._process_received(key, result)
+        if self._data[key][TYPE] == OPERATION_MODE and self._op_mode.is_set:
+            op_mode = self.process_results(result, key, True)
+            if VALUE in op_mode:
+                self._op_mode.set_new_operation_mode(op_mode[VALUE])
 
     @property
     def support_charge(self):
@@ -388,6 +423,7 @@ class CircuitWithSchedule(Circuit):
             default = DEFAULT_MAX_TEMP
         return activeSetpointValue.get(prop_name, default)
 
+    @accepts_deadline
     async def update(self):
         """Update info about Circuit asynchronously."""
         await super().update()
@@ -12,6 +12,8 @@ from bosch_thermostat_client.const import (
 )
 from bosch_thermostat_client.operation_mode import EasyControlOperationModeHelper
 from bosch_thermostat_client.const.easycontrol import IDLE, LOW_BATTERY, CIRCUIT_TYPES
+from bosch_thermostat_client.connectors.deadline import accepts_deadline
+from bosch_thermostat_client.connectors.priority import interactive_write
 
 class EasyZoneCircuit(EasycontrolCircuit):
     def __init__(
@@ -45,6 +47,7 @@ class EasyZoneCircuit(EasycontrolCircuit):
         await self.update_requested_key(STATUS)
         await self.update_requested_key(NAME)
 
+    @accepts_deadline
     async def update(self):
         await self._zone_program.update()
         await super().update()
@@ -110,6 +113,7 @@ class EasyZoneCircuit(EasycontrolCircuit):
     def preset_mode(self):
         return self._zone_program.preset_name(self.get_value(ACTIVE_PROGRAM))
 
+    @interactive_write
     async def set_preset_mode(self, preset_mode):
         preset_id = self._zone_program.get_preset_index_by_name(preset_mode)
         if not preset_id:
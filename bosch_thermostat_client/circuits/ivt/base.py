@@ -30,6 +30,7 @@ from bosch_thermostat_client.const.ivt import (
     ALLOWED_VALUES,
     CIRCUIT_TYPES,
 )
+from bosch_thermostat_client.connectors.priority import interactive_write
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -153,6 +154,7 @@ class IVTCircuit(CircuitWithSchedule):
     def preset_mode(self):
         return self.get_activeswitchprogram()
 
+    @interactive_write
     async def set_preset_mode(self, preset_mode):
         act_program = self._data.get(ACTIVE_PROGRAM, {})
         active_program_uri = act_program[URI]
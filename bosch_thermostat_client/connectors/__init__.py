@@ -1,18 +1,32 @@
 from .http import HttpConnector
 from .ivt import IVTXMPPConnector
+from .hybrid import IVTHybridConnector
 from .nefit import NefitConnector
 from .easycontrol import EasycontrolConnector
+from .cache import ResponseCache
+from .interceptors import Interceptor
+from .transport import InMemoryTransport, Transport
 
-from bosch_thermostat_client.const import HTTP
+from bosch_thermostat_client.const import HTTP, HYBRID
 
 
 def connector_ivt_chooser(session_type):
-    return HttpConnector if session_type.upper() == HTTP else IVTXMPPConnector
+    session_type = session_type.upper()
+    if session_type == HTTP:
+        return HttpConnector
+    if session_type == HYBRID:
+        return IVTHybridConnector
+    return IVTXMPPConnector
 
 
 __all__ = [
     "NefitConnector",
     "IVTXMPPConnector",
     "HttpConnector",
+    "IVTHybridConnector",
     "EasycontrolConnector",
+    "ResponseCache",
+    "Interceptor",
+    "Transport",
+    "InMemoryTransport",
 ]
@@ -0,0 +1,143 @@
+"""Additive-increase/multiplicative-decrease tuning of request concurrency."""
+import asyncio
+import logging
+import time
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+STORE_KEY = "concurrency"
+
+
+class AIMDController:
+    """Learn how many requests in flight a gateway tolerates.
+
+    The limit grows by `increase` after every round of `limit` successful
+    requests while latency stays within `latency_tolerance` times the
+    fastest recent response or below `latency_floor`. A timeout cuts the
+    limit by `decrease` factor right away, other errors do it once they
+    make a burst of
+    `error_burst` failures within last `window` requests. Failures of
+    requests started before the last cut are ignored, so one burst is
+    punished only once.
+    """
+
+    def __init__(
+        self,
+        min_limit=1,
+        max_limit=8,
+        increase=1,
+        decrease=0.5,
+        latency_tolerance=2.0,
+        latency_floor=0.05,
+        window=20,
+        error_burst=3,
+        store=None,
+    ):
+        """Initialize controller.
+
+        Args:
+            min_limit (int): lowest allowed limit.
+            max_limit (int): highest allowed limit.
+            increase (int): how much limit grows after healthy round.
+            decrease (float): factor limit is multiplied by on failure.
+            latency_tolerance (float): allowed slowdown compared to fastest
+                recent response.
+            latency_floor (float): latency in seconds which is always healthy.
+            window (int): how many last requests are used to judge health.
+            error_burst (int): errors within window which cause decrease.
+            store (JsonStore): where learned limit is persisted per gateway.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._increase = increase
+        self._decrease = decrease
+        self._latency_tolerance = latency_tolerance
+        self._latency_floor = latency_floor
+        self._error_burst = error_burst
+        self._store = store
+        self._gateway_id = None
+        self._limit = min_limit
+        self._latencies = deque(maxlen=window)
+        self._errors = deque(maxlen=window)
+        self._ewma = None
+        self._round_successes = 0
+        self._last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self):
+        """Currently allowed number of requests in flight."""
+        return self._limit
+
+    def reset(self, limit):
+        """Start from given limit."""
+        self._limit = self._clamp(limit)
+        self._round_successes = 0
+
+    def _clamp(self, limit):
+        return max(self.min_limit, min(self.max_limit, int(limit)))
+
+    def bind(self, gateway_id):
+        """Load limit learned earlier for gateway and persist new ones."""
+        self._gateway_id = gateway_id
+        if self._store and gateway_id:
+            stored = self._store.load(gateway_id, STORE_KEY)
+            if stored:
+                _LOGGER.debug("Using learned concurrency %s for %s", stored, gateway_id)
+                self.reset(stored)
+
+    def record(self, started, error=None):
+        """Learn from finished request.
+
+        Args:
+            started (float): time.monotonic() when request was sent.
+            error (Exception): error of request or None if it succeeded.
+        """
+        latency = time.monotonic() - started
+        if error is None:
+            self._errors.append(False)
+            self._on_success(latency)
+            return
+        self._errors.append(True)
+        if started < self._last_decrease:
+            return
+        if isinstance(error, asyncio.TimeoutError):
+            self._cut(f"timeout {error!r}")
+        elif sum(self._errors) >= self._error_burst:
+            self._cut(f"error burst, last {error!r}")
+
+    def _on_success(self, latency):
+        self._latencies.append(latency)
+        self._ewma = latency if self._ewma is None else 0.8 * self._ewma + 0.2 * latency
+        self._round_successes += 1
+        if self._round_successes < self._limit or self._limit >= self.max_limit:
+            return
+        self._round_successes = 0
+        if any(self._errors):
+            return
+        healthy_latency = max(
+            min(self._latencies) * self._latency_tolerance, self._latency_floor
+        )
+        if self._ewma <= healthy_latency:
+            self._set(self._limit + self._increase)
+            self.increases += 1
+
+    def _cut(self, reason):
+        self._errors.clear()
+        self._round_successes = 0
+        self._last_decrease = time.monotonic()
+        new_limit = self._clamp(self._limit * self._decrease)
+        if new_limit != self._limit:
+            _LOGGER.debug("Lowering concurrency to %s because of %s", new_limit, reason)
+            self.decreases += 1
+        self._set(new_limit)
+
+    def _set(self, limit):
+        limit = self._clamp(limit)
+        if limit == self._limit:
+            return
+        self._limit = limit
+        if self._store and self._gateway_id:
+            self._store.save(self._gateway_id, STORE_KEY, limit)
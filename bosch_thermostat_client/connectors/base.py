@@ -0,0 +1,486 @@
+"""Logic shared by all connectors."""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from bosch_thermostat_client.exceptions import (
+    BoschException,
+    CircuitOpenException,
+    DeadlineExceededException,
+    DeviceException,
+    NotFoundException,
+)
+
+from .aimd import AIMDController
+from .breaker import CircuitBreaker
+from .cache import ResponseCache
+from .coalescer import WriteCoalescer
+from .deadline import deadline_passed, remaining
+from .interceptors import (
+    CacheInterceptor,
+    CoalescingInterceptor,
+    NegativeCacheInterceptor,
+    RetryInterceptor,
+    SingleFlightInterceptor,
+    build_chain,
+)
+from .latency import LatencyTracker, path_class
+from .limiter import RequestLimiter
+from .negative import NegativeCache
+from .retry import RetryPolicy
+from .routes import ResponseRoutes
+from .priority import PRIORITY_NAMES, request_priority
+from .singleflight import SingleFlight
+from .store import JsonStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BaseConnector:
+    """Base class of connectors.
+
+    Subclasses implement transport in `_get` and `_put`. Public `get` and
+    `put` run requests through chain of interceptors which add transport
+    independent features on top of it: user interceptors first, then
+    negative cache, write coalescing, response cache, sharing of requests
+    and retries, then innermost user interceptors.
+
+    Concurrent GETs of the same path share one request and all receive its
+    result or its exception.
+    """
+
+    default_concurrency = 1
+    default_timeout = 10
+
+    def __init__(self, encryption, **kwargs):
+        """Init of connector.
+
+        Args:
+            encryption (obj): Encryption object
+            max_concurrency (int): how many requests might be in flight at once.
+            cache (ResponseCache|bool): cache of GET responses. True creates
+                cache with default TTL. Defaults to no cache.
+            autotune (AIMDController|bool): learn max_concurrency from
+                latency and errors of gateway. Defaults to False.
+            state_file (str|JsonStore): JSON file where learned state of
+                gateway is kept, or its store shared with other connector.
+            circuit_breaker (CircuitBreaker|bool): fail requests fast after
+                many consecutive failures. Defaults to CircuitBreaker with
+                default thresholds.
+            adaptive_timeout (LatencyTracker|bool): derive timeouts from
+                observed latency of gateway. Defaults to LatencyTracker with
+                default floor and ceiling.
+            coalesce_writes (WriteCoalescer|bool): send only the last of
+                rapid writes to the same path. Defaults to False.
+            negative_cache (NegativeCache|bool): skip paths gateway doesn't
+                implement until their re-probe time. Defaults to
+                NegativeCache persisted in state_file if given.
+            retry (RetryPolicy|bool): retry failed GETs and PUTs which
+                surely weren't sent. Defaults to RetryPolicy with 3 attempts.
+            interceptors (list): Interceptors wrapped around all requests,
+                the first one is the outermost.
+            routes (ResponseRoutes): routes of responses nobody waits for,
+                shared with other connector. Defaults to new routes.
+        """
+        self._encryption = encryption
+        self._gateway_id = None
+        self._limiter = RequestLimiter(
+            kwargs.get("max_concurrency", self.default_concurrency)
+        )
+        state_file = kwargs.get("state_file")
+        if isinstance(state_file, JsonStore):
+            self._store = state_file
+        else:
+            self._store = JsonStore.shared(state_file) if state_file else None
+        autotuner = kwargs.get("autotune")
+        if autotuner is True:
+            autotuner = AIMDController(
+                max_limit=max(self._limiter.limit, 8), store=self._store
+            )
+        self._autotuner = autotuner if isinstance(autotuner, AIMDController) else None
+        if self._autotuner:
+            self._autotuner.reset(self._limiter.limit)
+            self._limiter.set_limit(self._autotuner.limit)
+        cache = kwargs.get("cache")
+        if cache is True:
+            cache = ResponseCache()
+        self._cache = cache if isinstance(cache, ResponseCache) else None
+        breaker = kwargs.get("circuit_breaker", True)
+        if breaker is True:
+            breaker = CircuitBreaker()
+        self._breaker = breaker if isinstance(breaker, CircuitBreaker) else None
+        self._single_flight = SingleFlight()
+        self._request_timeout = self.default_timeout
+        latency = kwargs.get("adaptive_timeout", True)
+        if latency is True:
+            latency = LatencyTracker()
+        self._latency = latency if isinstance(latency, LatencyTracker) else None
+        coalescer = kwargs.get("coalesce_writes")
+        if coalescer is True:
+            coalescer = WriteCoalescer()
+        self._coalescer = coalescer if isinstance(coalescer, WriteCoalescer) else None
+        self.expired_requests = 0
+        self._pending_writes = set()
+        negative = kwargs.get("negative_cache", True)
+        if negative is True:
+            negative = NegativeCache(store=self._store)
+        self._negative = negative if isinstance(negative, NegativeCache) else None
+        retry = kwargs.get("retry", True)
+        if retry is True:
+            retry = RetryPolicy()
+        self._retry = retry if isinstance(retry, RetryPolicy) else None
+        routes = kwargs.get("routes")
+        if not isinstance(routes, ResponseRoutes):
+            routes = ResponseRoutes()
+        self._routes = routes
+        self._outer = list(kwargs.get("interceptors") or [])
+        self._stock = self._stock_interceptors()
+        self._inner = []
+        self._build_chains()
+
+    def _stock_interceptors(self):
+        stock = []
+        if self._negative is not None:
+            stock.append(NegativeCacheInterceptor(self._negative))
+        if self._coalescer is not None:
+            stock.append(CoalescingInterceptor(self._coalescer))
+        if self._cache is not None:
+            stock.append(CacheInterceptor(self._cache))
+        stock.append(SingleFlightInterceptor(self._single_flight))
+        if self._retry is not None:
+            stock.append(RetryInterceptor(self._retry))
+        return stock
+
+    def _build_chains(self):
+        interceptors = self.interceptors
+        self._get_chain = build_chain(interceptors, "get", self._get)
+        self._put_chain = build_chain(interceptors, "put", self._put)
+
+    @property
+    def interceptors(self):
+        """Return all interceptors of requests from the outermost one."""
+        return self._outer + self._stock + self._inner
+
+    def add_interceptor(self, interceptor, innermost=False):
+        """Add interceptor inside user ones added before.
+
+        Innermost interceptor runs right before transport, so eg. retries
+        apply to errors it raises.
+        """
+        (self._inner if innermost else self._outer).append(interceptor)
+        self._build_chains()
+
+    def remove_interceptor(self, interceptor):
+        """Remove interceptor, raise ValueError if it isn't used."""
+        for interceptors in (self._outer, self._stock, self._inner):
+            if interceptor in interceptors:
+                interceptors.remove(interceptor)
+                self._build_chains()
+                return
+        raise ValueError(f"{interceptor!r} is not used by connector.")
+
+    def add_route(self, path, handler):
+        """Call `handler(path, data)` with responses of path nobody waits for.
+
+        Eg. response which came after its request timed out still carries
+        fresh value of path.
+        """
+        self._routes.add(path, handler)
+
+    def remove_route(self, path, handler):
+        self._routes.remove(path, handler)
+
+    @property
+    def harvested_responses(self):
+        """Number of responses nobody waited for which updated entities."""
+        return self._routes.delivered
+
+    def _harvest(self, data, sent=None):
+        """Route response nobody waits for, return True if it was used."""
+        return self._routes.deliver(data, sent)
+
+    @property
+    def encryption_key(self):
+        return self._encryption.key
+
+    @property
+    def max_concurrency(self):
+        """Return how many requests might be in flight at once."""
+        return self._limiter.limit
+
+    def set_max_concurrency(self, max_concurrency=1):
+        """Set how many requests might be in flight at once.
+
+        With autotune enabled it is a new starting point of tuning.
+        """
+        self._limiter.set_limit(max_concurrency)
+        if self._autotuner:
+            self._autotuner.reset(max_concurrency)
+
+    @property
+    def autotuner(self):
+        """Return concurrency tuner if enabled."""
+        return self._autotuner
+
+    @property
+    def gateway_id(self):
+        return self._gateway_id
+
+    def set_gateway_id(self, gateway_id):
+        """Bind connector to gateway, so learned state might be persisted."""
+        self._gateway_id = gateway_id
+        if self._autotuner:
+            self._autotuner.bind(gateway_id)
+            self._limiter.set_limit(self._autotuner.limit)
+        if self._negative is not None:
+            self._negative.bind(gateway_id)
+
+    def set_timeout(self, timeout=10):
+        """Set timeout for API calls.
+
+        With adaptive timeouts it is used until latency of path is known.
+        """
+        self._request_timeout = timeout
+
+    @property
+    def latency_tracker(self):
+        """Return latency tracker if adaptive timeouts are enabled."""
+        return self._latency
+
+    def _timeout_for(self, method, path, default=None):
+        """Return timeout of request derived from latency of its path class."""
+        default = default or self._request_timeout
+        if self._latency is None:
+            return default
+        return self._latency.timeout(path_class(path, method), default)
+
+    @property
+    def circuit_breaker(self):
+        """Return circuit breaker if enabled."""
+        return self._breaker
+
+    @asynccontextmanager
+    async def _request_slot(self, method=None, path=None):
+        """Hold limiter slot for one request to gateway guarded by breaker."""
+        async with self._circuit():
+            async with self._limited(method, path):
+                yield
+
+    @asynccontextmanager
+    async def _circuit(self):
+        """Reject request while breaker is open, pass its outcome to breaker."""
+        if self._breaker is None:
+            yield
+            return
+        if not self._breaker.allow():
+            raise CircuitOpenException(
+                "Gateway is unreachable, next try in "
+                f"{self._breaker.retry_in:.0f}s."
+            )
+        try:
+            yield
+        except asyncio.CancelledError:
+            self._breaker.record_cancel()
+            raise
+        except Exception as err:
+            if deadline_passed():
+                # Caller gave up, it tells nothing about gateway.
+                self._breaker.record_cancel()
+            elif self._is_failure(err):
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+            raise
+        else:
+            self._breaker.record_success()
+
+    @asynccontextmanager
+    async def _limited(self, method=None, path=None):
+        """Hold limiter slot, pass outcome of request to autotuner.
+
+        Slot is granted by priority of request. Latency of successful
+        request is recorded for its path class. Request whose deadline
+        passes while queued is dropped without being sent.
+        """
+        await self._acquire(method, path)
+        try:
+            started = time.monotonic()
+            try:
+                yield
+            except Exception as err:
+                if not deadline_passed():
+                    self._request_done(
+                        started, err if self._is_failure(err) else None
+                    )
+                raise
+            else:
+                if self._latency is not None and path:
+                    self._latency.record(
+                        path_class(path, method), time.monotonic() - started
+                    )
+                self._request_done(started, None)
+        finally:
+            self._limiter.release()
+
+    async def _acquire(self, method, path):
+        priority = request_priority(method)
+        left = remaining()
+        if left is None:
+            await self._limiter.acquire(priority)
+            return
+        try:
+            if left <= 0:
+                raise asyncio.TimeoutError
+            await asyncio.wait_for(self._limiter.acquire(priority), left)
+            if deadline_passed():
+                self._limiter.release()
+                raise asyncio.TimeoutError
+        except asyncio.TimeoutError:
+            self.expired_requests += 1
+            raise DeadlineExceededException(
+                f"Deadline passed before {method} request to {path} was sent."
+            ) from None
+
+    @property
+    def queue_wait_stats(self):
+        """Return time requests spent waiting for slot per priority class."""
+        return {
+            PRIORITY_NAMES.get(priority, priority): stats
+            for priority, stats in self._limiter.wait_stats.items()
+        }
+
+    def _is_failure(self, err):
+        """Tell if error means gateway didn't handle request well."""
+        return True
+
+    async def _flush_state(self):
+        """Write learned state of gateway which is still pending."""
+        if self._store is not None:
+            await self._store.flush()
+
+    def _request_done(self, started, error):
+        if self._autotuner:
+            self._autotuner.record(started, error)
+            if self._autotuner.limit != self._limiter.limit:
+                self._limiter.set_limit(self._autotuner.limit)
+
+    @property
+    def cache(self):
+        """Return response cache if enabled."""
+        return self._cache
+
+    @property
+    def negative_cache(self):
+        """Return cache of missing paths if enabled."""
+        return self._negative
+
+    def _known_missing(self, path):
+        """Return error for path known missing on gateway or None."""
+        if self._negative is not None and self._negative.is_missing(path):
+            return NotFoundException(f"URI {path} is known not to exist.")
+        return None
+
+    async def get(self, path):
+        """Get message from API with given path."""
+        return await self._get_chain(path)
+
+    async def get_many(self, paths, concurrency=None):
+        """Get many paths at once.
+
+        Returns dict of path to result or to exception raised for it.
+        Base implementation fetches paths one by one in given order.
+        """
+        results = {}
+        for path in dict.fromkeys(paths):
+            try:
+                results[path] = await self.get(path)
+            except BoschException as err:
+                results[path] = err
+        return results
+
+    async def _get_many_parallel(self, paths, concurrency=None):
+        """Fetch paths concurrently, at most `concurrency` at once."""
+        results = {}
+        for path in dict.fromkeys(paths):
+            missing = self._known_missing(path)
+            if missing is not None:
+                results[path] = missing
+        paths = [path for path in dict.fromkeys(paths) if path not in results]
+        semaphore = asyncio.Semaphore(concurrency or self.max_concurrency)
+
+        async def fetch(path):
+            async with semaphore:
+                return await self.get(path)
+
+        responses = await asyncio.gather(
+            *[fetch(path) for path in paths], return_exceptions=True
+        )
+        for path, response in zip(paths, responses):
+            if isinstance(response, BaseException) and not isinstance(
+                response, BoschException
+            ):
+                raise response
+            results[path] = response
+        return results
+
+    @property
+    def coalesced_requests(self):
+        """Number of GETs which joined already running request."""
+        return self._single_flight.shared
+
+    @property
+    def write_coalescer(self):
+        """Return write coalescer if enabled."""
+        return self._coalescer
+
+    async def put(self, path, value):
+        """Send message to API with given path.
+
+        With write coalescing only the last of rapid writes to path is sent
+        and all callers get its result.
+        """
+        # Late responses of reads sent until write is done hold old value.
+        self._routes.written(path)
+        try:
+            return await self._put_chain(path, value)
+        finally:
+            self._routes.written(path)
+
+    def put_nowait(self, path, value):
+        """Start write of value to path and return its completion handle.
+
+        Handle is asyncio.Task which resolves to True once gateway
+        acknowledged the write and raises DeviceException if it didn't.
+        Many writes might be started and gathered later.
+        """
+        task = asyncio.ensure_future(self._acknowledged_put(path, value))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._write_done)
+        return task
+
+    async def _acknowledged_put(self, path, value):
+        if not await self.put(path, value):
+            raise DeviceException(f"Gateway didn't acknowledge write to {path}.")
+        return True
+
+    def _write_done(self, task):
+        self._pending_writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.warning("Write failed: %s", task.exception())
+
+    @property
+    def pending_writes(self):
+        """Number of writes started by put_nowait which didn't finish yet."""
+        return len(self._pending_writes)
+
+    @property
+    def retry_policy(self):
+        """Return retry policy if enabled."""
+        return self._retry
+
+    async def _get(self, path):
+        raise NotImplementedError
+
+    async def _put(self, path, value):
+        raise NotImplementedError
@@ -0,0 +1,91 @@
+"""Circuit breaker failing requests fast while gateway is unreachable."""
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop sending requests after consecutive failures.
+
+    After `failure_threshold` failed requests in a row the breaker opens and
+    rejects requests for `reset_timeout` seconds. Then it lets one probe
+    request through. Success of probe closes breaker, failure opens it
+    again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """Initialize breaker.
+
+        Args:
+            failure_threshold (int): consecutive failures which open breaker.
+            reset_timeout (float): seconds before probe request is allowed.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+
+    @property
+    def state(self):
+        """Return closed, open or half_open."""
+        if self._state == OPEN and self.retry_in == 0:
+            return HALF_OPEN
+        return self._state
+
+    @property
+    def failures(self):
+        """Number of consecutive failures."""
+        return self._failures
+
+    @property
+    def retry_in(self):
+        """Seconds until probe request is allowed."""
+        if self._state != OPEN:
+            return 0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self):
+        """Tell if request might be sent now."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._state = HALF_OPEN
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        if self._state != CLOSED:
+            _LOGGER.info("Gateway is reachable again")
+        self._state = CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state == HALF_OPEN or (
+            self._state == CLOSED and self._failures >= self.failure_threshold
+        ):
+            if self._state == CLOSED:
+                _LOGGER.warning(
+                    "Gateway failed %s requests in a row, pausing requests for %ss",
+                    self._failures,
+                    self.reset_timeout,
+                )
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def record_cancel(self):
+        """Let another request probe if probe was cancelled."""
+        self._probing = False
@@ -0,0 +1,99 @@
+"""Read-through response cache of connectors."""
+import copy
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 5
+DEFAULT_MAX_SIZE = 512
+
+
+class ResponseCache:
+    """TTL cache of GET responses with LRU eviction.
+
+    Each path is kept for the TTL of the longest matching prefix in `ttls`,
+    falling back to `ttl`. TTL of 0 disables caching of the path.
+    Results are copied on the way in and out, so callers which modify
+    responses (eg. rawscan) can't corrupt cached data.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, ttls=None, max_size=DEFAULT_MAX_SIZE):
+        """Initialize cache.
+
+        Args:
+            ttl (float): default time to live of response in seconds.
+            ttls (dict): path prefix to TTL mapping, eg. {"/gateway/DateTime": 30}.
+            max_size (int): maximum number of cached responses.
+        """
+        self._ttl = ttl
+        self._ttls = sorted((ttls or {}).items(), key=lambda item: -len(item[0]))
+        self._max_size = max_size
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, path):
+        """Find TTL of given path."""
+        for prefix, ttl in self._ttls:
+            if path.startswith(prefix):
+                return ttl
+        return self._ttl
+
+    def get(self, path):
+        """Return cached response or None."""
+        item = self._items.get(path)
+        if item is not None:
+            expires, data = item
+            if expires > time.monotonic():
+                self._items.move_to_end(path)
+                self.hits += 1
+                return copy.deepcopy(data)
+            del self._items[path]
+        self.misses += 1
+        return None
+
+    def set(self, path, data):
+        """Store response of path."""
+        ttl = self.ttl_for(path)
+        if not ttl or data is None:
+            return
+        self._items[path] = (time.monotonic() + ttl, copy.deepcopy(data))
+        self._items.move_to_end(path)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, path):
+        """Drop path, its query variants, its children and its parents."""
+        base = path.split("?", 1)[0].rstrip("/")
+        parents = set()
+        parent = base
+        while "/" in parent:
+            parent = parent.rsplit("/", 1)[0]
+            if parent:
+                parents.add(parent)
+        for key in list(self._items):
+            key_base = key.split("?", 1)[0].rstrip("/")
+            if (
+                key_base == base
+                or key_base.startswith(base + "/")
+                or key_base in parents
+            ):
+                del self._items[key]
+
+    def clear(self):
+        """Drop all cached responses."""
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def stats(self):
+        """Return counters useful for TTL tuning."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._items),
+        }
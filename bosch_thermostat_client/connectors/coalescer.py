@@ -0,0 +1,94 @@
+"""Coalescing of rapid writes to the same path."""
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 0.5
+
+
+class _Batch:
+    def __init__(self, value):
+        self.value = value
+        self.future = asyncio.get_running_loop().create_future()
+        self.writes = 1
+
+
+class WriteCoalescer:
+    """Send only the last value written to path within debounce window.
+
+    First write to path opens window of `window` seconds. Writes to the same
+    path inside it replace the value and wait for the same PUT, so every
+    caller gets outcome of the value which was really sent. Writes to one
+    path are sent in order, so older value can't land after newer one.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """Initialize coalescer.
+
+        Args:
+            window (float): debounce window in seconds.
+        """
+        self.window = window
+        self._batches = {}
+        self._sending = {}
+        # Event loop keeps only weak references to tasks.
+        self._flushes = set()
+        self.superseded = 0
+
+    async def put(self, path, value, send):
+        """Schedule write of value to path and wait for its outcome.
+
+        Args:
+            path (str): path to write to.
+            value: value to write.
+            send (coroutine function): send(path, value) performing the PUT.
+        """
+        batch = self._batches.get(path)
+        if batch is None:
+            batch = self._batches[path] = _Batch(value)
+            flush = asyncio.ensure_future(self._flush(path, batch, send))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        else:
+            _LOGGER.debug("Write %s to %s superseded by %s", batch.value, path, value)
+            batch.value = value
+            batch.writes += 1
+            self.superseded += 1
+        return await asyncio.shield(batch.future)
+
+    async def _flush(self, path, batch, send):
+        try:
+            await asyncio.sleep(self.window)
+        except asyncio.CancelledError:
+            if self._batches.get(path) is batch:
+                del self._batches[path]
+            batch.future.cancel()
+            raise
+        del self._batches[path]
+        previous = self._sending.get(path)
+        task = self._sending[path] = asyncio.ensure_future(
+            self._send(previous, path, batch, send)
+        )
+        try:
+            await task
+        finally:
+            if self._sending.get(path) is task:
+                del self._sending[path]
+
+    @staticmethod
+    async def _send(previous, path, batch, send):
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+            result = await send(path, batch.value)
+        except asyncio.CancelledError:
+            # Callers wait shielded, they must not wait forever.
+            batch.future.cancel()
+            raise
+        except Exception as err:
+            batch.future.set_exception(err)
+            # Mark exception as retrieved even if every caller went away.
+            batch.future.exception()
+        else:
+            batch.future.set_result(result)
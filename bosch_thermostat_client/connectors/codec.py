@@ -0,0 +1,194 @@
+"""Sans-IO framing of HTTP-like messages which Bosch gateways talk over XMPP.
+
+Nothing here touches sockets, so connectors, test servers and benchmarks
+share the same code for building and parsing messages.
+"""
+import re
+from collections import namedtuple
+
+from bosch_thermostat_client.const import APP_JSON, CONTENT_TYPE, GET, PUT, USER_AGENT
+from bosch_thermostat_client.const.ivt import TELEHEATER
+from bosch_thermostat_client.const.nefit import NEFITEASY
+
+STATUS_LINE_REGEX = re.compile(r"HTTP/1\.[01] (\d{3}) ?(.*)")
+SEQNO_REGEX = re.compile(r"Seq-No: *(\d+)", re.IGNORECASE)
+SEQNO = "seq-no"
+NO_CONTENT = "No Content"
+EASYCONTROL_USER_AGENT = "rrc2"
+
+# Request as built by codec or parsed by server. Data is encrypted payload of PUT.
+Request = namedtuple("Request", ["method", "path", "seqno", "data", "message"])
+
+
+def parse_status_line(line):
+    """Return status code and reason of HTTP status line or (None, None)."""
+    found = STATUS_LINE_REGEX.match(line)
+    if not found:
+        return None, None
+    return int(found.group(1)), found.group(2).strip()
+
+
+def find_seqno(msg):
+    """Find Seq-No header in request or response message."""
+    found = SEQNO_REGEX.search(msg) if msg else None
+    return int(found.group(1)) if found else None
+
+
+def _parse_headers(lines):
+    headers = {}
+    for line in lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _seqno_of(headers):
+    try:
+        return int(headers[SEQNO])
+    except (KeyError, ValueError):
+        return None
+
+
+class Response:
+    """Response of gateway with its body still encrypted."""
+
+    __slots__ = ("status", "reason", "headers", "body", "status_line")
+
+    def __init__(self, status, reason, headers, body, status_line):
+        self.status = status
+        self.reason = reason
+        # Header names are lower case.
+        self.headers = headers
+        self.body = body
+        self.status_line = status_line
+
+    @property
+    def seqno(self):
+        """Seq-No of request this response answers or None."""
+        return _seqno_of(self.headers)
+
+    @property
+    def no_content(self):
+        return self.reason == NO_CONTENT
+
+    def __repr__(self):
+        return f"<Response {self.status} {self.reason} seqno={self.seqno}>"
+
+
+def decode_response(message):
+    """Parse response message, return None if it isn't a response.
+
+    Encrypted body is the last line, status line and headers are above it.
+    """
+    header, newline, body = message.rpartition("\n")
+    if not newline:
+        header, body = message, ""
+    status_line, _, header_lines = header.partition("\n")
+    status, reason = parse_status_line(status_line)
+    if status is None:
+        return None
+    return Response(
+        status, reason, _parse_headers(header_lines.split("\n")), body, status_line
+    )
+
+
+def encode_response(status, reason, body="", seqno=None, content_type=APP_JSON):
+    """Build response message like gateway sends it."""
+    lines = [f"HTTP/1.0 {status} {reason}", f"{CONTENT_TYPE}: {content_type}"]
+    if seqno is not None:
+        lines.append(f"Seq-No: {seqno}")
+    return "\n".join(lines) + "\n\n" + body
+
+
+def decode_request(message):
+    """Parse request message built by any codec, eg. in test server."""
+    # Line separator is whatever follows request line, eg. "\r\r" or "\n".
+    end = len(message.split("\r", 1)[0].split("\n", 1)[0])
+    rest = message[end:]
+    separator = rest[: len(rest) - len(rest.lstrip("\r\n"))]
+    lines = message.split(separator) if separator else [message]
+    blank = lines.index("") if "" in lines else len(lines)
+    method, path, _ = lines[0].split(" ", 2)
+    headers = _parse_headers(lines[1:blank])
+    data = "".join(lines[blank + 1 :]).strip()
+    return Request(method.lower(), path, _seqno_of(headers), data or None, message)
+
+
+class RequestCodec:
+    """Builds requests in the framing one device type understands.
+
+    Framing differs only in line separators, closing lines and use of
+    Seq-No, which is numbered from `first_seqno` for devices which echo it
+    in responses.
+    """
+
+    user_agent = None
+    get_separator = "\r\r"
+    get_end = "\r\r"
+    put_separator = "\r\r"
+    put_end = None
+    first_seqno = None
+    seqno_in_put = True
+
+    def __init__(self):
+        self._seqno = self.first_seqno
+
+    def _next_seqno(self):
+        seqno = self._seqno
+        if seqno is not None:
+            self._seqno += 1
+        return seqno
+
+    def encode_request(self, method, path, data=None):
+        """Build request, return None if it can't be sent.
+
+        Args:
+            method (str): GET or PUT.
+            path (str): URI on gateway.
+            data (bytes): encrypted payload of PUT.
+        """
+        if not path or method not in (GET, PUT) or (method == PUT and not data):
+            return None
+        seqno = self._next_seqno()
+        lines = [
+            f"{method.upper()} {path} HTTP/1.1",
+            f"{USER_AGENT}: {self.user_agent}",
+        ]
+        if method == GET:
+            if seqno is not None:
+                lines.append(f"Seq-No: {seqno}")
+            lines.append(self.get_end)
+            message = self.get_separator.join(lines)
+            return Request(method, path, seqno, None, message)
+        payload = data.decode("utf-8")
+        lines += [f"{CONTENT_TYPE}: {APP_JSON}", f"Content-Length: {len(data)}"]
+        if not self.seqno_in_put:
+            seqno = None
+        elif seqno is not None:
+            lines.append(f"Seq-No: {seqno}")
+        lines += ["", payload]
+        if self.put_end is not None:
+            lines.append(self.put_end)
+        return Request(method, path, seqno, payload, self.put_separator.join(lines))
+
+
+class IVTCodec(RequestCodec):
+    user_agent = TELEHEATER
+    first_seqno = 1
+
+
+class NefitCodec(RequestCodec):
+    user_agent = NEFITEASY
+    put_end = "\r\r"
+
+
+class EasycontrolCodec(RequestCodec):
+    user_agent = EASYCONTROL_USER_AGENT
+    get_separator = "\n"
+    get_end = "\n"
+    put_separator = "\r"
+    put_end = "\r"
+    first_seqno = 0
+    # Seq-No is counted for PUT too, but not sent.
+    seqno_in_put = False
@@ -0,0 +1,64 @@
+"""Deadlines of requests sent on behalf of one operation."""
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_deadline = ContextVar("bosch_request_deadline", default=None)
+
+
+def current_deadline():
+    """Return absolute deadline of current operation or None."""
+    return _current_deadline.get()
+
+
+def remaining():
+    """Return seconds left until deadline of current operation or None."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def deadline_passed():
+    """Tell if current operation already ran out of time."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def clamp_timeout(timeout):
+    """Shorten timeout of request, so it ends at deadline at the latest."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return max(0, min(timeout, left))
+
+
+@contextmanager
+def request_deadline(deadline):
+    """Give requests sent inside block absolute deadline.
+
+    Deadline is in time.monotonic() seconds, which is the clock of asyncio
+    loop too. Nested deadline can only make the current one sooner. None
+    keeps the current deadline.
+    """
+    current = _current_deadline.get()
+    if deadline is None or (current is not None and current <= deadline):
+        yield
+        return
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def accepts_deadline(func):
+    """Let coroutine function take `deadline` keyword for its requests."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, deadline=None, **kwargs):
+        with request_deadline(deadline):
+            return await func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,187 @@
+"""Dispatch of XMPP responses to requests waiting for them."""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+
+from bosch_thermostat_client.const import BODY_400, GET, ID, PUT, WRONG_ENCRYPTION
+from bosch_thermostat_client.exceptions import (
+    EncryptionException,
+    MsgException,
+    NotFoundException,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+FINISHED_HISTORY = 64
+
+
+def path_key(path):
+    """Path without query string, which is what gateway returns as id."""
+    return path.split("?", 1)[0] if path else path
+
+
+def response_id(recv_body):
+    return recv_body.get(ID) if isinstance(recv_body, dict) else None
+
+
+class PendingRequest:
+    """Request sent to gateway which waits for its response."""
+
+    def __init__(self, method, path, seqno=None, message=None):
+        self.method = method
+        self.path = path
+        self.seqno = seqno
+        self.message = message
+        self.sent = time.monotonic()
+        self.future = asyncio.get_running_loop().create_future()
+
+    @property
+    def key(self):
+        """Key used to recognize late responses."""
+        return self.seqno if self.seqno is not None else path_key(self.path)
+
+    def resolve(self, recv_body, http_response, no_content=False, status=None):
+        """Settle future with response, return False if it was already done."""
+        if self.future.done():
+            return False
+        if self.method == PUT and no_content:
+            self.future.set_result(True)
+        elif recv_body == BODY_400 and status == 404:
+            self.future.set_exception(
+                NotFoundException(f"URI {self.path} doesn't exist.")
+            )
+        elif recv_body == BODY_400:
+            # Eg. overloaded gateway answers 400, path might still exist.
+            self.future.set_exception(MsgException(f"{status or 400} HTTP Error"))
+        elif recv_body is None and http_response == WRONG_ENCRYPTION:
+            self.future.set_exception(
+                EncryptionException("Can't decrypt for %s" % self.path)
+            )
+        elif self.method == GET and isinstance(recv_body, dict):
+            self.future.set_result(recv_body)
+        return True
+
+
+class DispatchTable:
+    """Index of pending requests.
+
+    Requests are indexed by Seq-No, by path for GET requests and in order of
+    sending for PUT requests, so each response is routed to exactly one
+    request without scanning all of them.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._by_seqno = {}
+        self._by_path = {}
+        self._puts = deque()
+        self._without_seqno = 0
+        self._finished = OrderedDict()
+        self.late_responses = 0
+        self.unmatched_responses = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def waiting(self):
+        """Return requests still waiting for response in order of sending."""
+        return [pending for pending in self._pending.values() if not pending.future.done()]
+
+    def add(self, pending):
+        self._pending[id(pending)] = pending
+        if pending.seqno is not None:
+            self._by_seqno[pending.seqno] = pending
+        else:
+            self._without_seqno += 1
+        if pending.method == GET:
+            self._by_path.setdefault(path_key(pending.path), deque()).append(pending)
+        elif pending.method == PUT:
+            self._puts.append(pending)
+
+    def remove(self, pending):
+        if self._pending.pop(id(pending), None) is None:
+            return
+        if pending.seqno is not None:
+            self._by_seqno.pop(pending.seqno, None)
+        else:
+            self._without_seqno -= 1
+        if pending.method == GET:
+            key = path_key(pending.path)
+            bucket = self._by_path[key]
+            bucket.remove(pending)
+            if not bucket:
+                del self._by_path[key]
+        elif pending.method == PUT:
+            self._puts.remove(pending)
+        self._finished[pending.key] = pending.sent
+        if len(self._finished) > FINISHED_HISTORY:
+            self._finished.popitem(last=False)
+
+    @staticmethod
+    def _first(queue, seqno):
+        """Response with Seq-No might only go to request sent without it."""
+        for pending in queue:
+            if seqno is None or pending.seqno is None:
+                return pending
+        return None
+
+    def find(self, seqno, recv_body, http_response, no_content=False):
+        """Find request which given response belongs to.
+
+        Errors without any identifier are matched only if there is one
+        candidate.
+        """
+        if seqno is not None:
+            pending = self._by_seqno.get(seqno)
+            if pending:
+                return pending
+            if not self._without_seqno:
+                return None
+        if no_content:
+            return self._first(self._puts, seqno)
+        _id = response_id(recv_body)
+        if _id is not None:
+            bucket = self._by_path.get(_id)
+            if bucket:
+                return self._first(bucket, seqno)
+            return None
+        candidates = len(self._pending) if seqno is None else self._without_seqno
+        if candidates == 1 and recv_body in (BODY_400, None):
+            for pending in self._pending.values():
+                if seqno is None or pending.seqno is None:
+                    return pending
+        return None
+
+    def sent_at(self, seqno, recv_body):
+        """Return when request which response answers was sent or None."""
+        if seqno is not None:
+            key = seqno
+            pending = self._by_seqno.get(seqno)
+        else:
+            key = response_id(recv_body)
+            bucket = self._by_path.get(key)
+            pending = bucket[0] if bucket else None
+        if pending is not None:
+            return pending.sent
+        return self._finished.get(key)
+
+    def dispatch(self, seqno, recv_body, http_response, no_content=False, status=None):
+        """Resolve request waiting for response. Return True if it took it.
+
+        Response for request which was already answered, eg. by hedged
+        duplicate, or timed out counts as late.
+        """
+        pending = self.find(seqno, recv_body, http_response, no_content)
+        if pending and pending.resolve(recv_body, http_response, no_content, status):
+            return True
+        key = seqno if seqno is not None else response_id(recv_body)
+        if pending or (key is not None and key in self._finished):
+            self.late_responses += 1
+            _LOGGER.debug(
+                "Late response %s for %s. Request already finished.", http_response, key
+            )
+        else:
+            self.unmatched_responses += 1
+            _LOGGER.debug("Unmatched response %s for %s.", http_response, key)
+        return False
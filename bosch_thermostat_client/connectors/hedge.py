@@ -0,0 +1,52 @@
+"""Hedging of slow GET requests."""
+
+
+class HedgePolicy:
+    """Decide when duplicate of slow GET request is sent.
+
+    Duplicate is sent when response didn't come within `percentile` latency
+    of path class. Every GET earns `budget` of a token, up to `burst`
+    tokens, and every duplicate spends one, so hedging adds at most
+    `budget` share of extra requests.
+    """
+
+    def __init__(self, percentile=90, budget=0.1, burst=5, min_delay=0.05):
+        """Initialize policy.
+
+        Args:
+            percentile (int): latency percentile after which GET is hedged.
+            budget (float): max share of GETs which might be duplicated.
+            burst (int): how many duplicates might be sent in a row.
+            min_delay (float): shortest wait before duplicate is sent.
+        """
+        self.percentile = percentile
+        self._budget = budget
+        self._burst = burst
+        self._min_delay = min_delay
+        self._tokens = burst
+        self.requests = 0
+        self.hedged = 0
+        self.won = 0
+
+    def delay(self, tracker, key):
+        """Return seconds to wait before hedging or None if latency unknown."""
+        self.requests += 1
+        self._tokens = min(self._burst, self._tokens + self._budget)
+        if tracker is None:
+            return None
+        latency = tracker.quantile(key, self.percentile)
+        if latency is None:
+            return None
+        return max(self._min_delay, latency)
+
+    def acquire(self):
+        """Spend token for one duplicate request if there is any."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.hedged += 1
+        return True
+
+    @property
+    def stats(self):
+        return {"requests": self.requests, "hedged": self.hedged, "won": self.won}
@@ -1,6 +1,5 @@
 """HTTP connector class to Bosch thermostat."""
 import logging
-import asyncio
 import json
 from asyncio import TimeoutError as AsyncTimeout
 from aiohttp.client_exceptions import (
@@ -11,27 +10,39 @@ from aiohttp.client_exceptions import (
 
 from bosch_thermostat_client.const.ivt import HTTP_HEADER, IVT
 from bosch_thermostat_client.const import APP_JSON, GET, PUT
-from bosch_thermostat_client.exceptions import DeviceException, ResponseException
+from bosch_thermostat_client.exceptions import (
+    ConnectionFailedException,
+    DeadlineExceededException,
+    DeviceException,
+    NotFoundException,
+    ResponseException,
+)
+from .base import BaseConnector
+from .deadline import clamp_timeout, deadline_passed
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class HttpConnector:
+class HttpConnector(BaseConnector):
     """HTTP connector to Bosch thermostat."""
 
     def __init__(self, host, encryption, device_type=IVT, **kwargs):
-        """Init of HTTP connector."""
-        self._lock = asyncio.Lock()
+        """Init of HTTP connector.
+
+        Args:
+            host (str): IP address or hostname of gateway
+            encryption (obj): Encryption object
+            device_type (str): type of Bosch device
+            loop (ClientSession): aiohttp websession
+            max_concurrency (int): how many requests might be sent to gateway
+                at once. Defaults to 1, which means strict serial communication.
+            cache (ResponseCache|bool): cache of GET responses.
+        """
+        super().__init__(encryption=encryption, **kwargs)
         self._host = host
         self._websession = kwargs.get("loop")
-        self._request_timeout = 10
-        self._encryption = encryption
         self.device_type = device_type
 
-    @property
-    def encryption_key(self):
-        return self._encryption.key
-
     async def _request(self, method, path, **kwargs):
         _LOGGER.debug("Sending %s request to %s", method.__name__.upper(), path)
 
@@ -51,12 +62,23 @@ class HttpConnector:
             raise ResponseException(res)
 
         try:
-            async with method(self._format_url(path), **kwargs) as res:
-                return await get_response(method.__name__, res)
+            async with self._request_slot(method.__name__, path):
+                # aiohttp takes timeout 0 as no timeout at all.
+                if deadline_passed():
+                    raise DeadlineExceededException(
+                        f"Deadline passed before {method.__name__.upper()} "
+                        f"request to {path} was sent."
+                    )
+                if "timeout" in kwargs:
+                    kwargs["timeout"] = clamp_timeout(kwargs["timeout"])
+                async with method(self._format_url(path), **kwargs) as res:
+                    return await get_response(method.__name__, res)
         except ClientResponseError as err:
+            if err.status == 404:
+                raise NotFoundException(f"URI {path} doesn not exist: {err}")
             raise DeviceException(f"URI {path} doesn not exist: {err}")
         except ClientConnectorError as err:
-            raise DeviceException(err)
+            raise ConnectionFailedException(err)
         except ResponseException as err:
             raise DeviceException(f"Error requesting data from {path}: {err}")
         except ClientError as err:
@@ -64,39 +86,42 @@ class HttpConnector:
         except AsyncTimeout:
             raise DeviceException(f"Connection timed out for {path}.")
 
+    def _is_failure(self, err):
+        """Not existing URI is valid answer of gateway."""
+        return not (isinstance(err, ClientResponseError) and err.status == 404)
+
     def _format_url(self, path):
         """Format URL to make requests to gateway."""
         return f"http://{self._host}{path}"
 
-    def set_timeout(self, timeout=10):
-        """Set timeout for API calls."""
-        self._request_timeout = timeout
-
-    async def get(self, path):
+    async def _get(self, path):
         """Get message from API with given path."""
-        async with self._lock:
-            data = await self._request(
-                self._websession.get,
-                path,
-                headers=HTTP_HEADER,
-                timeout=self._request_timeout,
-                skip_auto_headers=["Accept-Encoding", "Accept"],
-                raise_for_status=True,
-            )
-            _LOGGER.debug("Response to GET request %s: %s", path, json.dumps(data))
-            return data
+        data = await self._request(
+            self._websession.get,
+            path,
+            headers=HTTP_HEADER,
+            timeout=self._timeout_for(GET, path),
+            skip_auto_headers=["Accept-Encoding", "Accept"],
+            raise_for_status=True,
+        )
+        _LOGGER.debug("Response to GET request %s: %s", path, json.dumps(data))
+        return data
+
+    async def get_many(self, paths, concurrency=None):
+        """Get many paths with parallel HTTP requests."""
+        return await self._get_many_parallel(paths, concurrency)
 
-    async def put(self, path, value):
+    async def _put(self, path, value):
         """Send message to API with given path."""
-        async with self._lock:
-            return await self._request(
-                self._websession.put,
-                path,
-                data=self._encryption.encrypt(json.dumps({"value": value})),
-                headers=HTTP_HEADER,
-                timeout=self._request_timeout,
-            )
+        return await self._request(
+            self._websession.put,
+            path,
+            data=self._encryption.encrypt(json.dumps({"value": value})),
+            headers=HTTP_HEADER,
+            timeout=self._timeout_for(PUT, path),
+        )
 
     async def close(self, force=False):
+        await self._flush_state()
         if force:
             await self._websession.close()
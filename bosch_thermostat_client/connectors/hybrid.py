@@ -0,0 +1,237 @@
+"""Connector using both HTTP and XMPP transport of IVT gateway."""
+import asyncio
+import logging
+import time
+
+from bosch_thermostat_client.const.ivt import IVT
+from bosch_thermostat_client.exceptions import (
+    BoschException,
+    CircuitOpenException,
+    ConnectionFailedException,
+    DeadlineExceededException,
+    NotFoundException,
+)
+
+from .base import BaseConnector
+from .breaker import OPEN
+from .deadline import deadline_passed
+from .http import HttpConnector
+from .ivt import IVTXMPPConnector
+
+_LOGGER = logging.getLogger(__name__)
+
+HTTP_TRANSPORT = "http"
+XMPP_TRANSPORT = "xmpp"
+
+# Features applied once on top of both transports.
+SHARED_OPTIONS = ("cache", "coalesce_writes", "negative_cache", "retry", "interceptors")
+
+
+class TransportStats:
+    """Moving averages of latency and success rate of one transport."""
+
+    def __init__(self, alpha=0.2):
+        self._alpha = alpha
+        self.latency = None
+        self.success_rate = 1.0
+        self.last_used = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def record(self, latency, success):
+        self.requests += 1
+        self.last_used = time.monotonic()
+        if not success:
+            self.failures += 1
+        self.success_rate += self._alpha * (float(success) - self.success_rate)
+        if success:
+            self.latency = (
+                latency
+                if self.latency is None
+                else self.latency + self._alpha * (latency - self.latency)
+            )
+
+    @property
+    def score(self):
+        """Lower is better. Transport without measured latency goes last.
+
+        It is measured by probes, not by becoming primary without evidence.
+        """
+        if self.latency is None:
+            return float("inf")
+        return self.latency / max(self.success_rate, 0.05)
+
+    def as_dict(self):
+        return {
+            "latency": self.latency,
+            "success_rate": self.success_rate,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class IVTHybridConnector(BaseConnector):
+    """Send requests over HTTP or XMPP, whichever works better right now.
+
+    Reads go to transport with the best latency to success rate score and
+    fail over to the other one on error. Writes fail over only if they
+    were surely not sent. Standby transport gets copy of a read every
+    `probe_interval` seconds, so its score stays current.
+    """
+
+    device_type = IVT
+    default_concurrency = 4
+
+    def __init__(self, host, access_key, encryption, serial_number, **kwargs):
+        """Hybrid connector constructor.
+
+        Args:
+            host (str): IP address or hostname of gateway for HTTP
+            access_key (str): access key to bosch
+            encryption (obj): Encryption object
+            serial_number (str): serial number of gateway for XMPP
+            probe_interval (float): seconds between probes of standby transport
+            transports (dict): ready connectors by transport name ("http",
+                "xmpp") used instead of ones built from options
+            kwargs: other options are passed to both transports.
+        """
+        # Breakers, timeouts and tuning are kept per transport.
+        super().__init__(
+            encryption=encryption,
+            **dict(kwargs, circuit_breaker=False, adaptive_timeout=False, autotune=False),
+        )
+        transport_kwargs = {
+            key: value
+            for key, value in kwargs.items()
+            if key not in SHARED_OPTIONS and key != "transports"
+        }
+        # Responses harvested by XMPP transport update entities and cache of
+        # this connector, learned state goes to its store.
+        transport_kwargs.update(
+            negative_cache=False,
+            retry=False,
+            routes=self._routes,
+            state_file=self._store,
+        )
+        transports = kwargs.get("transports")
+        if transports:
+            self._transports = dict(transports)
+        else:
+            self._transports = {
+                HTTP_TRANSPORT: HttpConnector(
+                    host=host, encryption=encryption, **transport_kwargs
+                ),
+                XMPP_TRANSPORT: IVTXMPPConnector(
+                    host=serial_number,
+                    access_key=access_key,
+                    encryption=encryption,
+                    **transport_kwargs,
+                ),
+            }
+        self._stats = {name: TransportStats() for name in self._transports}
+        self._probe_interval = kwargs.get("probe_interval", 60)
+        self._probes = set()
+        self._active = HTTP_TRANSPORT
+
+    @property
+    def transport(self):
+        """Return name of transport currently used for requests."""
+        return self._active
+
+    @property
+    def transports(self):
+        """Return transports by name."""
+        return dict(self._transports)
+
+    @property
+    def transport_stats(self):
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def _available(self, name):
+        breaker = self._transports[name].circuit_breaker
+        return breaker is None or breaker.state != OPEN
+
+    def _ranked(self):
+        """Return transports ordered from the best one."""
+        ranked = sorted(
+            self._transports,
+            key=lambda name: (not self._available(name), self._stats[name].score),
+        )
+        if ranked[0] != self._active:
+            _LOGGER.info("Switching IVT transport from %s to %s", self._active, ranked[0])
+            self._active = ranked[0]
+        return ranked
+
+    async def _call(self, name, method, path, *args):
+        started = time.monotonic()
+        try:
+            result = await getattr(self._transports[name], method)(path, *args)
+        except (CircuitOpenException, DeadlineExceededException):
+            raise
+        except NotFoundException:
+            # Valid answer, the other transport would get the same one.
+            self._stats[name].record(time.monotonic() - started, True)
+            raise
+        except BoschException:
+            self._stats[name].record(time.monotonic() - started, False)
+            raise
+        self._stats[name].record(time.monotonic() - started, result is not None)
+        return result
+
+    async def _get(self, path):
+        primary, standby = self._ranked()
+        self._probe(standby, path)
+        try:
+            return await self._call(primary, "get", path)
+        except (NotFoundException, DeadlineExceededException):
+            raise
+        except BoschException as err:
+            if deadline_passed():
+                # Budget of request is spent, don't send it again.
+                raise
+            _LOGGER.debug("GET %s over %s failed (%s), trying %s", path, primary, err, standby)
+            return await self._call(standby, "get", path)
+
+    async def _put(self, path, value):
+        primary, standby = self._ranked()
+        try:
+            return await self._call(primary, "put", path, value)
+        except (CircuitOpenException, ConnectionFailedException):
+            return await self._call(standby, "put", path, value)
+
+    def _probe(self, name, path):
+        """Send copy of read over standby transport from time to time."""
+        if time.monotonic() - self._stats[name].last_used < self._probe_interval:
+            return
+        self._stats[name].last_used = time.monotonic()
+
+        async def probe():
+            try:
+                await self._call(name, "get", path)
+            except BoschException as err:
+                _LOGGER.debug("Probe of %s transport failed: %s", name, err)
+
+        task = asyncio.ensure_future(probe())
+        self._probes.add(task)
+        task.add_done_callback(self._probes.discard)
+
+    async def get_many(self, paths, concurrency=None):
+        """Get many paths concurrently over the best transport."""
+        return await self._get_many_parallel(paths, concurrency)
+
+    def set_timeout(self, timeout=10):
+        super().set_timeout(timeout)
+        for transport in self._transports.values():
+            transport.set_timeout(timeout)
+
+    def set_gateway_id(self, gateway_id):
+        super().set_gateway_id(gateway_id)
+        for name, transport in self._transports.items():
+            transport.set_gateway_id(f"{gateway_id}/{name}")
+
+    async def close(self, force=False):
+        for task in self._probes:
+            task.cancel()
+        for transport in self._transports.values():
+            await transport.close(force)
+        await self._flush_state()
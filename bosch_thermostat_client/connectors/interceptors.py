@@ -0,0 +1,248 @@
+"""Interceptors which GET and PUT requests of connectors pass through."""
+import asyncio
+import logging
+import random
+import time
+from functools import partial
+
+from bosch_thermostat_client.const import GET, PUT
+from bosch_thermostat_client.exceptions import (
+    DeadlineExceededException,
+    DeviceException,
+    NotFoundException,
+)
+
+from .deadline import remaining
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Interceptor:
+    """Step of request pipeline of connector.
+
+    `get` and `put` get request with `call_next`, which passes it to the
+    next interceptor and finally to transport. Interceptor might answer
+    request itself, send it more times or just watch its outcome. Base
+    class passes requests through; subclasses override only methods they
+    need and are left out of chain of the other one.
+    """
+
+    async def get(self, path, call_next):
+        return await call_next(path)
+
+    async def put(self, path, value, call_next):
+        return await call_next(path, value)
+
+
+def build_chain(interceptors, method, terminal):
+    """Return function which runs request through interceptors to terminal.
+
+    First interceptor is the outermost one. Empty chain is terminal itself,
+    so it costs nothing.
+    """
+    handler = terminal
+    for interceptor in reversed(interceptors):
+        if getattr(type(interceptor), method) is getattr(Interceptor, method):
+            continue
+        handler = partial(getattr(interceptor, method), call_next=handler)
+    return handler
+
+
+class NegativeCacheInterceptor(Interceptor):
+    """Fail GET of path known missing on gateway without sending it."""
+
+    def __init__(self, negative_cache):
+        self.negative_cache = negative_cache
+
+    async def get(self, path, call_next):
+        if self.negative_cache.is_missing(path):
+            raise NotFoundException(f"URI {path} is known not to exist.")
+        try:
+            data = await call_next(path)
+        except NotFoundException:
+            # Callers sharing one request record the miss only once.
+            if not self.negative_cache.is_missing(path):
+                self.negative_cache.record_missing(path)
+            raise
+        self.negative_cache.record_found(path)
+        return data
+
+
+class CoalescingInterceptor(Interceptor):
+    """Send only the last of rapid writes to the same path."""
+
+    def __init__(self, coalescer):
+        self.coalescer = coalescer
+
+    async def put(self, path, value, call_next):
+        return await self.coalescer.put(path, value, call_next)
+
+
+class CacheInterceptor(Interceptor):
+    """Answer GET from response cache, drop written path from it."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    async def get(self, path, call_next):
+        data = self.cache.get(path)
+        if data is not None:
+            _LOGGER.debug("Cached response to GET request %s", path)
+            return data
+        data = await call_next(path)
+        self.cache.set(path, data)
+        return data
+
+    async def put(self, path, value, call_next):
+        try:
+            return await call_next(path, value)
+        finally:
+            self.cache.invalidate(path)
+
+
+class SingleFlightInterceptor(Interceptor):
+    """Share one request between concurrent GETs of the same path."""
+
+    def __init__(self, single_flight):
+        self.single_flight = single_flight
+
+    async def get(self, path, call_next):
+        return await self.single_flight.do(path, call_next, path)
+
+
+class RetryInterceptor(Interceptor):
+    """Retry failed requests as RetryPolicy allows."""
+
+    def __init__(self, policy):
+        self.policy = policy
+
+    async def get(self, path, call_next):
+        return await self.policy.run(GET, path, call_next, path)
+
+    async def put(self, path, value, call_next):
+        return await self.policy.run(PUT, path, call_next, path, value)
+
+
+class MetricsInterceptor(Interceptor):
+    """Count requests, errors and latency per method."""
+
+    def __init__(self):
+        self._stats = {
+            method: {"requests": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0}
+            for method in (GET, PUT)
+        }
+
+    async def _measure(self, method, call, *args):
+        stats = self._stats[method]
+        stats["requests"] += 1
+        started = time.monotonic()
+        try:
+            return await call(*args)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            took = time.monotonic() - started
+            stats["total_time"] += took
+            stats["max_time"] = max(stats["max_time"], took)
+
+    async def get(self, path, call_next):
+        return await self._measure(GET, call_next, path)
+
+    async def put(self, path, value, call_next):
+        return await self._measure(PUT, call_next, path, value)
+
+    @property
+    def stats(self):
+        return {
+            method: dict(
+                stats,
+                mean_time=stats["total_time"] / stats["requests"]
+                if stats["requests"]
+                else None,
+            )
+            for method, stats in self._stats.items()
+        }
+
+
+class ThrottleInterceptor(Interceptor):
+    """Let at most `rate` requests per second through, `burst` at once.
+
+    Requests over the rate wait for their turn. Request which couldn't
+    pass before its deadline fails right away.
+    """
+
+    def __init__(self, rate, burst=1):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self.delayed = 0
+
+    async def _wait(self, method, path):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        # Token is taken now, waiting callers queue up behind each other.
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+        delay = -self._tokens / self._rate
+        left = remaining()
+        if left is not None and delay > left:
+            self._tokens += 1
+            raise DeadlineExceededException(
+                f"Deadline passes before {method} request to {path} is allowed."
+            )
+        self.delayed += 1
+        await asyncio.sleep(delay)
+
+    async def get(self, path, call_next):
+        await self._wait(GET, path)
+        return await call_next(path)
+
+    async def put(self, path, value, call_next):
+        await self._wait(PUT, path)
+        return await call_next(path, value)
+
+
+class FaultInjectionInterceptor(Interceptor):
+    """Fail or slow down share of requests, to test how callers cope.
+
+    Added as innermost interceptor, faults look like failures of transport,
+    so retries and other interceptors handle them.
+    """
+
+    def __init__(self, rate=0.1, delay=0, error=DeviceException, methods=(GET, PUT), seed=None):
+        """Initialize fault injection.
+
+        Args:
+            rate (float): share of requests which fail.
+            delay (float): seconds every request is delayed by.
+            error (type): exception raised by failed request.
+            methods (tuple): methods which are affected.
+            seed (int): seed of random generator for repeatable runs.
+        """
+        self._rate = rate
+        self._delay = delay
+        self._error = error
+        self._methods = methods
+        self._random = random.Random(seed)
+        self.injected = 0
+
+    async def _inject(self, method, path):
+        if method not in self._methods:
+            return
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        if self._random.random() < self._rate:
+            self.injected += 1
+            raise self._error(f"Injected fault of {method} request to {path}.")
+
+    async def get(self, path, call_next):
+        await self._inject(GET, path)
+        return await call_next(path)
+
+    async def put(self, path, value, call_next):
+        await self._inject(PUT, path)
+        return await call_next(path, value)
@@ -1,6 +1,6 @@
 """XMPP Connector to talk to bosch."""
-from bosch_thermostat_client.const import PUT, GET, USER_AGENT, CONTENT_TYPE, APP_JSON
-from bosch_thermostat_client.const.ivt import TELEHEATER, IVT
+from bosch_thermostat_client.const.ivt import IVT
+from .codec import IVTCodec
 from .xmpp import XMPPBaseConnector
 
 
@@ -13,7 +13,8 @@ class IVTXMPPConnector(XMPPBaseConnector):
     disable_starttls = True
     force_starttls = False
     use_ssl = False
-
+    default_concurrency = 4
+    codec_class = IVTCodec
 
     def __init__(self, host, access_key, encryption, **kwargs):
         """IVTConnector constructor
@@ -22,35 +23,8 @@ class IVTXMPPConnector(XMPPBaseConnector):
             host (str): serialnumber of target
             access_key (str): access key to bosch
             encryption (obj): Encryption object
+            max_concurrency (int): how many requests might wait for response at once
         """
-        self._seqno = 1
-        super().__init__(host=host, access_key=access_key, encryption=encryption)
-
-    def _build_message(self, method, path, data=None) -> str:
-        if not path:
-            return
-        if method == GET:
-            body = "\r\r".join(
-                [
-                    f"GET {path} HTTP/1.1",
-                    f"{USER_AGENT}: {TELEHEATER}",
-                    f"Seq-No: {self._seqno}",
-                    "\r\r",
-                ]
-            )
-        elif method == PUT and data:
-            body = "\r\r".join(
-                [
-                    f"PUT {path} HTTP/1.1",
-                    f"{USER_AGENT}: {TELEHEATER}",
-                    f"{CONTENT_TYPE}: {APP_JSON}",
-                    f"Content-Length: {len(data)}",
-                    f"Seq-No: {self._seqno}",
-                    "",
-                    data.decode("utf-8"),
-                ]
-            )
-        else:
-            return
-        self._seqno += 1
-        return body
+        super().__init__(
+            host=host, access_key=access_key, encryption=encryption, **kwargs
+        )
@@ -0,0 +1,88 @@
+"""Latency tracking and timeouts derived from it."""
+import math
+from collections import deque
+
+from bosch_thermostat_client.const import GET
+
+PERCENTILES = (50, 95, 99)
+
+
+def path_class(path, method=GET):
+    """Group paths which are served alike, eg. "get /heatingCircuits"."""
+    segment = path.split("?", 1)[0].strip("/").split("/", 1)[0]
+    return f"{method} /{segment}"
+
+
+def percentile(samples, percent):
+    """Return nearest-rank percentile of sorted samples."""
+    rank = max(1, math.ceil(percent / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+class LatencyTracker:
+    """Rolling latency distribution per path class of one gateway.
+
+    Timeout of request is `multiplier` times p99 latency of its path class,
+    kept between `floor` and `ceiling`. Until `min_samples` responses are
+    seen the static timeout of connector is used.
+    """
+
+    def __init__(
+        self, window=100, min_samples=10, multiplier=3.0, floor=2.0, ceiling=30.0
+    ):
+        """Initialize tracker.
+
+        Args:
+            window (int): how many last latencies are kept per path class.
+            min_samples (int): samples needed before timeout is derived.
+            multiplier (float): timeout to p99 latency ratio.
+            floor (float): shortest derived timeout in seconds.
+            ceiling (float): longest derived timeout in seconds.
+        """
+        self._window = window
+        self._min_samples = min_samples
+        self._multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+        self._samples = {}
+
+    def record(self, key, latency):
+        """Store latency of successful request of path class."""
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self._window)
+        samples.append(latency)
+
+    def percentiles(self, key):
+        """Return p50, p95 and p99 of path class or None without samples."""
+        samples = self._samples.get(key)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return {f"p{percent}": percentile(ordered, percent) for percent in PERCENTILES}
+
+    def quantile(self, key, percent):
+        """Return latency percentile of path class, None until it is known."""
+        samples = self._samples.get(key)
+        if samples is None or len(samples) < self._min_samples:
+            return None
+        return percentile(sorted(samples), percent)
+
+    def timeout(self, key, default):
+        """Return timeout for request of path class."""
+        p99 = self.quantile(key, 99)
+        if p99 is None:
+            return default
+        return min(self.ceiling, max(self.floor, p99 * self._multiplier))
+
+    @property
+    def stats(self):
+        """Return percentiles and derived timeout of every path class."""
+        return {
+            key: {
+                **self.percentiles(key),
+                "samples": len(samples),
+                "timeout": self.timeout(key, None),
+            }
+            for key, samples in self._samples.items()
+        }
@@ -0,0 +1,127 @@
+"""Concurrency limiter used by connectors to bound in-flight requests."""
+import asyncio
+from collections import deque
+
+
+class RequestLimiter:
+    """Allow up to `limit` requests in flight.
+
+    Waiters are served by priority (lower number first) and in FIFO order
+    within one priority. With limit 1 it behaves like asyncio.Lock, which
+    keeps strict serial communication with the gateway.
+    """
+
+    def __init__(self, limit=1):
+        """Initialize limiter.
+
+        Args:
+            limit (int): maximum number of requests in flight.
+        """
+        self._limit = self._validate(limit)
+        self._in_flight = 0
+        self._waiters = {}
+        self._wait_stats = {}
+
+    @staticmethod
+    def _validate(limit):
+        limit = int(limit)
+        if limit < 1:
+            raise ValueError("Limit of in-flight requests must be at least 1.")
+        return limit
+
+    @property
+    def limit(self):
+        """Maximum number of requests in flight."""
+        return self._limit
+
+    def set_limit(self, limit):
+        """Change maximum number of requests in flight.
+
+        Raising the limit wakes up queued requests immediately. Lowering it
+        lets requests already in flight finish.
+        """
+        self._limit = self._validate(limit)
+        self._wake_up()
+
+    @property
+    def in_flight(self):
+        """Number of requests currently holding a slot."""
+        return self._in_flight
+
+    @property
+    def queued(self):
+        """Number of requests waiting for a slot."""
+        return sum(len(queue) for queue in self._waiters.values())
+
+    def locked(self):
+        """Return True if next request would have to wait."""
+        return self._in_flight >= self._limit or any(self._waiters.values())
+
+    @property
+    def wait_stats(self):
+        """Return count, mean and max time spent in queue per priority."""
+        return {
+            priority: {
+                "count": count,
+                "mean": total / count if count else 0.0,
+                "max": longest,
+            }
+            for priority, (count, total, longest) in sorted(self._wait_stats.items())
+        }
+
+    def _record_wait(self, priority, waited):
+        count, total, longest = self._wait_stats.get(priority, (0, 0.0, 0.0))
+        self._wait_stats[priority] = (count + 1, total + waited, max(longest, waited))
+
+    async def acquire(self, priority=0):
+        """Wait for free slot.
+
+        Args:
+            priority (int): lower number is served sooner.
+        """
+        if not self.locked():
+            self._in_flight += 1
+            self._record_wait(priority, 0.0)
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._waiters.setdefault(priority, deque())
+        queue.append(future)
+        started = loop.time()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over right before cancellation. Pass it on.
+                self.release()
+            elif future in queue:
+                queue.remove(future)
+            raise
+        self._record_wait(priority, loop.time() - started)
+
+    def release(self):
+        """Free slot and hand it over to the oldest waiter."""
+        self._in_flight -= 1
+        self._wake_up()
+
+    def _next_waiter(self):
+        for priority in sorted(self._waiters):
+            queue = self._waiters[priority]
+            if queue:
+                return queue.popleft()
+        return None
+
+    def _wake_up(self):
+        while self._in_flight < self._limit:
+            future = self._next_waiter()
+            if future is None:
+                return
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
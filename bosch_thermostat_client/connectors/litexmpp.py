@@ -0,0 +1,438 @@
+"""Minimal XMPP client for request/response exchange with Bosch gateways.
+
+Bosch gateways need only a small part of XMPP: login, presence, chat
+messages carrying requests and responses, and pings. LiteXMPPClient does
+just that on a single asyncio stream, which takes much less memory and CPU
+per connection than full slixmpp client with its plugins. It has the part
+of slixmpp ClientXMPP interface which XMPPBaseConnector uses, so connector
+might use either of them. Reconnects are left to connector's session
+supervisor.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import itertools
+import logging
+import os
+import ssl
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from xml.sax.saxutils import escape, quoteattr
+
+from bosch_thermostat_client.exceptions import (
+    ConnectionFailedException,
+    DeviceException,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAM_NS = "http://etherx.jabber.org/streams"
+CLIENT_NS = "jabber:client"
+TLS_NS = "urn:ietf:params:xml:ns:xmpp-tls"
+SASL_NS = "urn:ietf:params:xml:ns:xmpp-sasl"
+BIND_NS = "urn:ietf:params:xml:ns:xmpp-bind"
+SESSION_NS = "urn:ietf:params:xml:ns:xmpp-session"
+PING_NS = "urn:xmpp:ping"
+STANZAS_NS = "urn:ietf:params:xml:ns:xmpp-stanzas"
+XMPP_PORT = 5222
+SCRAM_SHA_1 = "SCRAM-SHA-1"
+PLAIN = "PLAIN"
+
+
+class _Closed(Exception):
+    """Server ended stream."""
+
+
+class _AuthFailed(Exception):
+    """Server refused credentials."""
+
+
+class BoundJID:
+    """Parts of JID assigned by server."""
+
+    def __init__(self, full):
+        self.full = full
+        self.bare, _, self.resource = full.partition("/")
+        self.user, _, self.host = self.bare.rpartition("@")
+
+    def __str__(self):
+        return self.full
+
+
+class _ScramSha1:
+    """Client side of SCRAM-SHA-1 SASL mechanism (RFC 5802)."""
+
+    def __init__(self, user, password):
+        self._password = password.encode()
+        self._nonce = base64.b64encode(os.urandom(24)).decode()
+        user = user.replace("=", "=3D").replace(",", "=2C")
+        self._first_bare = f"n={user},r={self._nonce}"
+        self._server_signature = None
+
+    def first(self):
+        return ("n,," + self._first_bare).encode()
+
+    def respond(self, challenge):
+        server_first = challenge.decode()
+        fields = dict(item.split("=", 1) for item in server_first.split(","))
+        if not fields["r"].startswith(self._nonce):
+            raise _AuthFailed("Server changed SCRAM nonce.")
+        salted = hashlib.pbkdf2_hmac(
+            "sha1", self._password, base64.b64decode(fields["s"]), int(fields["i"])
+        )
+        client_key = hmac.digest(salted, b"Client Key", "sha1")
+        final_bare = f"c=biws,r={fields['r']}"
+        auth_message = f"{self._first_bare},{server_first},{final_bare}".encode()
+        signature = hmac.digest(hashlib.sha1(client_key).digest(), auth_message, "sha1")
+        proof = bytes(a ^ b for a, b in zip(client_key, signature))
+        server_key = hmac.digest(salted, b"Server Key", "sha1")
+        self._server_signature = hmac.digest(server_key, auth_message, "sha1")
+        return f"{final_bare},p={base64.b64encode(proof).decode()}".encode()
+
+    def verify(self, success):
+        expected = b"v=" + base64.b64encode(self._server_signature)
+        if not hmac.compare_digest(success, expected):
+            raise _AuthFailed("Server signature doesn't match.")
+
+
+class _Plain:
+    def __init__(self, user, password):
+        self._user = user
+        self._password = password
+
+    def first(self):
+        return f"\0{self._user}\0{self._password}".encode()
+
+    def respond(self, challenge):
+        raise _AuthFailed("PLAIN doesn't expect challenge.")
+
+    def verify(self, success):
+        pass
+
+
+class _ElementStream:
+    """Top level elements of XML stream read from asyncio reader."""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.reset()
+
+    def reset(self):
+        """Start parsing new stream, eg. after TLS or SASL success."""
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._depth = 0
+        self._root = None
+        self._ready = []
+
+    async def next(self):
+        while not self._ready:
+            data = await self.reader.read(65536)
+            if not data:
+                raise _Closed("Connection closed by server.")
+            self._parser.feed(data)
+            for event, element in self._parser.read_events():
+                if event == "start":
+                    self._depth += 1
+                    if self._depth == 1:
+                        self._root = element
+                    continue
+                self._depth -= 1
+                if self._depth == 0:
+                    raise _Closed("Server ended stream.")
+                if self._depth == 1:
+                    self._ready.append(element)
+                    # Handled stanzas are not kept in stream tree.
+                    del self._root[:]
+        return self._ready.pop(0)
+
+
+class LiteXMPPClient:
+    """Small XMPP client for Bosch messages, see module docstring.
+
+    Events are the same as of slixmpp: connection_failed, auth_success,
+    failed_auth, session_start, message, session_end, disconnected and
+    ssl_invalid_chain. Message is passed as dict with type, from and body.
+    """
+
+    def __init__(self, jid, password, ca_certs=None, query_replies=None):
+        """Initialize client.
+
+        Args:
+            jid (str): JID to log in with, user@domain.
+            password (str): password of JID.
+            ca_certs (str|Path): CA bundle verifying server with TLS.
+            query_replies (dict): namespace of iq query to dict of its
+                reply fields, eg. software version asked by gateway.
+        """
+        self.jid = jid
+        self._user, _, self._domain = jid.partition("@")
+        self._password = password
+        self.ca_certs = ca_certs
+        self._query_replies = query_replies or {}
+        self.allow_unencrypted_plain = False
+        self.boundjid = BoundJID(jid)
+        self._handlers = defaultdict(list)
+        self._ids = itertools.count(1)
+        self._iqs = {}
+        self._task = None
+        self._writer = None
+        self._session_started = False
+        self._background = set()
+
+    def add_event_handler(self, name, handler):
+        self._handlers[name].append(handler)
+
+    def _event(self, name, data=None):
+        for handler in self._handlers[name]:
+            result = handler(data)
+            if asyncio.iscoroutine(result):
+                task = asyncio.ensure_future(result)
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+
+    @property
+    def connected(self):
+        return self._session_started
+
+    def connect(
+        self, address=None, use_ssl=False, force_starttls=True, disable_starttls=False
+    ):
+        """Start connecting in background, outcome is reported by events."""
+        self._task = asyncio.ensure_future(
+            self._run(
+                address or (self._domain, XMPP_PORT),
+                use_ssl,
+                force_starttls,
+                disable_starttls,
+                self._task,
+            )
+        )
+
+    def cancel_connection_attempt(self):
+        if self._task is not None and not self._session_started:
+            self._task.cancel()
+
+    def abort(self):
+        """Drop connection without closing stream."""
+        if self._writer is not None:
+            self._writer.transport.abort()
+
+    def disconnect(self):
+        """Close stream and connection."""
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(b"</stream:stream>")
+            self._writer.close()
+
+    def _ssl_context(self):
+        return ssl.create_default_context(cafile=self.ca_certs)
+
+    async def _run(self, address, use_ssl, force_starttls, disable_starttls, previous):
+        if previous is not None and not previous.done():
+            previous.cancel()
+            await asyncio.wait([previous])
+        host, port = address
+        try:
+            reader, writer = await asyncio.open_connection(
+                host,
+                port,
+                ssl=self._ssl_context() if use_ssl else None,
+                server_hostname=self._domain if use_ssl else None,
+            )
+        except ssl.SSLError as err:
+            self._event("ssl_invalid_chain", err)
+            self._event("connection_failed", err)
+            return
+        except OSError as err:
+            self._event("connection_failed", err)
+            return
+        self._writer = writer
+        stream = _ElementStream(reader)
+        reason = None
+        cancelled = False
+        try:
+            await self._login(stream, use_ssl, force_starttls, disable_starttls)
+            self._session_started = True
+            self._event("session_start")
+            while True:
+                self._handle(await stream.next())
+        except _AuthFailed as err:
+            _LOGGER.debug("XMPP authentication failed: %s", err)
+            self._event("failed_auth", err)
+        except ssl.SSLError as err:
+            self._event("ssl_invalid_chain", err)
+            reason = err
+        except (_Closed, OSError, ET.ParseError, DeviceException) as err:
+            reason = err
+        except asyncio.CancelledError:
+            # Connect attempt was given up, nobody waits for its events.
+            cancelled = True
+            raise
+        finally:
+            writer.close()
+            if self._writer is writer:
+                self._writer = None
+            for future in self._iqs.values():
+                if not future.done():
+                    future.set_exception(ConnectionFailedException("Disconnected."))
+            self._iqs.clear()
+            if self._session_started:
+                self._session_started = False
+                self._event("session_end")
+            if not cancelled:
+                self._event("disconnected", reason)
+
+    def _send(self, xml):
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionFailedException("Not connected to XMPP server.")
+        self._writer.write(xml.encode())
+
+    def _open_stream(self):
+        self._send(
+            "<?xml version='1.0'?><stream:stream "
+            f"to={quoteattr(self._domain)} version='1.0' xml:lang='en' "
+            f"xmlns='{CLIENT_NS}' xmlns:stream='{STREAM_NS}'>"
+        )
+
+    async def _features(self, stream):
+        self._open_stream()
+        features = await stream.next()
+        if features.tag != f"{{{STREAM_NS}}}features":
+            raise DeviceException(f"Expected stream features, got {features.tag}.")
+        return features
+
+    async def _login(self, stream, tls, force_starttls, disable_starttls):
+        features = await self._features(stream)
+        if not tls and features.find(f"{{{TLS_NS}}}starttls") is not None:
+            if not disable_starttls:
+                self._send(f"<starttls xmlns='{TLS_NS}'/>")
+                if (await stream.next()).tag != f"{{{TLS_NS}}}proceed":
+                    raise DeviceException("Server refused STARTTLS.")
+                await self._writer.start_tls(
+                    self._ssl_context(), server_hostname=self._domain
+                )
+                tls = True
+                stream.reset()
+                features = await self._features(stream)
+        if force_starttls and not tls and not disable_starttls:
+            raise DeviceException("Server doesn't offer STARTTLS.")
+        await self._authenticate(stream, features, tls)
+        self._event("auth_success")
+        stream.reset()
+        features = await self._features(stream)
+        self._send(f"<iq type='set' id='bind'><bind xmlns='{BIND_NS}'/></iq>")
+        bound = await stream.next()
+        jid = bound.findtext(f"{{{BIND_NS}}}bind/{{{BIND_NS}}}jid")
+        if bound.get("type") != "result" or not jid:
+            raise DeviceException("Server refused resource binding.")
+        self.boundjid = BoundJID(jid)
+        session = features.find(f"{{{SESSION_NS}}}session")
+        if session is not None and session.find(f"{{{SESSION_NS}}}optional") is None:
+            self._send(
+                f"<iq type='set' id='session'><session xmlns='{SESSION_NS}'/></iq>"
+            )
+            if (await stream.next()).get("type") != "result":
+                raise DeviceException("Server refused session.")
+
+    async def _authenticate(self, stream, features, tls):
+        offered = {
+            mechanism.text
+            for mechanism in features.iter(f"{{{SASL_NS}}}mechanism")
+        }
+        if SCRAM_SHA_1 in offered:
+            name, mechanism = SCRAM_SHA_1, _ScramSha1(self._user, self._password)
+        elif PLAIN in offered and (tls or self.allow_unencrypted_plain):
+            name, mechanism = PLAIN, _Plain(self._user, self._password)
+        else:
+            raise DeviceException(f"No supported SASL mechanism in {sorted(offered)}.")
+        self._send(
+            f"<auth xmlns='{SASL_NS}' mechanism='{name}'>"
+            f"{base64.b64encode(mechanism.first()).decode()}</auth>"
+        )
+        while True:
+            answer = await stream.next()
+            data = base64.b64decode(answer.text or "")
+            if answer.tag == f"{{{SASL_NS}}}challenge":
+                response = base64.b64encode(mechanism.respond(data)).decode()
+                self._send(f"<response xmlns='{SASL_NS}'>{response}</response>")
+            elif answer.tag == f"{{{SASL_NS}}}success":
+                mechanism.verify(data)
+                return
+            else:
+                raise _AuthFailed(f"Server answered {answer.tag}.")
+
+    def _handle(self, element):
+        tag = element.tag
+        if tag == f"{{{CLIENT_NS}}}message":
+            self._event(
+                "message",
+                {
+                    "type": element.get("type", "normal"),
+                    "from": element.get("from"),
+                    "body": element.findtext(f"{{{CLIENT_NS}}}body") or "",
+                },
+            )
+        elif tag == f"{{{CLIENT_NS}}}iq":
+            self._handle_iq(element)
+        elif tag == f"{{{STREAM_NS}}}error":
+            raise _Closed(f"Stream error: {[child.tag for child in element]}")
+
+    def _handle_iq(self, iq):
+        iq_type = iq.get("type")
+        iq_id = iq.get("id", "")
+        if iq_type in ("result", "error"):
+            future = self._iqs.pop(iq_id, None)
+            if future is not None and not future.done():
+                if iq_type == "result":
+                    future.set_result(iq)
+                else:
+                    future.set_exception(DeviceException(f"Iq {iq_id} failed."))
+            return
+        reply = f"<iq type='result' id={quoteattr(iq_id)}"
+        if iq.get("from"):
+            reply += f" to={quoteattr(iq.get('from'))}"
+        query = next(iter(iq), None)
+        namespace = query.tag[1:].split("}")[0] if query is not None else None
+        if namespace == PING_NS:
+            self._send(reply + "/>")
+        elif namespace in self._query_replies:
+            fields = "".join(
+                f"<{name}>{escape(str(value))}</{name}>"
+                for name, value in self._query_replies[namespace].items()
+            )
+            self._send(
+                f"{reply}><query xmlns={quoteattr(namespace)}>{fields}</query></iq>"
+            )
+        else:
+            self._send(
+                reply.replace("'result'", "'error'", 1)
+                + f"><error type='cancel'><service-unavailable xmlns='{STANZAS_NS}'/>"
+                "</error></iq>"
+            )
+
+    def send_presence(self):
+        self._send("<presence/>")
+
+    def get_roster(self):
+        """Bosch exchange doesn't need roster, kept for slixmpp compatibility."""
+
+    def send_message(self, mto, mbody, mtype="chat"):
+        """Send chat message, raise ConnectionFailedException if offline."""
+        self._send(
+            f"<message to={quoteattr(mto)} type={quoteattr(mtype)}>"
+            f"<body>{escape(mbody)}</body></message>"
+        )
+
+    async def ping(self, jid=None, timeout=None):
+        """Send XEP-0199 ping and wait for answer."""
+        iq_id = f"ping{next(self._ids)}"
+        future = asyncio.get_running_loop().create_future()
+        self._iqs[iq_id] = future
+        try:
+            self._send(
+                f"<iq type='get' id='{iq_id}' to={quoteattr(jid or self._domain)}>"
+                f"<ping xmlns='{PING_NS}'/></iq>"
+            )
+            await asyncio.wait_for(future, timeout)
+        finally:
+            self._iqs.pop(iq_id, None)
@@ -1,7 +1,7 @@
 """XMPP Connector to talk to bosch."""
 
-from bosch_thermostat_client.const import PUT, GET, USER_AGENT, CONTENT_TYPE, APP_JSON
-from bosch_thermostat_client.const.nefit import NEFIT, NEFITEASY
+from bosch_thermostat_client.const.nefit import NEFIT
+from .codec import NefitCodec
 from .xmpp import XMPPBaseConnector
 
 
@@ -14,26 +14,4 @@ class NefitConnector(XMPPBaseConnector):
     disable_starttls = True
     force_starttls = False
     use_ssl = False
-
-    def _build_message(self, method, path, data=None) -> str:
-        if not path:
-            return
-        if method == GET:
-            body = "\r\r".join(
-                [f"GET {path} HTTP/1.1", f"{USER_AGENT}: {NEFITEASY}", "\r\r"]
-            )
-        elif method == PUT and data:
-            body = "\r\r".join(
-                [
-                    f"PUT {path} HTTP/1.1",
-                    f"{USER_AGENT}: {NEFITEASY}",
-                    f"{CONTENT_TYPE}: {APP_JSON}",
-                    f"Content-Length: {len(data)}",
-                    "",
-                    data.decode("utf-8"),
-                    "\r\r",
-                ]
-            )
-        else:
-            return
-        return body
+    codec_class = NefitCodec
@@ -0,0 +1,94 @@
+"""Cache of paths which gateway doesn't implement."""
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+STORE_KEY = "missing_paths"
+
+
+class NegativeCache:
+    """Remember paths gateway answered as not existing.
+
+    Missing path is not requested again until its re-probe time. Interval
+    starts at `min_interval` and is multiplied by `factor` after every
+    further miss up to `max_interval`. Path found again is forgotten.
+    Wall clock is used, so persisted re-probe times survive restarts.
+    """
+
+    def __init__(self, min_interval=300, max_interval=86400, factor=2, store=None):
+        """Initialize negative cache.
+
+        Args:
+            min_interval (float): seconds until first re-probe of missing path.
+            max_interval (float): longest interval between re-probes.
+            factor (float): growth of interval after every miss.
+            store (JsonStore): where missing paths are persisted per gateway.
+        """
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._factor = factor
+        self._store = store
+        self._gateway_id = None
+        self._missing = {}
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self._missing)
+
+    def __contains__(self, path):
+        return path in self._missing
+
+    def bind(self, gateway_id):
+        """Load paths known missing on gateway and persist new ones."""
+        self._gateway_id = gateway_id
+        if self._store and gateway_id:
+            stored = self._store.load(gateway_id, STORE_KEY) or {}
+            recorded = self._missing
+            # Paths recorded before binding are newer than stored ones.
+            self._missing = {
+                path: (int(misses), float(retry_at))
+                for path, (misses, retry_at) in stored.items()
+            }
+            self._missing.update(recorded)
+            if recorded:
+                self._save()
+            if self._missing:
+                _LOGGER.debug(
+                    "%s paths are known missing on %s", len(self._missing), gateway_id
+                )
+
+    def is_missing(self, path):
+        """Tell if path should be skipped instead of requested."""
+        entry = self._missing.get(path)
+        if entry is None or entry[1] <= time.time():
+            return False
+        self.skipped += 1
+        return True
+
+    def record_missing(self, path):
+        """Remember path answered as not existing."""
+        misses = self._missing.get(path, (0, 0.0))[0] + 1
+        interval = min(
+            self._max_interval, self._min_interval * self._factor ** (misses - 1)
+        )
+        _LOGGER.debug("Path %s is missing, next probe in %.0fs", path, interval)
+        self._missing[path] = (misses, time.time() + interval)
+        self._save()
+
+    def record_found(self, path):
+        """Forget path which gateway answered again."""
+        if self._missing.pop(path, None) is not None:
+            self._save()
+
+    def _save(self):
+        if self._store and self._gateway_id:
+            self._store.save(
+                self._gateway_id,
+                STORE_KEY,
+                {path: list(entry) for path, entry in self._missing.items()},
+            )
+
+    @property
+    def stats(self):
+        return {"missing": len(self._missing), "skipped": self.skipped}
@@ -0,0 +1,49 @@
+"""Priority classes of requests sent to gateway."""
+import functools
+from contextvars import ContextVar
+
+from bosch_thermostat_client.const import PUT
+
+INTERACTIVE_WRITE = 0
+INTERACTIVE_READ = 1
+BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    INTERACTIVE_WRITE: "interactive_write",
+    INTERACTIVE_READ: "interactive_read",
+    BACKGROUND: "background",
+}
+
+_current_priority = ContextVar("bosch_request_priority", default=BACKGROUND)
+
+
+def request_priority(method):
+    """Return priority of request sent from current task.
+
+    PUT is always interactive write. GET inherits priority of operation it
+    is part of and defaults to background polling.
+    """
+    if method == PUT:
+        return INTERACTIVE_WRITE
+    return _current_priority.get()
+
+
+def with_priority(priority):
+    """Decorate coroutine function, so its requests get given priority."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = _current_priority.set(priority)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current_priority.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+interactive_write = with_priority(INTERACTIVE_WRITE)
+interactive_read = with_priority(INTERACTIVE_READ)
@@ -0,0 +1,61 @@
+"""XEP-0198 stream management which resumes dropped XMPP streams."""
+import logging
+
+from slixmpp.plugins.base import register_plugin
+from slixmpp.plugins.xep_0198 import XEP_0198
+from slixmpp.plugins.xep_0198.stanza import Resume
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StreamResumption(XEP_0198):
+    """Stream management which replays stanzas server didn't handle.
+
+    Stock plugin forgets unacknowledged stanzas as soon as it asks for
+    resumption. This one keeps them until server tells how many it
+    handled and sends the rest again, unless `should_replay(stanza)`
+    says the stanza is not wanted anymore (eg. its request already
+    timed out). If server refuses resumption, stream is opened again
+    from scratch by slixmpp.
+
+    It overrides private handlers of the stock plugin, so pyproject.toml
+    pins slixmpp to the 1.8 series the tests run against.
+    """
+
+    name = "bosch_xep_0198"
+    description = "XEP-0198: Stream Management with replay"
+
+    def plugin_init(self):
+        super().plugin_init()
+        self.should_replay = lambda stanza: True
+        self.resumed = 0
+        self.replayed = 0
+
+    def _handle_outgoing(self, stanza):
+        if isinstance(stanza, Resume):
+            # Keep unacked stanzas, they are sorted out once server answers.
+            self.enabled_out = True
+            return stanza
+        return super()._handle_outgoing(stanza)
+
+    def _handle_resumed(self, stanza):
+        self.xmpp.features.add("stream_management")
+        self.enabled_in = True
+        self._handle_ack(stanza)
+        unacked = list(self.unacked_queue)
+        self.unacked_queue.clear()
+        # Server counts stanzas from what it handled, replays get new numbers.
+        self.seq = self.last_ack
+        self.resumed += 1
+        replay = [queued for _, queued in unacked if self.should_replay(queued)]
+        for queued in replay:
+            self.xmpp.send(queued)
+        self.replayed += len(replay)
+        _LOGGER.debug(
+            "Stream resumed, %s of %s unacked stanzas replayed", len(replay), len(unacked)
+        )
+        self.xmpp.event("session_resumed", stanza)
+        self.xmpp.end_session_on_disconnect = False
+
+
+register_plugin(StreamResumption)
@@ -0,0 +1,111 @@
+"""Retries of failed requests."""
+import asyncio
+import logging
+import random
+
+from bosch_thermostat_client.const import GET
+from bosch_thermostat_client.exceptions import (
+    CircuitOpenException,
+    ConnectionFailedException,
+    DeadlineExceededException,
+    DeviceException,
+    NotFoundException,
+    ResponseTimeoutException,
+)
+
+from .deadline import remaining
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors after which another try can't help. Gateway which didn't answer
+# request it got most likely won't answer its copy either.
+FINAL_ERRORS = (
+    NotFoundException,
+    CircuitOpenException,
+    DeadlineExceededException,
+    ResponseTimeoutException,
+)
+
+
+class RetryPolicy:
+    """Retry failed requests with jittered exponential backoff.
+
+    GET is retried after transient device errors, but not after timeout of
+    request which reached gateway. PUT is retried only
+    if it surely didn't reach gateway, because repeating a write which
+    was received might apply it twice. Every request earns `budget` of a
+    token, up to `burst` tokens, and every retry spends one, so retries add
+    at most `budget` share of extra requests when gateway is down.
+    """
+
+    def __init__(
+        self, attempts=3, base_delay=0.5, max_delay=5, budget=0.2, burst=10
+    ):
+        """Initialize policy.
+
+        Args:
+            attempts (int): tries of one request including the first one.
+            base_delay (float): backoff before first retry in seconds.
+            max_delay (float): longest backoff in seconds.
+            budget (float): max share of requests which might be retried.
+            burst (int): how many retries might be made in a row.
+        """
+        self.attempts = attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._budget = budget
+        self._burst = burst
+        self._tokens = burst
+        self.requests = 0
+        self.retries = 0
+        self.exhausted = 0
+
+    def backoff(self, attempt):
+        """Return random delay before given retry (1 is the first one)."""
+        delay = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, delay)
+
+    @staticmethod
+    def retryable(method, err):
+        """Tell if request which failed with err might be sent again."""
+        if isinstance(err, FINAL_ERRORS) or not isinstance(err, DeviceException):
+            return False
+        return method == GET or isinstance(err, ConnectionFailedException)
+
+    def _acquire(self):
+        if self._tokens < 1:
+            self.exhausted += 1
+            return False
+        self._tokens -= 1
+        self.retries += 1
+        return True
+
+    async def run(self, method, path, func, *args):
+        """Await func(*args) and retry it while policy allows."""
+        self.requests += 1
+        self._tokens = min(self._burst, self._tokens + self._budget)
+        attempt = 1
+        while True:
+            try:
+                return await func(*args)
+            except DeviceException as err:
+                if attempt >= self.attempts or not self.retryable(method, err):
+                    raise
+                delay = self.backoff(attempt)
+                left = remaining()
+                if (left is not None and delay >= left) or not self._acquire():
+                    raise
+                _LOGGER.debug(
+                    "Retrying %s %s in %.2fs after: %s", method, path, delay, err
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    @property
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "tokens": round(self._tokens, 2),
+        }
@@ -0,0 +1,73 @@
+"""Routes of responses nobody waits for to entities which use their path."""
+import logging
+import time
+
+from .dispatch import path_key, response_id
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ResponseRoutes:
+    """Hand over late, duplicate or unsolicited responses to their owners.
+
+    Gateway answers with fresh value of path even if request already timed
+    out or was answered by hedged duplicate. Entities register handlers of
+    their paths and get such values, so they don't need to poll them again.
+    Response of request sent before the last write of its path holds
+    overwritten value and is dropped.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._written = {}
+        self.delivered = 0
+        self.dropped = 0
+
+    def __contains__(self, path):
+        return path_key(path) in self._handlers
+
+    def add(self, path, handler):
+        """Call `handler(path, data)` with responses of path."""
+        handlers = self._handlers.setdefault(path_key(path), [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def written(self, path):
+        """Note write of path, responses of requests sent before are stale."""
+        key = path_key(path)
+        if key in self._handlers:
+            self._written[key] = time.monotonic()
+
+    def remove(self, path, handler):
+        key = path_key(path)
+        handlers = self._handlers.get(key, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self._handlers.pop(key, None)
+
+    def deliver(self, data, sent=None):
+        """Pass response to handlers of its id. Return True if any took it.
+
+        Args:
+            data (dict): decrypted response.
+            sent (float): time.monotonic() when its request was sent, None
+                for response gateway sent unasked.
+        """
+        path = response_id(data)
+        handlers = self._handlers.get(path)
+        if not handlers:
+            return False
+        written = self._written.get(path)
+        if sent is not None and written is not None and written >= sent:
+            _LOGGER.debug("Dropping response of %s older than its last write", path)
+            self.dropped += 1
+            return False
+        _LOGGER.debug("Response of %s nobody waited for used to update it", path)
+        self.delivered += 1
+        for handler in list(handlers):
+            try:
+                handler(path, data)
+            except Exception:
+                _LOGGER.exception("Handler of response of %s failed", path)
+        return True
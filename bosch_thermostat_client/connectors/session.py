@@ -0,0 +1,204 @@
+"""Supervision of persistent session with gateway."""
+import asyncio
+import logging
+import random
+
+from bosch_thermostat_client.exceptions import (
+    ConnectionFailedException,
+    DeviceException,
+    FailedAuthException,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DISCONNECTED = "disconnected"
+CONNECTING = "connecting"
+CONNECTED = "connected"
+BACKOFF = "backoff"
+CLOSED = "closed"
+
+
+class SessionSupervisor:
+    """Keep one session open and bring it back after it drops.
+
+    All callers waiting for session share one connect attempt. Failed
+    attempts are retried with exponential backoff and jitter, so many
+    clients don't hammer server at the same moment. Wrong credentials are
+    not retried until somebody asks for session again. While connected,
+    `ping` is sent every `keepalive_interval` seconds and session is
+    aborted when it fails.
+    """
+
+    def __init__(
+        self,
+        connect,
+        ping=None,
+        abort=None,
+        connect_timeout=10,
+        keepalive_interval=60,
+        min_backoff=1,
+        max_backoff=300,
+    ):
+        """Initialize supervisor.
+
+        Args:
+            connect (coroutine function): opens session, raises on failure.
+            ping (coroutine function): checks that session is alive.
+            abort (function): drops session which doesn't answer ping.
+            connect_timeout (float): how long single connect attempt might take.
+            keepalive_interval (float): seconds between pings, 0 disables them.
+            min_backoff (float): delay before first retry.
+            max_backoff (float): longest delay between retries.
+        """
+        self._connect = connect
+        self._ping = ping
+        self._abort = abort
+        self._connect_timeout = connect_timeout
+        self._keepalive_interval = keepalive_interval
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._state = DISCONNECTED
+        self._ready = None
+        self._task = None
+        self._keepalive_task = None
+        self.connects = 0
+        self.failed_attempts = 0
+
+    @property
+    def state(self):
+        """Return connection state."""
+        return self._state
+
+    @property
+    def connected(self):
+        return self._state == CONNECTED
+
+    def _set_state(self, state):
+        if state != self._state:
+            _LOGGER.debug("Session state %s -> %s", self._state, state)
+            self._state = state
+
+    def backoff(self, attempt):
+        """Return jittered delay before retry number `attempt`."""
+        delay = min(self._max_backoff, self._min_backoff * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    def start(self):
+        """Start connecting in background if event loop is running.
+
+        Returns True if session is connected or connecting.
+        """
+        if self._state == CONNECTED:
+            return True
+        if self._state == CLOSED:
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._start_task()
+        return True
+
+    def _start_task(self, delay=0):
+        if self._ready is None or self._ready.done():
+            self._ready = asyncio.get_running_loop().create_future()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run(delay))
+
+    async def wait_connected(self, timeout=None):
+        """Wait until session is established.
+
+        Raises exception of failed connect attempt or asyncio.TimeoutError.
+        """
+        if self._state == CONNECTED:
+            return
+        if self._state == CLOSED:
+            raise DeviceException("Session is closed.")
+        self._start_task()
+        await asyncio.wait_for(asyncio.shield(self._ready), timeout)
+
+    async def _run(self, delay):
+        attempt = 0
+        while True:
+            if delay:
+                self._set_state(BACKOFF)
+                await asyncio.sleep(delay)
+            self._set_state(CONNECTING)
+            try:
+                await asyncio.wait_for(self._connect(), self._connect_timeout)
+            except FailedAuthException as err:
+                _LOGGER.error("Can't authorize to gateway: %s", err)
+                self._set_state(DISCONNECTED)
+                self._fail(err)
+                return
+            except Exception as err:
+                self.failed_attempts += 1
+                delay = self.backoff(attempt)
+                attempt += 1
+                _LOGGER.warning(
+                    "Can't connect to gateway (%r), retrying in %.1fs", err, delay
+                )
+                # Nothing was sent, so waiting requests might be retried.
+                if not isinstance(err, ConnectionFailedException):
+                    cause = err
+                    err = ConnectionFailedException(
+                        f"Can't connect to gateway: {cause!r}"
+                    )
+                    err.__cause__ = cause
+                self._fail(err)
+                continue
+            self.connects += 1
+            self._set_state(CONNECTED)
+            if not self._ready.done():
+                self._ready.set_result(True)
+            if self._ping and self._keepalive_interval:
+                self._keepalive_task = asyncio.ensure_future(self._keepalive())
+            return
+
+    def _fail(self, err):
+        """Pass error to callers waiting for this attempt."""
+        if not self._ready.done():
+            self._ready.set_exception(err)
+            # Waiters might have timed out already.
+            self._ready.exception()
+        self._ready = asyncio.get_running_loop().create_future()
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self._keepalive_interval)
+            try:
+                await asyncio.wait_for(self._ping(), self._connect_timeout)
+            except Exception as err:
+                _LOGGER.warning("Keepalive ping failed: %r", err)
+                self._keepalive_task = None
+                if self._abort:
+                    self._abort()
+                self.connection_lost()
+                return
+
+    def connection_lost(self):
+        """Reconnect after established session dropped."""
+        if self._state != CONNECTED:
+            return
+        _LOGGER.info("Session with gateway lost, reconnecting")
+        self._stop_keepalive()
+        self._set_state(DISCONNECTED)
+        self._start_task(delay=random.uniform(0, self._min_backoff))
+
+    def _stop_keepalive(self):
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    async def close(self):
+        """Stop supervising session."""
+        self._set_state(CLOSED)
+        self._stop_keepalive()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._ready and not self._ready.done():
+            self._ready.cancel()
@@ -0,0 +1,51 @@
+"""Coalescing of concurrent identical requests."""
+import asyncio
+
+
+class _Flight:
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    Callers which arrive after the call finished start a new one. The shared
+    call is cancelled only if every caller waiting for it was cancelled.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.shared = 0
+
+    def __len__(self):
+        return len(self._flights)
+
+    async def do(self, key, func, *args):
+        """Await func(*args) or join already running call with given key."""
+        flight = self._flights.get(key)
+        if flight is None or flight.task.done():
+            task = asyncio.ensure_future(func(*args))
+            flight = self._flights[key] = _Flight(task)
+            task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.shared += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                flight.task.cancel()
+                # Let request clean up (eg. free its slot) before returning.
+                await asyncio.wait([flight.task])
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Mark exception as retrieved even if every caller went away.
+            flight.task.exception()
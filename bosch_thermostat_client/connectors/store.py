@@ -0,0 +1,130 @@
+"""Persistent state of connectors kept per gateway."""
+import asyncio
+import json
+import logging
+import os
+from weakref import WeakValueDictionary
+
+_LOGGER = logging.getLogger(__name__)
+
+FLUSH_DELAY = 5
+
+_shared = WeakValueDictionary()
+
+
+class JsonStore:
+    """Small JSON file with state learned about gateways.
+
+    Data is kept as {gateway_id: {key: value}}, so different features
+    (eg. learned concurrency, missing URIs) can share one file.
+
+    Saves on event loop only mark store dirty. File is written in executor
+    `flush_delay` seconds after the first of them, so bursts of changes
+    cost one write and never block the loop. Connectors flush the rest
+    on close.
+
+    Every store writes its whole data, so connectors get their store by
+    `shared`, which gives all of them using one file the same store.
+    """
+
+    @classmethod
+    def shared(cls, path):
+        """Return store of file used by all connectors in this process."""
+        key = os.path.realpath(path)
+        store = _shared.get(key)
+        if store is None:
+            store = _shared[key] = cls(path)
+        return store
+
+    def __init__(self, path, flush_delay=FLUSH_DELAY):
+        """Initialize store.
+
+        Args:
+            path (str): path to JSON file. It is created on first save.
+            flush_delay (float): seconds changes wait before being written.
+        """
+        self._path = path
+        self._flush_delay = flush_delay
+        self._data = None
+        self._dirty = False
+        self._flush_handle = None
+        self._flush_task = None
+        self._lock = None
+
+    @property
+    def path(self):
+        return self._path
+
+    def _read(self):
+        if self._data is None:
+            try:
+                with open(self._path, "r") as state_file:
+                    self._data = json.load(state_file)
+            except FileNotFoundError:
+                self._data = {}
+            except (OSError, ValueError) as err:
+                _LOGGER.warning("Can't read state file %s: %s", self._path, err)
+                self._data = {}
+        return self._data
+
+    def load(self, gateway_id, key, default=None):
+        """Return stored value of key for gateway."""
+        return self._read().get(gateway_id, {}).get(key, default)
+
+    @property
+    def dirty(self):
+        """Tell if some changes weren't written yet."""
+        return self._dirty
+
+    def save(self, gateway_id, key, value):
+        """Store value of key for gateway, file is written later.
+
+        Without running event loop file is written right away.
+        """
+        data = self._read()
+        data.setdefault(gateway_id, {})[key] = value
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._dirty = False
+            self._write(self._dump())
+            return
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self._flush_delay, self._start_flush
+            )
+
+    def _start_flush(self):
+        self._flush_handle = None
+        self._flush_task = asyncio.ensure_future(self.flush())
+
+    async def flush(self):
+        """Write pending changes to file in executor."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            # Serialized on loop, so later changes can't mix into this write.
+            content = self._dump()
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, content
+            )
+
+    def _dump(self):
+        return json.dumps(self._read(), indent=2, sort_keys=True)
+
+    def _write(self, content):
+        # Unique temporary file, more stores might share one path.
+        tmp_path = f"{self._path}.{id(self)}.tmp"
+        try:
+            with open(tmp_path, "w") as state_file:
+                state_file.write(content)
+            os.replace(tmp_path, self._path)
+        except OSError as err:
+            _LOGGER.warning("Can't write state file %s: %s", self._path, err)
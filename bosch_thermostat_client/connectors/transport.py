@@ -0,0 +1,131 @@
+"""Interface of transports and in-memory transport for tests and benchmarks."""
+import asyncio
+import copy
+import json
+import logging
+from typing import Any, Protocol, runtime_checkable
+
+from bosch_thermostat_client.const import GET, PUT, VALUE
+from bosch_thermostat_client.const.ivt import IVT
+from bosch_thermostat_client.exceptions import NotFoundException
+
+from .base import BaseConnector
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class Transport(Protocol):
+    """What gateways and entities need from connector.
+
+    BaseConnector subclasses provide all of it.
+    """
+
+    device_type: str
+
+    @property
+    def encryption_key(self) -> str:
+        ...
+
+    async def get(self, path: str) -> Any:
+        ...
+
+    async def put(self, path: str, value: Any) -> Any:
+        ...
+
+    def put_nowait(self, path: str, value: Any) -> "asyncio.Future":
+        ...
+
+    async def get_many(self, paths: list, concurrency: int = None) -> dict:
+        ...
+
+    def set_gateway_id(self, gateway_id: str) -> None:
+        ...
+
+    async def close(self, force: bool = False) -> None:
+        ...
+
+    def set_timeout(self, timeout: float = 10) -> None:
+        ...
+
+
+class InMemoryTransport(BaseConnector):
+    """Serve responses from dict instead of gateway.
+
+    With `encrypted` responses are kept encrypted by given encryption and
+    decrypted on every GET, like HTTP and XMPP connectors do. `latency` is
+    seconds (or function of path returning seconds) every request takes.
+    """
+
+    def __init__(
+        self,
+        responses,
+        encryption=None,
+        latency=0,
+        encrypted=False,
+        device_type=IVT,
+        **kwargs,
+    ):
+        """Initialize in-memory transport.
+
+        Args:
+            responses (dict): path to JSON response mapping.
+            encryption (obj): Encryption object, needed if encrypted.
+            latency (float|function): synthetic latency of request.
+            encrypted (bool): keep responses encrypted.
+            device_type (str): type of Bosch device which is simulated.
+            kwargs: connector options, eg. max_concurrency or cache.
+        """
+        super().__init__(encryption=encryption, **kwargs)
+        self.device_type = device_type
+        self._encrypted = encrypted
+        self._latency_of = latency if callable(latency) else (lambda path: latency)
+        self._responses = {}
+        for path, response in responses.items():
+            self._keep(path, response)
+        self.requests = 0
+
+    @property
+    def encryption_key(self):
+        return self._encryption.key if self._encryption else None
+
+    def _keep(self, path, response):
+        if self._encrypted:
+            response = self._encryption.encrypt(json.dumps(response))
+        self._responses[path] = response
+
+    def _is_failure(self, err):
+        """Not existing URI is valid answer, like 404 of real gateway."""
+        return not isinstance(err, NotFoundException)
+
+    async def _get(self, path):
+        async with self._request_slot(GET, path):
+            self.requests += 1
+            await asyncio.sleep(self._latency_of(path))
+            response = self._responses.get(path.split("?", 1)[0])
+            if response is None:
+                raise NotFoundException(f"URI {path} doesn't exist")
+            if self._encrypted:
+                return self._encryption.json_decrypt(response)
+            return copy.deepcopy(response)
+
+    async def get_many(self, paths, concurrency=None):
+        return await self._get_many_parallel(paths, concurrency)
+
+    async def _put(self, path, value):
+        async with self._request_slot(PUT, path):
+            self.requests += 1
+            await asyncio.sleep(self._latency_of(path))
+            if path not in self._responses:
+                raise NotFoundException(f"URI {path} doesn't exist")
+            response = (
+                self._encryption.json_decrypt(self._responses[path])
+                if self._encrypted
+                else self._responses[path]
+            )
+            self._keep(path, {**response, VALUE: value})
+            return True
+
+    async def close(self, force=False):
+        _LOGGER.debug("Closing in-memory transport")
+        await self._flush_state()
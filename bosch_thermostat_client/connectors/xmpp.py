@@ -2,17 +2,21 @@
 
 import logging
 import json
-import re
-from slixmpp import ClientXMPP, Iq
+from slixmpp import ClientXMPP, Iq, Message
 from slixmpp.exceptions import IqError, IqTimeout
 from slixmpp.xmlstream.handler import Callback
 from slixmpp.xmlstream.matcher import StanzaPath
 import asyncio
 from bosch_thermostat_client.exceptions import (
+    CircuitOpenException,
+    ConnectionFailedException,
+    DeadlineExceededException,
     DeviceException,
     MsgException,
+    NotFoundException,
     EncryptionException,
-    FailedAuthException
+    FailedAuthException,
+    ResponseTimeoutException,
 )
 from bosch_thermostat_client.const import (
     GET,
@@ -22,9 +26,24 @@ from bosch_thermostat_client.const import (
     WRONG_ENCRYPTION,
     ACCESS_KEY,
 )
+from .deadline import clamp_timeout, deadline_passed
+from .hedge import HedgePolicy
+from .litexmpp import LiteXMPPClient
+from .resumption import StreamResumption
+from .latency import path_class
+from .session import SessionSupervisor
+from .codec import RequestCodec, decode_response
+from .dispatch import DispatchTable, PendingRequest
+from .base import BaseConnector
 
 _LOGGER = logging.getLogger(__name__)
 
+# Answers to iq queries gateway sends to client.
+QUERY_REPLIES = {
+    "jabber:iq:version": {"version": "-1364755535"},
+    "com.bosch.tt.buderus.controlng": {"name": "3.6.0", "version": "3.6.0", "os": ""},
+}
+
 
 class BoschClientXMPP(ClientXMPP):
 
@@ -33,32 +52,89 @@ class BoschClientXMPP(ClientXMPP):
         self.ca_certs = ca_certs
 
 
-class XMPPBaseConnector:
+class XMPPBaseConnector(BaseConnector):
     ca_certs = None
+    default_timeout = REQUEST_TIMEOUT
+    codec_class = RequestCodec
 
     def __init__(self, host, encryption, **kwargs):
         """
         :param host: aka serial number
         :param password:
+        :param max_concurrency: how many requests might wait for response at once
+        :param cache: cache of GET responses (ResponseCache or True)
+        :param keepalive_interval: seconds between XMPP pings, 0 disables them
+        :param min_backoff: seconds before first reconnect after session failed
+        :param hedge: send duplicate of slow GET (HedgePolicy or True), off by default
+        :param stream_management: resume dropped stream (XEP-0198) where
+            server allows it, on by default
+        :param lite_client: use LiteXMPPClient instead of slixmpp, which
+            saves memory and CPU with many gateways, off by default
         """
+        super().__init__(encryption=encryption, **kwargs)
         self.serial_number = host
-        self._encryption = encryption
-        self._lock = asyncio.Lock()
+        self._codec = self.codec_class()
+        self._dispatch_table = DispatchTable()
+        hedge = kwargs.get("hedge")
+        if hedge is True:
+            hedge = HedgePolicy()
+        self._hedge = hedge if isinstance(hedge, HedgePolicy) else None
 
         identifier = self.serial_number + "@" + self.xmpp_host
         self._from = self._rrc_contact_prefix + identifier
 
         self._to = self._rrc_gateway_prefix + identifier
         self._password = self._accesskey_prefix + kwargs.get(ACCESS_KEY)
-        self.client = BoschClientXMPP(jid=self._from, password=self._password, ca_certs=self.ca_certs)
-        self.client.register_plugin("xep_0030")  # Service Discovery
-        self.client.register_plugin("xep_0199")  # XMPP Ping
+        self._stream = None
+        if kwargs.get("lite_client"):
+            self.client = LiteXMPPClient(
+                jid=self._from,
+                password=self._password,
+                ca_certs=self.ca_certs,
+                query_replies=QUERY_REPLIES,
+            )
+            self._pinger = self.client
+        else:
+            self._create_slixmpp_client(kwargs.get("stream_management", True))
+        self.replayed_requests = 0
         self.client.add_event_handler("session_start", self.session_start)
         self.client.add_event_handler("session_end", self.session_end)
         self.client.add_event_handler("auth_success", lambda ev: self._auth(True))
         self.client.add_event_handler("failed_auth", lambda ev: self._auth(False))
+        self.client.add_event_handler("connection_failed", self._connection_failed)
+        self.client.add_event_handler("disconnected", self._disconnected)
 
         self.client.add_event_handler("message", self.main_listener)
+        self.client.add_event_handler(
+            "ssl_invalid_chain", self.discard_ssl_invalid_chain
+        )
+        self.connected_event = asyncio.Event()
+        self.disconnect_event = asyncio.Event()
+        self._auth_success = False
+        self._connect_waiter = None
+        self.received_message = None
+        self._session = SessionSupervisor(
+            connect=self._connect,
+            ping=self._ping,
+            abort=self.client.abort,
+            keepalive_interval=kwargs.get("keepalive_interval", 60),
+            min_backoff=kwargs.get("min_backoff", 1),
+        )
+        # Connect already while gateway is created, not on first request.
+        self._session.start()
+
+    def _create_slixmpp_client(self, stream_management):
+        self.client = BoschClientXMPP(
+            jid=self._from, password=self._password, ca_certs=self.ca_certs
+        )
+        self.client.register_plugin("xep_0030")  # Service Discovery
+        self.client.register_plugin("xep_0199")  # XMPP Ping
+        self._pinger = self.client.plugin["xep_0199"]
+        if stream_management:
+            self.client.register_plugin(StreamResumption.name)
+            self._stream = self.client.plugin[StreamResumption.name]
+            self._stream.should_replay = self._should_replay
+            self.client.add_event_handler("session_resumed", self.session_resumed)
         self.client.register_handler(
             Callback(
                 "Query Request",
@@ -66,16 +142,51 @@ class XMPPBaseConnector:
                 self.handle_query_request,
             )
         )
-        self.client.add_event_handler(
-            "ssl_invalid_chain", self.discard_ssl_invalid_chain
+
+    @property
+    def connection_state(self):
+        """Return state of XMPP session, eg. connected or backoff."""
+        return self._session.state
+
+    async def _connect(self):
+        """Open XMPP session, raise if it can't be done."""
+        self._connect_waiter = asyncio.get_running_loop().create_future()
+        self.client.connect(
+            use_ssl=self.use_ssl, force_starttls=self.force_starttls, disable_starttls=self.disable_starttls
         )
-        self.connected_event = asyncio.Event()
-        self.disconnect_event = asyncio.Event()
-        self._auth_event = asyncio.Event()
-        self._auth_success = False
-        self.received_message = None
+        try:
+            await self._connect_waiter
+        except BaseException:
+            self.client.cancel_connection_attempt()
+            self.client.abort()
+            raise
+        finally:
+            self._connect_waiter = None
 
-        self.listeners = set()
+    def _connect_done(self, err=None):
+        waiter = self._connect_waiter
+        if waiter is None or waiter.done():
+            return
+        if err:
+            waiter.set_exception(err)
+        else:
+            waiter.set_result(True)
+
+    async def _ping(self):
+        await self._pinger.ping(jid=self.client.boundjid.host, timeout=REQUEST_TIMEOUT)
+
+    def _connection_failed(self, error):
+        self._connect_done(
+            ConnectionFailedException(f"Can't connect to XMPP server: {error}")
+        )
+
+    def _disconnected(self, reason):
+        # Resumable stream doesn't end session, so it is signalled here too.
+        self.disconnect_event.set()
+        self._connect_done(
+            ConnectionFailedException(f"Disconnected from XMPP server: {reason}")
+        )
+        self._session.connection_lost()
 
     def _auth(self, success: bool) -> None:
         """Called after authentication.
@@ -87,43 +198,70 @@ class XMPPBaseConnector:
         self._auth_success = success
         if not success:
             self.connected_event.set()
+            self._connect_done(FailedAuthException("Can't authorize to XMPP server."))
 
     def handle_query_request(self, iq: Iq):
         query = iq.get_query()
-        reply = iq.reply()
-        if query == "jabber:iq:version":
-            reply["xmlns"] = "jabber:iq:version"
-            reply["version"] = "-1364755535"
-            reply.send()
-        if query == "com.bosch.tt.buderus.controlng":
-            reply["xmlns"] = "com.bosch.tt.buderus.controlng"
-            reply["name"] = "3.6.0"
-            reply["version"] = "3.6.0"
-            reply["os"] = ""
+        if query in QUERY_REPLIES:
+            reply = iq.reply()
+            reply["xmlns"] = query
+            for key, value in QUERY_REPLIES[query].items():
+                reply[key] = value
             reply.send()
 
     async def close(self, force):
-        self.client.disconnect()
-        await asyncio.wait_for(self.disconnect_event.wait(), 10)
+        await self._flush_state()
+        connected = self._session.connected
+        await self._session.close()
+        if connected:
+            self.client.disconnect()
+            await asyncio.wait_for(self.disconnect_event.wait(), 10)
+        # slixmpp never stops its send loop, connect() starts a new one.
+        sender = getattr(self.client, "_run_out_filters", None)
+        if sender is not None:
+            sender.cancel()
 
     async def session_start(self, event):
         self.client.send_presence()
         self.client.get_roster()
-        self._auth_event = True
+        self.disconnect_event.clear()
         self.connected_event.set()
+        self._connect_done()
+        # Stream was opened from scratch, GETs sent over the old one are lost.
+        for pending in self._dispatch_table.waiting():
+            if pending.method == GET and pending.message:
+                self.replayed_requests += 1
+                self.client.send_message(mto=self._to, mbody=pending.message, mtype="chat")
 
-    async def session_end(self, event):
-        self._auth_event = False
-        self.disconnect_event.set()
+    def session_resumed(self, event):
+        """Stream resumed, server knows us already and replays are sent."""
+        _LOGGER.debug("XMPP stream resumed")
+        self.disconnect_event.clear()
+        self.connected_event.set()
+        self._connect_done()
+
+    def _should_replay(self, stanza):
+        """Replay only requests whose caller still waits for response."""
+        if not isinstance(stanza, Message):
+            return True
+        body = stanza["body"]
+        for pending in self._dispatch_table.waiting():
+            if pending.message == body:
+                self.replayed_requests += 1
+                return True
+        return False
 
     @property
-    def encryption_key(self):
-        return self._encryption.key
+    def resumed_sessions(self):
+        """Number of dropped streams which were resumed."""
+        return self._stream.resumed if self._stream else 0
 
-    def _build_message(self, method, path, data=None):
-        pass
+    async def session_end(self, event):
+        self._auth_success = False
+        self.connected_event.clear()
+        self.disconnect_event.set()
 
-    async def get(self, path):
+    async def _get(self, path):
         _LOGGER.debug("Sending GET request to %s by %s", path, id(self))
         data = await self._request(method=GET, path=path)
         _LOGGER.debug("Response to GET request %s: %s", path, json.dumps(data))
@@ -131,83 +269,139 @@ class XMPPBaseConnector:
             raise DeviceException(f"Error requesting data from {path}")
         return data
 
-    async def put(self, path, value):
+    async def get_many(self, paths, concurrency=None):
+        """Get many paths with pipelined requests matched by dispatch table."""
+        return await self._get_many_parallel(paths, concurrency)
+
+    async def _put(self, path, value):
         _LOGGER.debug("Sending PUT request to %s with value %s", path, value)
         data = await self._request(
             method=PUT,
             encrypted_msg=self._encryption.encrypt(json.dumps({"value": value})),
             path=path,
-            timeout=10,
+            timeout=self._timeout_for(PUT, path, 10),
         )
         if data:
             return True
 
-    async def _request(self, method, path, encrypted_msg=None, timeout=REQUEST_TIMEOUT):
+    def _is_failure(self, err):
+        """Not existing URI is valid answer, like 404 over HTTP."""
+        return not isinstance(err, NotFoundException)
+
+    async def _request(self, method, path, encrypted_msg=None, timeout=None):
         data = None
+        if timeout is None:
+            timeout = self._timeout_for(method, path)
         try:
-            if not self._auth_success:
-                self.client.connect(
-                    use_ssl=self.use_ssl, force_starttls=self.force_starttls, disable_starttls=self.disable_starttls
-                )
-                await asyncio.wait_for(self.connected_event.wait(), timeout=10)
-                if not self._auth_success:
-                    raise FailedAuthException("Can't authorize to XMPP server.")
-        except asyncio.TimeoutError:
+            async with self._circuit():
+                try:
+                    await self._session.wait_connected(timeout=clamp_timeout(10))
+                except asyncio.TimeoutError:
+                    if deadline_passed():
+                        raise DeadlineExceededException(
+                            f"Deadline passed before {method} request to {path} was sent."
+                        )
+                    raise ConnectionFailedException(
+                        "Timed out connecting to XMPP server."
+                    )
+                async with self._limited(method, path):
+                    timeout = clamp_timeout(timeout)
+                    if method == GET and self._hedge is not None:
+                        data = await self._hedged_get(path, timeout)
+                    else:
+                        pending = self._send(method, path, encrypted_msg)
+                        try:
+                            data = await asyncio.wait_for(pending.future, timeout)
+                        finally:
+                            self._dispatch_table.remove(pending)
+        except (CircuitOpenException, DeadlineExceededException):
+            raise
+        except ConnectionFailedException as err:
             _LOGGER.error(
-                "Can't connect to XMPP server!. Check your network connection or credentials!"
+                "Can't connect to XMPP server!. Check your network connection or credentials! %s", err
             )
-            return None
-        await self._lock.acquire()
-        msg_to_send = self._build_message(method=method, path=path, data=encrypted_msg)
+            raise
+        except IqError as e:
+            _LOGGER.error("Error sending message: %s", e)
+        except IqTimeout:
+            _LOGGER.error("IqTimeout sending message")
+        except asyncio.TimeoutError:
+            _LOGGER.info("Msg exception for %s", path)
+            if method == GET:
+                raise ResponseTimeoutException(f"No response to GET request {path}.")
+        except MsgException:
+            _LOGGER.info("Msg exception for %s", path)
+        except EncryptionException as err:
+            _LOGGER.warning(err)
+        return data
+
+    def _send(self, method, path, encrypted_msg=None):
+        """Send request and register it in dispatch table."""
+        request = self._codec.encode_request(method, path, encrypted_msg)
+        if request is None:
+            raise MsgException(f"Can't build {method} request to {path}.")
+        pending = PendingRequest(
+            method=method, path=path, seqno=request.seqno, message=request.message
+        )
+        self._dispatch_table.add(pending)
         try:
-            future = asyncio.Future()
+            self.client.send_message(mto=self._to, mbody=request.message, mtype="chat")
+        except Exception:
+            self._dispatch_table.remove(pending)
+            raise
+        return pending
 
-            def listener(recv_body, http_response):
-                if future.done() or future.cancelled():
-                    _LOGGER.debug(
-                        "Future is already done. If it happens too often that it might be a bug. Report it."
-                    )
-                    return
-                if method == PUT and re.match(r"HTTP/1.[0-1] 20[0-9] No Content", http_response):
-                    future.set_result(True)
-                if recv_body == BODY_400:
-                    future.set_exception(MsgException("400 HTTP Error"))
-                elif recv_body is None and http_response == WRONG_ENCRYPTION:
-                    future.set_exception(
-                        EncryptionException("Can't decrypt for %s" % path)
-                    )
-                elif method == GET and recv_body.get("id") in path:
-                    try:
-                        future.set_result(recv_body)
-                    except asyncio.InvalidStateError as err:
-                        _LOGGER.error(
-                            "If you see this log please attach it to your issue/send it on Discord. Err message: %s. Recv body: %s, Path: %s",
-                            err,
-                            json.dumps(recv_body),
-                            path,
-                        )
-                        pass
+    async def _hedged_get(self, path, timeout):
+        """Send duplicate of GET which is slower than usual.
 
-            try:
-                self.listeners.add(listener)
-                self.client.send_message(mto=self._to, mbody=msg_to_send, mtype="chat")
-                data = await asyncio.wait_for(future, timeout)
-            except IqError as e:
-                _LOGGER.error("Error sending message: %s", e)
-            except IqTimeout:
-                _LOGGER.error("IqTimeout sending message")
-            except (asyncio.TimeoutError, MsgException):
-                _LOGGER.info("Msg exception for %s", path)
-            except EncryptionException as err:
-                _LOGGER.warn(err)
-                raise EncryptionException(err)
-            except asyncio.InvalidStateError as err:
-                _LOGGER.error("Unknown error occured. Please check logs. %s", err)
-            finally:
-                self.listeners.remove(listener)
+        First valid response wins, the other one is discarded as late.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = self._hedge.delay(self._latency, path_class(path, GET))
+        requests = [self._send(GET, path)]
+        try:
+            if delay is not None and delay < timeout:
+                done, _ = await asyncio.wait([requests[0].future], timeout=delay)
+                if not done and self._hedge.acquire():
+                    _LOGGER.debug("Hedging GET request %s after %.2fs", path, delay)
+                    requests.append(self._send(GET, path))
+            waiting = {pending.future for pending in requests}
+            while waiting:
+                done, waiting = await asyncio.wait(
+                    waiting,
+                    timeout=max(0, deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    raise asyncio.TimeoutError
+                for future in done:
+                    if future.exception() is None:
+                        if future is not requests[0].future:
+                            self._hedge.won += 1
+                        return future.result()
+            return requests[0].future.result()
         finally:
-            self._lock.release()
-            return data
+            for pending in requests:
+                if not pending.future.done():
+                    pending.future.cancel()
+                self._dispatch_table.remove(pending)
+
+    @property
+    def hedge_stats(self):
+        """Return how many GETs were hedged and how many duplicates won."""
+        if self._hedge is not None:
+            return self._hedge.stats
+
+    @property
+    def late_responses(self):
+        """Number of responses which arrived after their request finished."""
+        return self._dispatch_table.late_responses
+
+    @property
+    def unmatched_responses(self):
+        """Number of responses which couldn't be matched to any request."""
+        return self._dispatch_table.unmatched_responses
 
     def main_listener(self, msg):
         if msg["type"] not in ("normal", "chat"):
@@ -216,30 +410,35 @@ class XMPPBaseConnector:
         if not body:
             return
 
-        def notify_error(body, response):
-            if len(self.listeners) == 1:
-                for listener in self.listeners:
-                    listener(body, response)
-                    break
-
         try:
-            body_arr = body.split("\n")
+            response = decode_response(body)
         except AttributeError:
             return
-        http_response = body_arr[0]
-        if re.match(r"HTTP/1.[0-1] 20*", http_response):
+        if response is None:
+            return
+        if 200 <= response.status < 300:
             try:
-                decrypted_body = self._encryption.json_decrypt(body_arr[-1:][0])
+                decrypted_body = self._encryption.json_decrypt(response.body)
             except EncryptionException:
-                notify_error(body=None, response=WRONG_ENCRYPTION)
+                self._dispatch_table.dispatch(response.seqno, None, WRONG_ENCRYPTION)
             else:
-                for listener in self.listeners:
-                    listener(decrypted_body, http_response)
-            return
-        if re.match(r"HTTP/1.[0-1] 40*", http_response):
-            _LOGGER.info(f"400 HTTP Error - {body_arr}")
-            notify_error(body=BODY_400, response=http_response)
-    
+                if not self._dispatch_table.dispatch(
+                    response.seqno,
+                    decrypted_body,
+                    response.status_line,
+                    no_content=response.no_content,
+                ):
+                    # Fresh value is still good for entity which uses it.
+                    self._harvest(
+                        decrypted_body,
+                        self._dispatch_table.sent_at(response.seqno, decrypted_body),
+                    )
+        elif 400 <= response.status < 500:
+            _LOGGER.info("400 HTTP Error - %s", body)
+            self._dispatch_table.dispatch(
+                response.seqno, BODY_400, response.status_line, status=response.status
+            )
+
     @staticmethod
     def discard_ssl_invalid_chain(event):
         """Do nothing if ssl certificate is invalid."""
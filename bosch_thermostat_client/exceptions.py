@@ -80,3 +80,23 @@ class ResponseException(BoschException):
 
 class EncryptionException(BoschException):
     """Unable to decrypt."""
+
+
+class CircuitOpenException(DeviceException):
+    """Request not sent, because gateway failed too many requests in a row."""
+
+
+class DeadlineExceededException(DeviceException):
+    """Request not sent, because deadline of caller already passed."""
+
+
+class NotFoundException(DeviceException):
+    """Gateway answered that requested URI does not exist."""
+
+
+class ConnectionFailedException(DeviceException):
+    """Request not sent, because connection to gateway failed."""
+
+
+class ResponseTimeoutException(DeviceException):
+    """Request reached gateway, but it didn't answer in time."""
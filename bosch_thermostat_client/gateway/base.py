@@ -4,6 +4,7 @@ import logging
 from typing import Any
 
 from bosch_thermostat_client.circuits import Circuits
+from bosch_thermostat_client.connectors.priority import interactive_read
 from bosch_thermostat_client.const import (
     DATE,
     DHW,
@@ -75,6 +76,7 @@ class BaseGateway:
         """Initialize gateway asynchronously."""
         initial_db = await self.get_base_db()
         await self._update_info(initial_db.get(GATEWAY))
+        self._connector.set_gateway_id(self.uuid or self._host)
         self._firmware_version = self._data[GATEWAY].get(FIRMWARE_VERSION)
         self._device = self.get_device_model(initial_db)
         if self._device and VALUE in self._device:
@@ -157,6 +159,45 @@ class BaseGateway:
         """Set timeout for API calls."""
         self._connector.set_timeout(timeout)
 
+    def set_max_concurrency(self, max_concurrency):
+        """Set how many requests might be sent to gateway at once."""
+        self._connector.set_max_concurrency(max_concurrency)
+
+    @property
+    def cache_stats(self):
+        """Return hits and misses of response cache if it is enabled."""
+        if self._connector.cache is not None:
+            return self._connector.cache.stats
+
+    @property
+    def negative_cache_stats(self):
+        """Return paths known missing on gateway and requests skipped."""
+        if self._connector.negative_cache is not None:
+            return self._connector.negative_cache.stats
+
+    @property
+    def retry_stats(self):
+        """Return retries made and retries refused by budget."""
+        if self._connector.retry_policy is not None:
+            return self._connector.retry_policy.stats
+
+    @property
+    def queue_wait_stats(self):
+        """Return time requests waited for connector per priority class."""
+        return self._connector.queue_wait_stats
+
+    @property
+    def latency_stats(self):
+        """Return latency percentiles and timeouts per path class."""
+        if self._connector.latency_tracker is not None:
+            return self._connector.latency_tracker.stats
+
+    @property
+    def circuit_state(self):
+        """Return state of circuit breaker: closed, open or half_open."""
+        if self._connector.circuit_breaker is not None:
+            return self._connector.circuit_breaker.state
+
     @property
     def access_token(self):
         """Return key to store in config entry."""
@@ -342,6 +383,7 @@ class BaseGateway:
             _LOGGER.debug("Failed to check_connection: %s", err)
         return self.uuid
 
+    @interactive_read
     async def raw_query(self, path):
         """Run RAW query like /gateway/uuid."""
         try:
@@ -46,6 +46,8 @@ class EasycontrolGateway(BaseGateway):
         password=None,
         session=None,
         easycontrol_connector=None,
+        connector=None,
+        **kwargs,
     ):
         """
         Initialize gateway.
@@ -53,23 +55,29 @@ class EasycontrolGateway(BaseGateway):
         :param access_token:
         :param password:
         :param host:
+        :param connector: ready transport to use instead of creating one
+        :param kwargs: extra options passed to connector, eg. max_concurrency
+            or interceptors wrapped around its requests
         :param device_type -> IVT or NEFIT or EASYCONTROL
         """
         self._access_token = access_token.replace("-", "")
         if password:
             access_key = self._access_token
-        if session_type == HTTP:
-            _LOGGER.warn("I'm using HTTP connector. It's probably debug session!")
-            easycontrol_connector = HttpConnector
-        else:
-            easycontrol_connector = EasycontrolConnector
-        self._connector = easycontrol_connector(
-            host=host,
-            loop=session,
-            access_key=self._access_token,
-            encryption=Encryption(access_key, password),
-            device_type=EASYCONTROL,
-        )
+        if connector is None:
+            if session_type == HTTP:
+                _LOGGER.warn("I'm using HTTP connector. It's probably debug session!")
+                easycontrol_connector = HttpConnector
+            else:
+                easycontrol_connector = EasycontrolConnector
+            connector = easycontrol_connector(
+                host=host,
+                loop=session,
+                access_key=self._access_token,
+                encryption=Encryption(access_key, password),
+                device_type=EASYCONTROL,
+                **kwargs,
+            )
+        self._connector = connector
         self._session_type = session_type
         self._data = {GATEWAY: {}, ZN: None, DHW: None, DV: None, SENSORS: None}
         super().__init__(host)
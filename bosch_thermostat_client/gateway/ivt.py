@@ -44,27 +44,37 @@ class IVTGateway(BaseGateway):
         access_key=None,
         password=None,
         session=None,
+        connector=None,
+        **kwargs,
     ):
         """IVT Gateway constructor
 
         Args:
             session (loop): loop or websession
-            session_type (str): either HTTP or XMPP
-            host (str): host IP or hostname for HTTP or serial number for XMPP
+            session_type (str): HTTP, XMPP or HYBRID which uses both
+            host (str): host IP or hostname for HTTP and HYBRID or serial number for XMPP
             access_key (str): access key to Bosch Gateway
             password (str, optional): Password to Bosch Gateway. Defaults to None.
+            connector (Transport, optional): ready transport to use instead of
+                creating connector of session_type, eg. InMemoryTransport.
+            kwargs: extra options passed to connector, eg. max_concurrency,
+                interceptors wrapped around its requests or serial_number
+                of gateway for HYBRID.
         """
         self._access_token = access_token.replace("-", "")
         if password:
             access_key = self._access_token
-        Connector = connector_ivt_chooser(session_type)
         self._session_type = session_type
-        self._connector = Connector(
-            host=host,
-            loop=session,
-            access_key=self._access_token,
-            encryption=Encryption(access_key, password),
-        )
+        if connector is None:
+            Connector = connector_ivt_chooser(session_type)
+            connector = Connector(
+                host=host,
+                loop=session,
+                access_key=self._access_token,
+                encryption=Encryption(access_key, password),
+                **kwargs,
+            )
+        self._connector = connector
         self._data = {GATEWAY: {}, HC: None, DHW: None, SENSORS: None}
         super().__init__(host)
 
@@ -40,6 +40,8 @@ class NefitGateway(BaseGateway):
         access_key=None,
         password=None,
         session=None,
+        connector=None,
+        **kwargs,
     ):
         """
         Initialize gateway.
@@ -47,24 +49,30 @@ class NefitGateway(BaseGateway):
         :param access_token:
         :param password:
         :param host:
+        :param connector: ready transport to use instead of creating one
+        :param kwargs: extra options passed to connector, eg. max_concurrency
+            or interceptors wrapped around its requests
         :param device_type -> NEFIT
         """
         self._access_token = access_token.replace("-", "")
 
         if password:
             access_key = self._access_token
-        if session_type == HTTP:
-            _LOGGER.warn("I'm using HTTP connector. It's probably debug session!")
-            nefit_connector = HttpConnector
-        else:
-            nefit_connector = NefitConnector
-        self._connector = nefit_connector(
-            host=host,
-            loop=session,
-            access_key=self._access_token,
-            encryption=Encryption(access_key, password),
-            device_type=NEFIT,
-        )
+        if connector is None:
+            if session_type == HTTP:
+                _LOGGER.warn("I'm using HTTP connector. It's probably debug session!")
+                nefit_connector = HttpConnector
+            else:
+                nefit_connector = NefitConnector
+            connector = nefit_connector(
+                host=host,
+                loop=session,
+                access_key=self._access_token,
+                encryption=Encryption(access_key, password),
+                device_type=NEFIT,
+                **kwargs,
+            )
+        self._connector = connector
         self._session_type = session_type
         self._data = {GATEWAY: {}, HC: None, DHW: None, SENSORS: None}
         super().__init__(host)
@@ -29,7 +29,8 @@ from bosch_thermostat_client.const import (
 from bosch_thermostat_client.const.easycontrol import STEP_SIZE
 from bosch_thermostat_client.const.ivt import ALLOWED_VALUES, STATE, INVALID
 
-from .exceptions import DeviceException, EncryptionException
+from .connectors.dispatch import path_key
+from .exceptions import DeviceException, EncryptionException, NotFoundException
 import base64
 
 _LOGGER = logging.getLogger(__name__)
@@ -173,6 +174,9 @@ class BoschSingleEntity:
         self._main_data = {NAME: name, ID: attr_id, PATH: path}
         self._data = {}
         self._update_initialized = False
+        self._last_update = None
+        # Keys of data by path whose responses connector routes to entity.
+        self._routed = {}
         self._state = False
         self._parent: BoschSingleEntity | None = parent
         self._extra_message = "Waiting to fetch data"
@@ -229,6 +233,35 @@ class BoschSingleEntity:
         """Inform if we successfully invoked update at least one time."""
         return self._update_initialized
 
+    @property
+    def last_update(self):
+        """Time of last update, also by response which came unasked."""
+        return self._last_update
+
+    def _route_responses(self, keys):
+        """Let connector update keys with responses nobody waits for.
+
+        Eg. response which came after update timed out is still fresh value
+        and saves next poll of its path.
+        """
+        for key in keys:
+            path = path_key(self._data[key].get(URI))
+            if not path:
+                continue
+            routed = self._routed.setdefault(path, [])
+            if key not in routed:
+                routed.append(key)
+                self._connector.add_route(path, self._receive_response)
+
+    def _receive_response(self, path, result):
+        for key in self._routed.get(path, []):
+            self._process_received(key, result)
+        self._last_update = datetime.now()
+
+    def _process_received(self, key, result):
+        """Store result of key which came outside of update."""
+        self.process_results(result=result, key=key)
+
     def get_property(self, property_name):
         """Retrieve JSON with all properties: value, min, max, state etc."""
         return self._data.get(property_name, {}).get(RESULT, {})
@@ -269,18 +302,32 @@ class BoschSingleEntity:
     async def update(self):
         """Update info about Circuit asynchronously."""
         state = False
-        for key, item in self._data.items():
-            if item[TYPE] in self._allowed_types:
-                try:
-                    result = await self._connector.get(item[URI])
-                    self.process_results(result=result, key=key)
-                    state = True
-                except DeviceException as err:
-                    _LOGGER.warning(
-                        f"Can't update data for {self.name}. Trying uri: {item[URI]}. Error message: {err}"
-                    )
+        items = {
+            key: item
+            for key, item in self._data.items()
+            if item[TYPE] in self._allowed_types
+        }
+        self._route_responses(items)
+        results = await self._connector.get_many(
+            [item[URI] for item in items.values()]
+        )
+        for key, item in items.items():
+            result = results[item[URI]]
+            if isinstance(result, NotFoundException):
+                _LOGGER.debug("%s doesn't implement %s", self.name, item[URI])
+            elif isinstance(result, DeviceException):
+                _LOGGER.warning(
+                    f"Can't update data for {self.name}. Trying uri: {item[URI]}. Error message: {result}"
+                )
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                self.process_results(result=result, key=key)
+                state = True
         self._state = state
-        if not state:
+        if state:
+            self._last_update = datetime.now()
+        else:
             self._extra_message = f"Can't update data. Error: {self.name}"
 
 
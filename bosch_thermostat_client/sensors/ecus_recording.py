@@ -91,8 +91,13 @@ class EcusRecordingSensor(Sensor):
             _page = pagination.get(VALUE, self._page_number)
             if type(_page) == int or type(_page) == float:
                 self._page_number = ceil(_page / 32)
-        except DeviceException:
-            pass
+        except DeviceException as err:
+            _LOGGER.debug(
+                "Can't get pagination of %s, using page %s: %s",
+                self.name,
+                self._page_number,
+                err,
+            )
         try:
             if self.page_number > 0:
                 self._entry_data = {}
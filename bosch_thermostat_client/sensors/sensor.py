@@ -1,5 +1,6 @@
 from __future__ import annotations
 import logging
+from datetime import datetime
 from bosch_thermostat_client.exceptions import DeviceException
 from bosch_thermostat_client.helper import BoschSingleEntity, DeviceClassEntity
 from bosch_thermostat_client.const import ID, RESULT, URI, TYPE, REGULAR, VALUE
@@ -60,10 +61,12 @@ class Sensor(BoschSingleEntity, DeviceClassEntity):
         """Update info about Sensor asynchronously."""
         item = self._data[self._main_data[ID]]
         if item[TYPE] in self._allowed_types:
+            self._route_responses([self._main_data[ID]])
             try:
                 result = await self._connector.get(item[URI])
                 self.process_results(result=result, key=self._main_data[ID])
                 self._state = True
+                self._last_update = datetime.now()
             except DeviceException as err:
                 _LOGGER.warning(
                     f"Can't update data for {self.name}. Trying uri: {item[URI]}. Error message: {err}"
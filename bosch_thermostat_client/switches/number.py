@@ -50,3 +50,12 @@ class NumberSwitch(BaseSwitch):
             await self._connector.put(self._data[self.attr_id][URI], value)
             self._data[self.attr_id][RESULT][VALUE] = value
             _LOGGER.debug("Device accepted new value %s.", value)
+
+    def submit_value(self, value):
+        """Start setting number without waiting for gateway.
+
+        Returns completion handle of the write or None if value is out of range.
+        """
+        if self.min_value <= value <= self.max_value:
+            _LOGGER.debug("Submitting number %s.", value)
+            return self._submit(value)
@@ -30,3 +30,12 @@ class SelectSwitch(BaseSwitch):
             await self._connector.put(self._data[self.attr_id][URI], value)
             self._data[self.attr_id][RESULT][VALUE] = value
             _LOGGER.debug("Device accepted new value %s.", value)
+
+    def submit_value(self, value: str):
+        """Start setting value without waiting for gateway.
+
+        Returns completion handle of the write or None if value is not allowed.
+        """
+        if value in self.options:
+            _LOGGER.debug("Submitting value %s.", value)
+            return self._submit(value)
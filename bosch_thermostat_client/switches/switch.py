@@ -46,6 +46,25 @@ class BaseSwitch(BoschSingleEntity):
     def check_state(self, value):
         raise NotImplementedError
 
+    def _submit(self, value):
+        """Start write of value and show it as state right away.
+
+        Returns completion handle of the write. Previous value is restored
+        if gateway doesn't accept the new one.
+        """
+        result = self._data[self.attr_id][RESULT]
+        previous = result.get(VALUE)
+        result[VALUE] = value
+        handle = self._connector.put_nowait(self._data[self.attr_id][URI], value)
+
+        def rollback(task):
+            if task.cancelled() or task.exception() is not None:
+                if result.get(VALUE) == value:
+                    result[VALUE] = previous
+
+        handle.add_done_callback(rollback)
+        return handle
+
 
 class Switch(BaseSwitch):
     """Single switch object."""
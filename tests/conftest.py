@@ -0,0 +1,26 @@
+"""Helpers shared by connector tests."""
+import asyncio
+
+from bosch_thermostat_client.connectors import IVTXMPPConnector
+from bosch_thermostat_client.connectors.session import CONNECTED
+from bosch_thermostat_client.encryption import IVTEncryption
+from tests.xmpp_test_server import connect_to
+
+KEY = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+
+
+def make_xmpp_connector(server, **kwargs):
+    """IVT XMPP connector logging in to local test server, without pings."""
+    kwargs.setdefault("encryption", IVTEncryption(KEY))
+    kwargs.setdefault("access_key", "abc")
+    kwargs.setdefault("keepalive_interval", 0)
+    connector = IVTXMPPConnector(host="123", **kwargs)
+    connect_to(connector, server)
+    return connector
+
+
+async def wait_connected(connector, timeout=5):
+    """Wait until connector has logged in to server."""
+    async with asyncio.timeout(timeout):
+        while connector.connection_state != CONNECTED:
+            await asyncio.sleep(0.01)
@@ -0,0 +1,86 @@
+import asyncio
+import time
+import pytest
+from bosch_thermostat_client.connectors.aimd import AIMDController
+from bosch_thermostat_client.connectors.codec import encode_response
+from bosch_thermostat_client.connectors.store import JsonStore
+from bosch_thermostat_client.exceptions import DeviceException, MsgException
+from tests.conftest import make_xmpp_connector
+from tests.xmpp_test_server import XMPPTestServer
+
+
+def succeed(controller, count):
+    for _ in range(count):
+        controller.record(time.monotonic())
+
+
+def test_additive_increase():
+    controller = AIMDController(max_limit=4)
+    succeed(controller, 1)
+    assert controller.limit == 2
+    succeed(controller, 2)
+    assert controller.limit == 3
+    succeed(controller, 100)
+    assert controller.limit == 4
+
+
+def test_timeout_cuts_limit_once_per_burst():
+    controller = AIMDController(max_limit=8)
+    controller.reset(8)
+    started = time.monotonic()
+    controller.record(started, asyncio.TimeoutError())
+    assert controller.limit == 4
+    controller.record(started, asyncio.TimeoutError())
+    assert controller.limit == 4
+    controller.record(time.monotonic(), asyncio.TimeoutError())
+    assert controller.limit == 2
+
+
+def test_error_burst():
+    controller = AIMDController(max_limit=8, error_burst=3)
+    controller.reset(6)
+    controller.record(time.monotonic(), DeviceException())
+    controller.record(time.monotonic(), MsgException())
+    assert controller.limit == 6
+    controller.record(time.monotonic(), MsgException())
+    assert controller.limit == 3
+
+
+def test_limit_persisted_per_gateway(tmp_path):
+    store = JsonStore(str(tmp_path / "state.json"))
+    controller = AIMDController(max_limit=8, store=store)
+    controller.bind("uuid-1")
+    succeed(controller, 3)
+    assert controller.limit == 3
+    restored = AIMDController(max_limit=8, store=JsonStore(store.path))
+    restored.bind("uuid-1")
+    assert restored.limit == 3
+    other = AIMDController(max_limit=8, store=JsonStore(store.path))
+    other.bind("uuid-2")
+    assert other.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_xmpp_bad_request_backs_off():
+    """Overloaded gateway answers 400, it must not look like success."""
+    server = XMPPTestServer(lambda body: encode_response(400, "Bad Request"))
+    await server.start()
+    autotuner = AIMDController(max_limit=8)
+    connector = make_xmpp_connector(
+        server,
+        max_concurrency=4,
+        autotune=autotuner,
+        retry=False,
+        negative_cache=False,
+    )
+    try:
+        for index in range(10):
+            try:
+                await connector.get(f"/path/{index}")
+            except DeviceException:
+                pass
+        assert autotuner.decreases > 0
+        assert connector.max_concurrency < 4
+    finally:
+        await connector.close(force=False)
+        await server.close()
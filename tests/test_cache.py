@@ -0,0 +1,58 @@
+import pytest
+from bosch_thermostat_client.connectors import cache as cache_module
+from bosch_thermostat_client.connectors import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_per_prefix(clock):
+    cache = ResponseCache(ttl=5, ttls={"/gateway/DateTime": 30, "/system": 0})
+    cache.set("/gateway/DateTime", {"value": "a"})
+    cache.set("/gateway/uuid", {"value": "b"})
+    cache.set("/system/sensors/outdoor", {"value": 1})
+    clock[0] += 10
+    assert cache.get("/gateway/DateTime") == {"value": "a"}
+    assert cache.get("/gateway/uuid") is None
+    assert cache.get("/system/sensors/outdoor") is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 2
+
+
+def test_returns_copy(clock):
+    cache = ResponseCache()
+    cache.set("/gateway/uuid", {"value": "a"})
+    cache.get("/gateway/uuid")["value"] = "-1"
+    assert cache.get("/gateway/uuid") == {"value": "a"}
+
+
+def test_lru_eviction(clock):
+    cache = ResponseCache(max_size=2)
+    cache.set("/a", {})
+    cache.set("/b", {})
+    cache.get("/a")
+    cache.set("/c", {})
+    assert cache.get("/b") is None
+    assert cache.get("/a") == {}
+    assert cache.evictions == 1
+
+
+def test_invalidate_related(clock):
+    cache = ResponseCache()
+    for path in (
+        "/heatingCircuits",
+        "/heatingCircuits/hc1",
+        "/heatingCircuits/hc1/operationMode",
+        "/heatingCircuits/hc1/operationMode?x=1",
+        "/heatingCircuits/hc1/operationModeX",
+        "/heatingCircuits/hc2/operationMode",
+    ):
+        cache.set(path, {})
+    cache.invalidate("/heatingCircuits/hc1/operationMode")
+    assert len(cache) == 2
+    assert cache.get("/heatingCircuits/hc1/operationModeX") == {}
+    assert cache.get("/heatingCircuits/hc2/operationMode") == {}
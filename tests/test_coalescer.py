@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from bosch_thermostat_client.connectors.coalescer import WriteCoalescer
+from bosch_thermostat_client.exceptions import DeviceException
+from tests.test_connector import FakeConnector
+
+
+@pytest.mark.asyncio
+async def test_only_last_value_is_sent():
+    connector = FakeConnector({}, coalesce_writes=WriteCoalescer(window=0.02))
+
+    async def slide(value, delay):
+        await asyncio.sleep(delay)
+        return await connector.put("/hc1/setpoint", value)
+
+    results = await asyncio.gather(*[slide(20 + i, i * 0.002) for i in range(5)])
+    assert results == [True] * 5
+    assert connector.puts == [("/hc1/setpoint", 24)]
+    assert connector.write_coalescer.superseded == 4
+
+
+@pytest.mark.asyncio
+async def test_paths_are_independent():
+    connector = FakeConnector({}, coalesce_writes=WriteCoalescer(window=0.01))
+    await asyncio.gather(connector.put("/a", 1), connector.put("/b", 2))
+    assert sorted(connector.puts) == [("/a", 1), ("/b", 2)]
+
+
+@pytest.mark.asyncio
+async def test_writes_to_path_keep_order():
+    coalescer = WriteCoalescer(window=0)
+    sent = []
+
+    async def send(path, value):
+        await asyncio.sleep(0.02 if value == 1 else 0)
+        sent.append(value)
+        return True
+
+    first = asyncio.create_task(coalescer.put("/a", 1, send))
+    await asyncio.sleep(0.005)
+    await coalescer.put("/a", 2, send)
+    await first
+    assert sent == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_caller():
+    coalescer = WriteCoalescer(window=0.01)
+
+    async def send(path, value):
+        raise DeviceException("Gateway offline")
+
+    results = await asyncio.gather(
+        coalescer.put("/a", 1, send), coalescer.put("/a", 2, send),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, DeviceException) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_send_releases_callers():
+    coalescer = WriteCoalescer(window=0.01)
+
+    async def send(path, value):
+        raise asyncio.CancelledError
+
+    callers = [coalescer.put("/a", value, send) for value in (1, 2)]
+    results = await asyncio.wait_for(
+        asyncio.gather(*callers, return_exceptions=True), 1
+    )
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
@@ -0,0 +1,64 @@
+import pytest
+from bosch_thermostat_client.connectors.codec import (
+    EasycontrolCodec,
+    IVTCodec,
+    NefitCodec,
+    decode_request,
+    decode_response,
+    encode_response,
+)
+from bosch_thermostat_client.const import GET, PUT
+
+FRAMES = [
+    (
+        IVTCodec,
+        "GET /a HTTP/1.1\r\rUser-Agent: TeleHeater\r\rSeq-No: 1\r\r\r\r",
+        "PUT /a HTTP/1.1\r\rUser-Agent: TeleHeater\r\rContent-Type: application/json"
+        "\r\rContent-Length: 4\r\rSeq-No: 2\r\r\r\rabc=",
+    ),
+    (
+        NefitCodec,
+        "GET /a HTTP/1.1\r\rUser-Agent: NefitEasy\r\r\r\r",
+        "PUT /a HTTP/1.1\r\rUser-Agent: NefitEasy\r\rContent-Type: application/json"
+        "\r\rContent-Length: 4\r\r\r\rabc=\r\r\r\r",
+    ),
+    (
+        EasycontrolCodec,
+        "GET /a HTTP/1.1\nUser-Agent: rrc2\nSeq-No: 0\n\n",
+        "PUT /a HTTP/1.1\rUser-Agent: rrc2\rContent-Type: application/json"
+        "\rContent-Length: 4\r\rabc=\r\r",
+    ),
+]
+
+
+@pytest.mark.parametrize("codec_class, get, put", FRAMES)
+def test_requests_keep_device_framing(codec_class, get, put):
+    codec = codec_class()
+    assert codec.encode_request(GET, "/a").message == get
+    assert codec.encode_request(PUT, "/a", b"abc=").message == put
+    assert codec.encode_request(PUT, "/a") is None
+    assert codec.encode_request(GET, "") is None
+
+
+@pytest.mark.parametrize("codec_class, get, put", FRAMES)
+def test_requests_are_decoded(codec_class, get, put):
+    codec = codec_class()
+    sent = codec.encode_request(GET, "/a?x=1")
+    assert decode_request(sent.message) == sent
+    sent = codec.encode_request(PUT, "/b", b"abc=")
+    assert decode_request(sent.message) == sent
+
+
+def test_response_is_parsed():
+    response = decode_response(encode_response(200, "OK", "abc=", seqno=7))
+    assert (response.status, response.seqno, response.body) == (200, 7, "abc=")
+    assert response.headers["content-type"] == "application/json"
+    assert response.status_line == "HTTP/1.0 200 OK"
+
+    response = decode_response("HTTP/1.0 204 No Content\r\nseq-no: 3\r\n\r\n")
+    assert response.no_content
+    assert response.seqno == 3
+
+    response = decode_response("HTTP/1.1 404 Not Found")
+    assert (response.status, response.seqno, response.body) == (404, None, "")
+    assert decode_response("hello\nthere") is None
@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from bosch_thermostat_client.connectors.base import BaseConnector
+from bosch_thermostat_client.connectors.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+from bosch_thermostat_client.connectors.priority import interactive_read
+from bosch_thermostat_client.exceptions import (
+    CircuitOpenException,
+    DeviceException,
+    NotFoundException,
+)
+
+
+class FakeConnector(BaseConnector):
+    def __init__(self, responses, latency=0, **kwargs):
+        super().__init__(encryption=None, **kwargs)
+        self.responses = responses
+        self.latency = latency
+        self.requests = []
+        self.puts = []
+
+    async def _get(self, path):
+        async with self._request_slot("get", path):
+            self.requests.append(path)
+            await asyncio.sleep(self.latency)
+            response = self.responses.get(path)
+            if isinstance(response, Exception):
+                raise response
+        if response is None:
+            raise NotFoundException(f"URI {path} doesn't exist")
+        return response
+
+    async def _put(self, path, value):
+        async with self._request_slot("put", path):
+            await asyncio.sleep(self.latency)
+            self.puts.append((path, value))
+        self.responses[path] = {"id": path, "value": value}
+        return True
+
+    async def get_many(self, paths, concurrency=None):
+        return await self._get_many_parallel(paths, concurrency)
+
+
+@pytest.mark.asyncio
+async def test_get_many_serial_fallback():
+    connector = FakeConnector({"/a": {"value": 1}})
+    results = await BaseConnector.get_many(connector, ["/a", "/missing", "/a"])
+    assert results["/a"] == {"value": 1}
+    assert isinstance(results["/missing"], DeviceException)
+    assert connector.requests == ["/a", "/missing"]
+
+
+@pytest.mark.asyncio
+async def test_get_many_parallel():
+    responses = {f"/{i}": {"value": i} for i in range(8)}
+    connector = FakeConnector(responses, latency=0.05, max_concurrency=8)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await connector.get_many(list(responses) + ["/missing"])
+    assert loop.time() - start < 0.2
+    assert results["/7"] == {"value": 7}
+    assert isinstance(results["/missing"], DeviceException)
+
+
+@pytest.mark.asyncio
+async def test_put_invalidates_cache():
+    connector = FakeConnector({"/a": {"value": 1}}, cache=True)
+    assert await connector.get("/a") == {"value": 1}
+    assert await connector.get("/a") == {"value": 1}
+    assert connector.requests == ["/a"]
+    await connector.put("/a", 2)
+    assert (await connector.get("/a"))["value"] == 2
+    assert connector.cache.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    connector = FakeConnector({"/a": {"value": 1}}, circuit_breaker=breaker)
+    connector.responses["/a"] = TimeoutError()
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            await connector.get("/a")
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenException):
+        await connector.get("/a")
+    assert connector.requests == ["/a", "/a"]
+    await asyncio.sleep(0.05)
+    assert breaker.state == HALF_OPEN
+    connector.responses["/a"] = {"value": 2}
+    assert await connector.get("/a") == {"value": 2}
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_put_jumps_ahead_of_polling():
+    responses = {f"/{i}": {"value": i} for i in range(5)}
+    connector = FakeConnector(responses, latency=0.01)
+    order = []
+
+    async def put_after_polls():
+        await asyncio.sleep(0.005)
+        await connector.put("/0", 7)
+        order.append("put")
+
+    async def poll(path):
+        await connector.get(path)
+        order.append(path)
+
+    await asyncio.gather(put_after_polls(), *[poll(path) for path in responses])
+    assert order.index("put") <= 1
+    assert set(connector.queue_wait_stats) == {"interactive_write", "background"}
+
+
+@pytest.mark.asyncio
+async def test_interactive_read_priority():
+    connector = FakeConnector({"/a": {"value": 1}})
+
+    @interactive_read
+    async def query():
+        return await connector.get("/a")
+
+    assert await query() == {"value": 1}
+    assert list(connector.queue_wait_stats) == ["interactive_read"]
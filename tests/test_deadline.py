@@ -0,0 +1,97 @@
+import asyncio
+import time
+import pytest
+from bosch_thermostat_client.connectors import HttpConnector, InMemoryTransport
+from bosch_thermostat_client.connectors.deadline import (
+    accepts_deadline,
+    current_deadline,
+    request_deadline,
+)
+from bosch_thermostat_client.encryption import IVTEncryption
+from bosch_thermostat_client.exceptions import DeadlineExceededException
+from tests.conftest import KEY, make_xmpp_connector, wait_connected
+from tests.xmpp_test_server import XMPPTestServer
+
+RESPONSES = {path: {"id": path, "value": 1} for path in ("/a", "/b")}
+
+
+@pytest.mark.asyncio
+async def test_queued_request_is_dropped_at_deadline():
+    transport = InMemoryTransport(RESPONSES, latency=0.2)
+    slow = asyncio.create_task(transport.get("/a"))
+    await asyncio.sleep(0)
+    with request_deadline(time.monotonic() + 0.05):
+        with pytest.raises(DeadlineExceededException):
+            await transport.get("/b")
+    await slow
+    assert transport.requests == 1
+    assert transport.expired_requests == 1
+    assert transport.circuit_breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_passed_deadline_sends_nothing():
+    transport = InMemoryTransport(RESPONSES)
+    with request_deadline(time.monotonic() - 1):
+        with pytest.raises(DeadlineExceededException):
+            await transport.get("/a")
+    assert transport.requests == 0
+    assert (await transport.get("/a"))["value"] == 1
+
+
+@pytest.mark.asyncio
+async def test_nested_deadline_only_gets_sooner():
+    @accepts_deadline
+    async def operation(later):
+        with request_deadline(later):
+            return current_deadline()
+
+    assert await operation(200.0, deadline=100.0) == 100.0
+    assert await operation(50.0, deadline=100.0) == 50.0
+    assert await operation(None) is None
+    assert current_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_xmpp_request_frees_slot_and_dispatch_entry():
+    server = XMPPTestServer(lambda body: None)
+    await server.start()
+    connector = make_xmpp_connector(server)
+    try:
+        await wait_connected(connector)
+        task = asyncio.create_task(connector.get("/a"))
+        await asyncio.sleep(0.01)
+        assert len(connector._dispatch_table) == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert len(connector._dispatch_table) == 0
+        assert connector._limiter.in_flight == 0
+    finally:
+        await connector.close(force=False)
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_http_request_is_not_sent_once_deadline_passed(monkeypatch):
+    """aiohttp would take clamped timeout 0 as no timeout at all."""
+    sent = []
+
+    class Session:
+        def get(self, url, **kwargs):
+            sent.append(kwargs)
+            raise AssertionError("request must not be sent")
+
+    connector = HttpConnector("gateway", IVTEncryption(KEY), loop=Session())
+    acquire = connector._acquire
+
+    async def slow_acquire(method, path):
+        # Deadline runs out after slot was granted.
+        await acquire(method, path)
+        await asyncio.sleep(0.06)
+
+    monkeypatch.setattr(connector, "_acquire", slow_acquire)
+    with request_deadline(time.monotonic() + 0.05):
+        with pytest.raises(DeadlineExceededException):
+            await connector.get("/a")
+    assert sent == []
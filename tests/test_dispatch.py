@@ -0,0 +1,72 @@
+import pytest
+from bosch_thermostat_client.connectors.codec import find_seqno, parse_status_line
+from bosch_thermostat_client.connectors.dispatch import DispatchTable, PendingRequest
+from bosch_thermostat_client.const import BODY_400, GET, PUT
+from bosch_thermostat_client.exceptions import MsgException, NotFoundException
+
+
+def test_parse_status_line():
+    assert parse_status_line("HTTP/1.0 204 No Content") == (204, "No Content")
+    assert parse_status_line("HTTP/1.1 404 Not Found\r") == (404, "Not Found")
+    assert parse_status_line("garbage") == (None, None)
+
+
+def test_find_seqno():
+    assert find_seqno("GET /a HTTP/1.1\r\rSeq-No: 17\r\r") == 17
+    assert find_seqno("GET /a HTTP/1.1\r\r") is None
+
+
+@pytest.mark.asyncio
+async def test_dispatch_by_seqno_and_path():
+    table = DispatchTable()
+    first = PendingRequest(GET, "/a", seqno=1)
+    second = PendingRequest(GET, "/recordings/b?interval=2024-01", seqno=None)
+    table.add(first)
+    table.add(second)
+    assert table.dispatch(1, {"id": "/other"}, "HTTP/1.0 200 OK")
+    assert table.dispatch(None, {"id": "/recordings/b"}, "HTTP/1.0 200 OK")
+    assert first.future.result() == {"id": "/other"}
+    assert second.future.result() == {"id": "/recordings/b"}
+
+
+@pytest.mark.asyncio
+async def test_late_and_unmatched():
+    table = DispatchTable()
+    pending = PendingRequest(GET, "/a", seqno=5)
+    table.add(pending)
+    table.remove(pending)
+    assert not table.dispatch(5, {"id": "/a"}, "HTTP/1.0 200 OK")
+    assert not table.dispatch(6, {"id": "/a"}, "HTTP/1.0 200 OK")
+    assert table.late_responses == 1
+    assert table.unmatched_responses == 1
+    assert len(table) == 0
+
+
+@pytest.mark.asyncio
+async def test_put_and_error_without_seqno():
+    table = DispatchTable()
+    put = PendingRequest(PUT, "/a")
+    table.add(put)
+    assert table.dispatch(None, None, "HTTP/1.0 204 No Content", no_content=True)
+    assert put.future.result() is True
+    table.remove(put)
+    get = PendingRequest(GET, "/b")
+    table.add(get)
+    assert table.dispatch(None, BODY_400, "HTTP/1.0 400 Bad Request")
+    with pytest.raises(MsgException):
+        get.future.result()
+
+
+@pytest.mark.asyncio
+async def test_only_404_means_not_found():
+    table = DispatchTable()
+    missing = PendingRequest(GET, "/a", seqno=1)
+    busy = PendingRequest(GET, "/b", seqno=2)
+    table.add(missing)
+    table.add(busy)
+    assert table.dispatch(1, BODY_400, "HTTP/1.0 404 Not Found", status=404)
+    assert table.dispatch(2, BODY_400, "HTTP/1.0 400 Bad Request", status=400)
+    with pytest.raises(NotFoundException):
+        missing.future.result()
+    with pytest.raises(MsgException):
+        busy.future.result()
@@ -0,0 +1,77 @@
+import asyncio
+import json
+import pytest
+from bosch_thermostat_client.connectors.codec import encode_response, find_seqno
+from bosch_thermostat_client.connectors.hedge import HedgePolicy
+from bosch_thermostat_client.connectors.latency import LatencyTracker
+from bosch_thermostat_client.encryption import IVTEncryption
+from tests.conftest import KEY, make_xmpp_connector, wait_connected
+from tests.xmpp_test_server import XMPPTestServer
+
+
+async def start(hedge):
+    """Connector with hedging to server which answers only on demand."""
+    server = XMPPTestServer(lambda body: None)
+    await server.start()
+    tracker = LatencyTracker(min_samples=3)
+    for _ in range(3):
+        tracker.record("get /a", 0.01)
+    connector = make_xmpp_connector(server, hedge=hedge, adaptive_timeout=tracker)
+    await wait_connected(connector)
+    return server, connector
+
+
+def reply(server, msg, value):
+    data = {"id": msg.split(" ")[1], "value": value}
+    body = IVTEncryption(KEY).encrypt(json.dumps(data)).decode()
+    server.push(encode_response(200, "OK", body, seqno=find_seqno(msg)))
+
+
+@pytest.mark.asyncio
+async def test_duplicate_wins():
+    hedge = HedgePolicy(min_delay=0.01)
+    server, connector = await start(hedge)
+    try:
+        task = asyncio.create_task(connector.get("/a/1"))
+        await asyncio.sleep(0.05)
+        sent = server.requests
+        assert len(sent) == 2
+        assert find_seqno(sent[0]) != find_seqno(sent[1])
+        reply(server, sent[1], "hedged")
+        assert (await task)["value"] == "hedged"
+        reply(server, sent[0], "original")
+        await asyncio.sleep(0.05)
+        assert connector.late_responses == 1
+        assert hedge.stats == {"requests": 1, "hedged": 1, "won": 1}
+    finally:
+        await connector.close(force=False)
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_duplicates():
+    server, connector = await start(HedgePolicy(budget=0, burst=1, min_delay=0.01))
+    try:
+        tasks = [asyncio.create_task(connector.get(f"/a/{i}")) for i in range(2)]
+        await asyncio.sleep(0.05)
+        assert len(server.requests) == 3
+        for msg in server.requests:
+            reply(server, msg, 1)
+        await asyncio.gather(*tasks)
+    finally:
+        await connector.close(force=False)
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_put_is_not_hedged():
+    server, connector = await start(HedgePolicy(min_delay=0.01))
+    try:
+        task = asyncio.create_task(connector.put("/a/1", 5))
+        await asyncio.sleep(0.05)
+        assert len(server.requests) == 1
+        server.push("HTTP/1.0 204 No Content\n\n")
+        assert await task
+    finally:
+        await connector.close(force=False)
+        await server.close()
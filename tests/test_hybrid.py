@@ -0,0 +1,117 @@
+import asyncio
+import time
+import pytest
+from bosch_thermostat_client.connectors import IVTHybridConnector, connector_ivt_chooser
+from bosch_thermostat_client.connectors.breaker import CircuitBreaker
+from bosch_thermostat_client.connectors.deadline import request_deadline
+from bosch_thermostat_client.connectors.store import JsonStore
+from bosch_thermostat_client.encryption import IVTEncryption
+from bosch_thermostat_client.exceptions import DeadlineExceededException, DeviceException
+from tests.conftest import KEY
+from tests.test_connector import FakeConnector
+
+
+def make_connector(http, xmpp, **kwargs):
+    return IVTHybridConnector(
+        host="127.0.0.1",
+        access_key="abc",
+        encryption=IVTEncryption(KEY),
+        serial_number="123",
+        transports={"http": http, "xmpp": xmpp},
+        **kwargs,
+    )
+
+
+def test_chooser():
+    assert connector_ivt_chooser("hybrid") is IVTHybridConnector
+
+
+@pytest.mark.asyncio
+async def test_reads_follow_faster_transport():
+    responses = {f"/{i}": {"value": i} for i in range(10)}
+    http = FakeConnector(dict(responses), latency=0.02)
+    xmpp = FakeConnector(dict(responses))
+    connector = make_connector(http, xmpp, probe_interval=0)
+    for path in responses:
+        assert await connector.get(path) == responses[path]
+    assert connector.transport == "xmpp"
+    assert connector.transport_stats["http"]["requests"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_unmeasured_transport_is_only_probed():
+    responses = {f"/{i}": {"value": i} for i in range(5)}
+    http = FakeConnector(dict(responses), latency=0.01)
+    xmpp = FakeConnector({path: DeviceException("timeout") for path in responses})
+    connector = make_connector(http, xmpp, probe_interval=0)
+    for path in responses:
+        assert await connector.get(path) == responses[path]
+        assert connector.transport == "http"
+    await asyncio.sleep(0)
+    stats = connector.transport_stats
+    assert stats["http"]["requests"] == len(responses)
+    assert stats["xmpp"]["latency"] is None
+
+
+@pytest.mark.asyncio
+async def test_read_fails_over():
+    http = FakeConnector({"/a": DeviceException("Connection refused")})
+    xmpp = FakeConnector({"/a": {"value": 1}})
+    connector = make_connector(http, xmpp, probe_interval=3600)
+    assert await connector.get("/a") == {"value": 1}
+    assert connector.transport_stats["http"]["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_past_deadline_does_not_fail_over():
+    http = FakeConnector(
+        {"/a": DeadlineExceededException("deadline"), "/b": {"value": 2}}
+    )
+    xmpp = FakeConnector({"/a": {"value": 1}, "/b": {"value": 2}}, latency=0.01)
+    connector = make_connector(http, xmpp, probe_interval=3600)
+    # First read probes standby transport, the next one doesn't.
+    await connector.get("/b")
+    await asyncio.sleep(0.02)
+    assert connector.transport == "http"
+    with request_deadline(time.monotonic() + 0.05):
+        with pytest.raises(DeadlineExceededException):
+            await connector.get("/a")
+    assert xmpp.requests == ["/b"]
+    assert connector.transport_stats["http"]["failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_write_fails_over_only_if_not_sent():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    http = FakeConnector({"/a": DeviceException("timeout")}, circuit_breaker=breaker)
+    xmpp = FakeConnector({})
+    connector = make_connector(http, xmpp, probe_interval=3600)
+    with pytest.raises(DeviceException):
+        await http.get("/a")
+    await connector.put("/b", 1)
+    assert xmpp.puts == [("/b", 1)]
+    assert connector.transport == "xmpp"
+
+
+@pytest.mark.asyncio
+async def test_transports_persist_to_hybrid_store(tmp_path):
+    state_file = str(tmp_path / "state.json")
+    connector = IVTHybridConnector(
+        host="127.0.0.1",
+        access_key="abc",
+        encryption=IVTEncryption(KEY),
+        serial_number="123",
+        state_file=state_file,
+        autotune=True,
+    )
+    connector.set_gateway_id("gw")
+    learned = {}
+    for name, transport in connector.transports.items():
+        start = transport.autotuner.limit
+        while transport.autotuner.limit == start:
+            transport.autotuner.record(time.monotonic())
+        learned[name] = transport.autotuner.limit
+    await connector.close()
+    store = JsonStore(state_file)
+    for name, limit in learned.items():
+        assert store.load(f"gw/{name}", "concurrency") == limit
@@ -0,0 +1,87 @@
+import pytest
+from bosch_thermostat_client.connectors import InMemoryTransport, Interceptor
+from bosch_thermostat_client.connectors.interceptors import (
+    FaultInjectionInterceptor,
+    MetricsInterceptor,
+    ThrottleInterceptor,
+    build_chain,
+)
+from bosch_thermostat_client.connectors.retry import RetryPolicy
+from bosch_thermostat_client.const import GET, PUT
+from bosch_thermostat_client.exceptions import DeviceException
+
+RESPONSES = {"/a": {"id": "/a", "value": 1}}
+
+
+class Recorder(Interceptor):
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    async def get(self, path, call_next):
+        self.calls.append(self.name)
+        return await call_next(path)
+
+
+class Answer(Interceptor):
+    async def get(self, path, call_next):
+        return {"id": path, "value": "intercepted"}
+
+
+def test_empty_chain_is_terminal():
+    async def terminal(path):
+        return path
+
+    assert build_chain([], "get", terminal) is terminal
+    assert build_chain([Interceptor()], "put", terminal) is terminal
+
+
+@pytest.mark.asyncio
+async def test_interceptors_run_in_order():
+    calls = []
+    transport = InMemoryTransport(
+        RESPONSES, interceptors=[Recorder("first", calls), Recorder("second", calls)]
+    )
+    transport.add_interceptor(Recorder("inner", calls), innermost=True)
+    assert await transport.get("/a") == RESPONSES["/a"]
+    assert calls == ["first", "second", "inner"]
+
+
+@pytest.mark.asyncio
+async def test_interceptor_might_answer_and_be_removed():
+    answer = Answer()
+    transport = InMemoryTransport(RESPONSES, interceptors=[answer])
+    assert (await transport.get("/a"))["value"] == "intercepted"
+    assert transport.requests == 0
+    transport.remove_interceptor(answer)
+    assert (await transport.get("/a"))["value"] == 1
+    with pytest.raises(ValueError):
+        transport.remove_interceptor(answer)
+
+
+@pytest.mark.asyncio
+async def test_injected_faults_are_retried():
+    faults = FaultInjectionInterceptor(rate=1, methods=(GET,))
+    transport = InMemoryTransport(RESPONSES, retry=RetryPolicy(base_delay=0.001))
+    transport.add_interceptor(faults, innermost=True)
+    with pytest.raises(DeviceException):
+        await transport.get("/a")
+    assert faults.injected == 3
+    assert await transport.put("/a", 2)
+
+
+@pytest.mark.asyncio
+async def test_metrics_and_throttle():
+    metrics = MetricsInterceptor()
+    throttle = ThrottleInterceptor(rate=50, burst=1)
+    transport = InMemoryTransport(RESPONSES, interceptors=[metrics, throttle])
+    for _ in range(3):
+        await transport.get("/a")
+    await transport.put("/a", 2)
+    with pytest.raises(DeviceException):
+        await transport.get("/missing")
+    stats = metrics.stats
+    assert stats[GET]["requests"] == 4
+    assert stats[GET]["errors"] == 1
+    assert stats[PUT]["requests"] == 1
+    assert throttle.delayed == 4
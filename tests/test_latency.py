@@ -0,0 +1,48 @@
+import pytest
+from bosch_thermostat_client.connectors.latency import (
+    LatencyTracker,
+    path_class,
+    percentile,
+)
+from tests.test_connector import FakeConnector
+
+
+def test_path_class():
+    assert path_class("/heatingCircuits/hc1/operationMode") == "get /heatingCircuits"
+    assert path_class("/gateway/DateTime?x=1", "put") == "put /gateway"
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([3], 95) == 3
+
+
+def test_timeout_between_floor_and_ceiling():
+    tracker = LatencyTracker(min_samples=5, multiplier=3, floor=1, ceiling=20)
+    key = path_class("/dhwCircuits/dhw1")
+    for _ in range(4):
+        tracker.record(key, 0.1)
+    assert tracker.timeout(key, 10) == 10
+    tracker.record(key, 0.1)
+    assert tracker.timeout(key, 10) == 1
+    for _ in range(5):
+        tracker.record(key, 2)
+    assert tracker.timeout(key, 10) == 6
+    for _ in range(5):
+        tracker.record(key, 50)
+    assert tracker.timeout(key, 10) == 20
+    assert tracker.stats[key]["samples"] == 15
+
+
+@pytest.mark.asyncio
+async def test_connector_derives_timeout():
+    tracker = LatencyTracker(min_samples=3, floor=0.5)
+    connector = FakeConnector({"/a/1": {"value": 1}}, adaptive_timeout=tracker)
+    connector.set_timeout(7)
+    assert connector._timeout_for("get", "/a/1") == 7
+    for _ in range(3):
+        await connector._get("/a/1")
+    assert connector._timeout_for("get", "/a/2") == 0.5
+    assert connector._timeout_for("put", "/a/1") == 7
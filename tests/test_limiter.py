@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from bosch_thermostat_client.connectors.limiter import RequestLimiter
+
+
+async def _hold(limiter, order, name, release):
+    async with limiter:
+        order.append(name)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_serial_by_default():
+    limiter = RequestLimiter()
+    release = asyncio.Event()
+    order = []
+    tasks = [asyncio.create_task(_hold(limiter, order, i, release)) for i in range(3)]
+    await asyncio.sleep(0)
+    assert order == [0]
+    assert limiter.queued == 2
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == [0, 1, 2]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_fifo_with_limit():
+    limiter = RequestLimiter(2)
+    release = asyncio.Event()
+    order = []
+    tasks = [asyncio.create_task(_hold(limiter, order, i, release)) for i in range(5)]
+    await asyncio.sleep(0)
+    assert order == [0, 1]
+    limiter.set_limit(4)
+    await asyncio.sleep(0)
+    assert order == [0, 1, 2, 3]
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    limiter = RequestLimiter()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release()
+    assert limiter.in_flight == 0
+    assert limiter.queued == 0
+    assert not limiter.locked()
+
+
+def test_invalid_limit():
+    with pytest.raises(ValueError):
+        RequestLimiter(0)
+
+
+@pytest.mark.asyncio
+async def test_priority_order():
+    limiter = RequestLimiter()
+    await limiter.acquire()
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+        limiter.release()
+
+    tasks = [
+        asyncio.create_task(request("poll1", 2)),
+        asyncio.create_task(request("poll2", 2)),
+        asyncio.create_task(request("read", 1)),
+        asyncio.create_task(request("write", 0)),
+    ]
+    await asyncio.sleep(0.01)
+    limiter.release()
+    await asyncio.gather(*tasks)
+    assert order == ["write", "read", "poll1", "poll2"]
+    stats = limiter.wait_stats
+    assert stats[2]["count"] == 2
+    assert stats[0]["max"] >= 0.01
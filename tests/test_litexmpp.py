@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from bosch_thermostat_client.connectors.litexmpp import LiteXMPPClient
+from bosch_thermostat_client.encryption import IVTEncryption
+from bosch_thermostat_client.exceptions import FailedAuthException
+from tests.conftest import KEY, make_xmpp_connector
+from tests.xmpp_test_server import XMPPTestServer, bosch_responder
+
+PASSWORD = "C6u9jPue_abc"
+
+
+async def start(lite_client=True, access_key="abc"):
+    encryption = IVTEncryption(KEY)
+    server = XMPPTestServer(bosch_responder(encryption), password=PASSWORD)
+    await server.start()
+    connector = make_xmpp_connector(
+        server,
+        access_key=access_key,
+        encryption=encryption,
+        lite_client=lite_client,
+        min_backoff=0,
+    )
+    return server, connector
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("lite_client", [True, False])
+async def test_requests_over_scram_login(lite_client):
+    server, connector = await start(lite_client)
+    try:
+        assert isinstance(connector.client, LiteXMPPClient) == lite_client
+        assert (await connector.get("/a"))["value"] == 21.5
+        assert await connector.put("/a", 22)
+        await connector._ping()
+        assert server.logins == 1
+    finally:
+        await connector.close(force=False)
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_close_stops_slixmpp_send_loop():
+    server, connector = await start(lite_client=False)
+    try:
+        await connector.get("/a")
+    finally:
+        await connector.close(force=False)
+        await server.close()
+    await asyncio.sleep(0)
+    pending = [task.get_coro().__name__ for task in asyncio.all_tasks()]
+    assert "run_filters" not in pending
+
+
+@pytest.mark.asyncio
+async def test_wrong_password():
+    server, connector = await start(access_key="wrong")
+    try:
+        with pytest.raises(FailedAuthException):
+            await connector.get("/a")
+    finally:
+        await connector.close(force=False)
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_lost_request():
+    server, connector = await start()
+    try:
+        assert (await connector.get("/a"))["id"] == "/a"
+        server.drop_connections()
+        assert (await connector.get("/b"))["id"] == "/b"
+        replayed = connector.replayed_requests
+        server.lose_next_messages()
+        assert (await connector.get("/c"))["id"] == "/c"
+        assert connector.replayed_requests == replayed + 1
+        assert server.logins == 3
+    finally:
+        await connector.close(force=False)
+        await server.close()
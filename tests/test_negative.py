@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from bosch_thermostat_client.connectors import InMemoryTransport
+from bosch_thermostat_client.connectors.codec import decode_request, encode_response
+from bosch_thermostat_client.connectors.negative import NegativeCache
+from bosch_thermostat_client.connectors.store import JsonStore
+from bosch_thermostat_client.exceptions import DeviceException, NotFoundException
+from tests.conftest import make_xmpp_connector
+from tests.xmpp_test_server import XMPPTestServer
+
+RESPONSES = {"/a": {"id": "/a", "value": 1}}
+
+
+def test_reprobe_interval_grows(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("time.time", lambda: now[0])
+    cache = NegativeCache(min_interval=10, max_interval=25)
+    cache.record_missing("/x")
+    assert cache.is_missing("/x")
+    now[0] += 10
+    assert not cache.is_missing("/x")
+    cache.record_missing("/x")
+    now[0] += 19
+    assert cache.is_missing("/x")
+    cache.record_missing("/x")
+    now[0] += 25
+    assert not cache.is_missing("/x")
+    cache.record_found("/x")
+    assert "/x" not in cache
+
+
+@pytest.mark.asyncio
+async def test_missing_path_is_skipped():
+    transport = InMemoryTransport(RESPONSES)
+    for _ in range(3):
+        results = await transport.get_many(["/a", "/missing"])
+        assert isinstance(results["/missing"], NotFoundException)
+    assert transport.requests == 4
+    assert transport.negative_cache.stats == {"missing": 1, "skipped": 2}
+
+
+@pytest.mark.asyncio
+async def test_missing_paths_are_persisted(tmp_path):
+    state_file = str(tmp_path / "state.json")
+    transport = InMemoryTransport(RESPONSES, state_file=state_file)
+    transport.set_gateway_id("123")
+    with pytest.raises(NotFoundException):
+        await transport.get("/missing")
+    # State is written on close at latest.
+    await transport.close()
+
+    restarted = InMemoryTransport(RESPONSES, state_file=state_file)
+    restarted.set_gateway_id("123")
+    with pytest.raises(NotFoundException):
+        await restarted.get("/missing")
+    assert restarted.requests == 0
+    assert "/missing" in JsonStore(state_file).load("123", "missing_paths")
+
+
+def test_paths_recorded_before_bind_are_kept(tmp_path):
+    state_file = str(tmp_path / "state.json")
+    JsonStore(state_file).save("123", "missing_paths", {"/old": [1, 2e9]})
+    cache = NegativeCache(store=JsonStore(state_file))
+    cache.record_missing("/new")
+    cache.bind("123")
+    assert "/old" in cache and "/new" in cache
+    stored = JsonStore(state_file).load("123", "missing_paths")
+    assert set(stored) == {"/old", "/new"}
+
+
+@pytest.mark.asyncio
+async def test_gateways_share_state_file(tmp_path):
+    state_file = str(tmp_path / "state.json")
+    transports = []
+    for gateway_id in ("A", "B"):
+        transport = InMemoryTransport(RESPONSES, state_file=state_file)
+        transport.set_gateway_id(gateway_id)
+        with pytest.raises(NotFoundException):
+            await transport.get(f"/missing/{gateway_id}")
+        transports.append(transport)
+    for transport in transports:
+        await transport.close()
+    store = JsonStore(state_file)
+    assert list(store.load("A", "missing_paths")) == ["/missing/A"]
+    assert list(store.load("B", "missing_paths")) == ["/missing/B"]
+
+
+@pytest.mark.asyncio
+async def test_store_writes_are_batched(tmp_path, monkeypatch):
+    store = JsonStore(str(tmp_path / "state.json"), flush_delay=0.05)
+    writes = []
+    write = store._write
+    monkeypatch.setattr(store, "_write", lambda content: writes.append(write(content)))
+    cache = NegativeCache(store=store)
+    cache.bind("123")
+    for index in range(20):
+        cache.record_missing(f"/missing/{index}")
+    assert store.dirty
+    assert writes == []
+    await asyncio.sleep(0.1)
+    assert not store.dirty
+    assert len(writes) == 1
+    assert len(JsonStore(store.path).load("123", "missing_paths")) == 20
+
+
+@pytest.mark.asyncio
+async def test_xmpp_only_404_marks_path_missing():
+    def respond(body):
+        if decode_request(body).path == "/missing":
+            return encode_response(404, "Not Found")
+        return encode_response(400, "Bad Request")
+
+    server = XMPPTestServer(respond)
+    await server.start()
+    connector = make_xmpp_connector(server, retry=False)
+    try:
+        with pytest.raises(NotFoundException):
+            await connector.get("/missing")
+        for _ in range(2):
+            with pytest.raises(DeviceException) as err:
+                await connector.get("/busy")
+            assert not isinstance(err.value, NotFoundException)
+        assert connector.negative_cache.stats == {"missing": 1, "skipped": 0}
+    finally:
+        await connector.close(force=False)
+        await server.close()
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from bosch_thermostat_client.connectors import InMemoryTransport
+from bosch_thermostat_client.exceptions import DeviceException
+from bosch_thermostat_client.switches.number import NumberSwitch
+
+RESPONSES = {
+    f"/dhwCircuits/dhw1/temp{i}": {
+        "id": f"/dhwCircuits/dhw1/temp{i}",
+        "type": "floatValue",
+        "value": 50,
+        "minValue": 30,
+        "maxValue": 60,
+    }
+    for i in range(5)
+}
+
+
+def make_switch(transport, path):
+    return NumberSwitch(
+        name="temp",
+        connector=transport,
+        attr_id="temp",
+        path=path,
+        result=RESPONSES.get(path, {"value": 50, "minValue": 30, "maxValue": 60}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_writes_are_gathered():
+    transport = InMemoryTransport(RESPONSES, latency=0.01)
+    handles = [transport.put_nowait(path, 55) for path in RESPONSES]
+    assert transport.pending_writes == 5
+    assert not any(handle.done() for handle in handles)
+    assert await asyncio.gather(*handles) == [True] * 5
+    assert transport.pending_writes == 0
+    for path in RESPONSES:
+        assert (await transport.get(path))["value"] == 55
+
+
+@pytest.mark.asyncio
+async def test_switch_state_is_optimistic():
+    transport = InMemoryTransport(RESPONSES, latency=0.01)
+    switch = make_switch(transport, "/dhwCircuits/dhw1/temp0")
+    handle = switch.submit_value(58)
+    assert switch.state == 58
+    assert await handle
+    assert switch.submit_value(99) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_write_restores_state():
+    transport = InMemoryTransport(RESPONSES)
+    switch = make_switch(transport, "/dhwCircuits/dhw1/missing")
+    handle = switch.submit_value(40)
+    assert switch.state == 40
+    with pytest.raises(DeviceException):
+        await handle
+    assert switch.state == 50
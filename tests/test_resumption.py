@@ -0,0 +1,45 @@
+import pytest
+from bosch_thermostat_client.encryption import IVTEncryption
+from tests.conftest import KEY, make_xmpp_connector
+from tests.xmpp_test_server import XMPPTestServer, bosch_responder
+
+
+async def start(resumption):
+    encryption = IVTEncryption(KEY)
+    server = XMPPTestServer(bosch_responder(encryption), resumption=resumption)
+    await server.start()
+    connector = make_xmpp_connector(server, encryption=encryption, min_backoff=0)
+    return server, connector
+
+
+@pytest.mark.asyncio
+async def test_lost_request_is_replayed_on_resumed_stream():
+    server, connector = await start(resumption=True)
+    try:
+        assert (await connector.get("/a"))["value"] == 21.5
+        server.lose_next_messages()
+        assert (await connector.get("/b"))["id"] == "/b"
+        assert connector.resumed_sessions == 1
+        assert connector.replayed_requests == 1
+        assert server.logins == 2
+        assert server.resumed == 1
+        assert [request.split(" ")[1] for request in server.requests] == ["/a", "/b"]
+    finally:
+        await connector.close(force=False)
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_refused_resumption_falls_back_to_new_session():
+    server, connector = await start(resumption=False)
+    try:
+        assert (await connector.get("/a"))["value"] == 21.5
+        server.lose_next_messages()
+        assert (await connector.get("/b"))["id"] == "/b"
+        assert connector.resumed_sessions == 0
+        assert connector.replayed_requests == 1
+        assert server.resumed == 0
+        assert [request.split(" ")[1] for request in server.requests] == ["/a", "/b"]
+    finally:
+        await connector.close(force=False)
+        await server.close()
@@ -0,0 +1,114 @@
+import pytest
+from bosch_thermostat_client.connectors.retry import RetryPolicy
+from bosch_thermostat_client.exceptions import (
+    ConnectionFailedException,
+    DeviceException,
+    NotFoundException,
+    ResponseTimeoutException,
+)
+from tests.conftest import make_xmpp_connector
+from tests.test_connector import FakeConnector
+from tests.xmpp_test_server import XMPPTestServer
+
+
+class FlakyConnector(FakeConnector):
+    def __init__(self, errors, **kwargs):
+        super().__init__({"/a": {"value": 1}}, **kwargs)
+        self.errors = list(errors)
+
+    async def _get(self, path):
+        if self.errors:
+            self.requests.append(path)
+            raise self.errors.pop(0)
+        return await super()._get(path)
+
+    async def _put(self, path, value):
+        if self.errors:
+            self.puts.append(None)
+            raise self.errors.pop(0)
+        return await super()._put(path, value)
+
+
+def policy(**kwargs):
+    return RetryPolicy(base_delay=0.001, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried():
+    connector = FlakyConnector(
+        [DeviceException("timeout"), DeviceException("timeout")], retry=policy()
+    )
+    assert await connector.get("/a") == {"value": 1}
+    assert connector.retry_policy.stats["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_attempts_are_bounded():
+    connector = FlakyConnector([DeviceException("timeout")] * 5, retry=policy())
+    with pytest.raises(DeviceException):
+        await connector.get("/a")
+    assert len(connector.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_missing_path_is_not_retried():
+    connector = FlakyConnector([NotFoundException("404")], retry=policy())
+    with pytest.raises(NotFoundException):
+        await connector.get("/a")
+    assert connector.retry_policy.stats["retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_put_is_retried_only_if_not_sent():
+    connector = FlakyConnector([ConnectionFailedException("refused")], retry=policy())
+    assert await connector.put("/a", 2)
+    assert connector.puts == [None, ("/a", 2)]
+
+    connector = FlakyConnector([DeviceException("timeout")], retry=policy())
+    with pytest.raises(DeviceException):
+        await connector.put("/a", 2)
+    assert connector.puts == [None]
+
+
+@pytest.mark.asyncio
+async def test_budget_limits_retries():
+    connector = FlakyConnector(
+        [DeviceException("timeout")] * 4, retry=policy(budget=0, burst=1)
+    )
+    with pytest.raises(DeviceException):
+        await connector.get("/a")
+    assert connector.retry_policy.stats["retries"] == 1
+    assert connector.retry_policy.stats["exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_xmpp_put_is_retried_when_server_is_unreachable():
+    server = XMPPTestServer(lambda body: None)
+    await server.start()
+    await server.close()
+    policy = RetryPolicy(attempts=2, base_delay=0)
+    connector = make_xmpp_connector(server, retry=policy)
+    try:
+        with pytest.raises(ConnectionFailedException):
+            await connector.put("/a", 1)
+        assert policy.retries == 1
+    finally:
+        await connector.close(force=False)
+
+
+@pytest.mark.asyncio
+async def test_xmpp_get_without_response_is_not_retried():
+    server = XMPPTestServer(lambda body: None)
+    await server.start()
+    policy = RetryPolicy(base_delay=0)
+    connector = make_xmpp_connector(server, adaptive_timeout=False, retry=policy)
+    connector.set_timeout(0.05)
+    try:
+        with pytest.raises(ResponseTimeoutException):
+            await connector.get("/a")
+        assert policy.retries == 0
+        assert len(server.requests) == 1
+    finally:
+        await connector.close(force=False)
+        await server.close()
+        await server.close()
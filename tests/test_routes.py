@@ -0,0 +1,103 @@
+import asyncio
+import time
+import pytest
+from bosch_thermostat_client.connectors import ResponseCache
+from bosch_thermostat_client.connectors.dispatch import DispatchTable, PendingRequest
+from bosch_thermostat_client.connectors.routes import ResponseRoutes
+from bosch_thermostat_client.const import GET
+from bosch_thermostat_client.encryption import IVTEncryption
+from bosch_thermostat_client.exceptions import DeviceException
+from bosch_thermostat_client.sensors.sensor import Sensor
+from tests.conftest import KEY, make_xmpp_connector
+from tests.xmpp_test_server import XMPPTestServer, bosch_responder
+
+
+def test_routes_deliver_by_id():
+    routes = ResponseRoutes()
+    received = []
+    handler = lambda path, data: received.append((path, data))  # noqa: E731
+    routes.add("/a?interval=1", handler)
+    routes.add("/a", handler)
+    assert "/a" in routes
+    assert routes.deliver({"id": "/a", "value": 1})
+    assert not routes.deliver({"id": "/b", "value": 2})
+    assert not routes.deliver(None)
+    assert received == [("/a", {"id": "/a", "value": 1})]
+    assert routes.delivered == 1
+    routes.remove("/a", handler)
+    assert "/a" not in routes
+
+
+def test_response_older_than_write_is_dropped():
+    routes = ResponseRoutes()
+    received = []
+    routes.add("/a", lambda path, data: received.append(data["value"]))
+    sent = time.monotonic()
+    routes.written("/a")
+    assert not routes.deliver({"id": "/a", "value": "old"}, sent)
+    assert routes.deliver({"id": "/a", "value": "new"}, time.monotonic())
+    assert routes.deliver({"id": "/a", "value": "pushed"})
+    assert received == ["new", "pushed"]
+    assert routes.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_response_is_late():
+    table = DispatchTable()
+    pending = PendingRequest(GET, "/a")
+    table.add(pending)
+    assert table.dispatch(None, {"id": "/a", "value": 1}, "HTTP/1.0 200 OK")
+    assert not table.dispatch(None, {"id": "/a", "value": 2}, "HTTP/1.0 200 OK")
+    assert pending.future.result()["value"] == 1
+    assert table.late_responses == 1
+
+
+@pytest.mark.asyncio
+async def test_late_response_updates_sensor():
+    encryption = IVTEncryption(KEY)
+    values = {}
+    server = XMPPTestServer(bosch_responder(encryption, values))
+    await server.start()
+    connector = make_xmpp_connector(
+        server,
+        encryption=encryption,
+        adaptive_timeout=False,
+        retry=False,
+        cache=ResponseCache(ttl=60),
+    )
+    sensor = Sensor(attr_id="temp", path="/temp", name="Temp", connector=connector)
+    try:
+        await sensor.update()
+        assert sensor.state == 21.5
+        first_update = sensor.last_update
+        connector._cache.clear()
+
+        values["/temp"] = 19.0
+        server.latency = 0.2
+        connector.set_timeout(0.05)
+        with pytest.raises(DeviceException):
+            await connector.get("/temp")
+        await asyncio.sleep(0.3)
+        assert sensor.state == 19.0
+        assert sensor.last_update > first_update
+        assert connector.late_responses == 1
+        assert connector.harvested_responses == 1
+
+        # Late response of read sent before write holds overwritten value.
+        values["/temp"] = 17.0
+        with pytest.raises(DeviceException):
+            await connector.get("/temp")
+        connector.set_timeout(1)
+        await connector.put("/temp", 20.0)
+        await asyncio.sleep(0.1)
+        assert sensor.state == 19.0
+        assert connector.harvested_responses == 1
+        server.latency = 0
+
+        # Harvested value isn't cached, next read goes to gateway.
+        requests = len(server.requests)
+        await connector.get("/temp")
+        assert len(server.requests) == requests + 1
+    finally:
+        await connector.close(force=False)
+        await server.close()
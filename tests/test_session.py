@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from bosch_thermostat_client.connectors.session import (
+    BACKOFF,
+    CLOSED,
+    CONNECTED,
+    SessionSupervisor,
+)
+from bosch_thermostat_client.exceptions import (
+    ConnectionFailedException,
+    FailedAuthException,
+)
+
+
+class FakeSession:
+    def __init__(self, failures=0, latency=0.01):
+        self.failures = failures
+        self.latency = latency
+        self.connects = 0
+        self.pings = 0
+        self.ping_ok = True
+        self.aborts = 0
+
+    async def connect(self):
+        self.connects += 1
+        await asyncio.sleep(self.latency)
+        if self.failures:
+            self.failures -= 1
+            raise OSError("Connection refused")
+
+    async def ping(self):
+        self.pings += 1
+        if not self.ping_ok:
+            raise asyncio.TimeoutError
+
+    def abort(self):
+        self.aborts += 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_share_connect():
+    fake = FakeSession()
+    session = SessionSupervisor(fake.connect)
+    await asyncio.gather(*[session.wait_connected(timeout=1) for _ in range(10)])
+    assert fake.connects == 1
+    assert session.state == CONNECTED
+    await session.close()
+    assert session.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff():
+    fake = FakeSession(failures=2)
+    session = SessionSupervisor(fake.connect, min_backoff=0.01, max_backoff=0.02)
+    assert session.start()
+    with pytest.raises(ConnectionFailedException) as err:
+        await session.wait_connected(timeout=1)
+    assert isinstance(err.value.__cause__, OSError)
+    assert session.state == BACKOFF
+    for _ in range(100):
+        if session.state == CONNECTED:
+            break
+        await asyncio.sleep(0.01)
+    assert session.state == CONNECTED
+    assert fake.connects == 3
+    assert session.failed_attempts == 2
+    await session.close()
+
+
+def test_backoff_is_jittered_and_capped():
+    session = SessionSupervisor(None, min_backoff=1, max_backoff=30)
+    delays = [session.backoff(attempt) for attempt in range(10)]
+    assert 0.5 <= delays[0] <= 1
+    assert 4 <= delays[3] <= 8
+    assert all(delay <= 30 for delay in delays)
+
+
+@pytest.mark.asyncio
+async def test_wrong_credentials_not_retried():
+    connects = []
+
+    async def connect():
+        connects.append(1)
+        raise FailedAuthException("Can't authorize")
+
+    session = SessionSupervisor(connect, min_backoff=0.01)
+    with pytest.raises(FailedAuthException):
+        await session.wait_connected(timeout=1)
+    await asyncio.sleep(0.05)
+    assert len(connects) == 1
+
+
+@pytest.mark.asyncio
+async def test_reconnect_after_failed_ping():
+    fake = FakeSession()
+    session = SessionSupervisor(
+        fake.connect,
+        ping=fake.ping,
+        abort=fake.abort,
+        keepalive_interval=0.01,
+        min_backoff=0.01,
+    )
+    await session.wait_connected(timeout=1)
+    await asyncio.sleep(0.03)
+    assert fake.pings >= 1
+    fake.ping_ok = False
+    while not fake.aborts:
+        await asyncio.sleep(0.005)
+    fake.ping_ok = True
+    assert session.state != CONNECTED
+    await session.wait_connected(timeout=1)
+    assert fake.connects == 2
+    await session.close()
+
+
+def test_start_without_loop():
+    session = SessionSupervisor(FakeSession().connect)
+    assert not session.start()
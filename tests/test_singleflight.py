@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from bosch_thermostat_client.connectors.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_result():
+    calls = []
+    release = asyncio.Event()
+
+    async def fetch(path):
+        calls.append(path)
+        await release.wait()
+        return {"id": path}
+
+    single_flight = SingleFlight()
+    tasks = [
+        asyncio.create_task(single_flight.do("/a", fetch, "/a")) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+    assert calls == ["/a"]
+    assert results == [{"id": "/a"}] * 3
+    assert single_flight.shared == 2
+    assert await single_flight.do("/a", fetch, "/a") == {"id": "/a"}
+    assert calls == ["/a", "/a"]
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared():
+    async def fetch():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    single_flight = SingleFlight()
+    results = await asyncio.gather(
+        single_flight.do("/a", fetch),
+        single_flight.do("/a", fetch),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancel_one_waiter_keeps_call_for_others():
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return 1
+
+    single_flight = SingleFlight()
+    first = asyncio.create_task(single_flight.do("/a", fetch))
+    second = asyncio.create_task(single_flight.do("/a", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == 1
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_cancel_last_waiter_cancels_call():
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(10)
+
+    single_flight = SingleFlight()
+    task = asyncio.create_task(single_flight.do("/a", fetch))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+    assert len(single_flight) == 0
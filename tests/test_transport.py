@@ -0,0 +1,66 @@
+import pytest
+from bosch_thermostat_client.connectors import (
+    HttpConnector,
+    InMemoryTransport,
+    Transport,
+)
+from bosch_thermostat_client.encryption import IVTEncryption
+from bosch_thermostat_client.exceptions import DeviceException
+from bosch_thermostat_client.gateway.ivt import IVTGateway
+from tests.conftest import KEY
+
+RESPONSES = {
+    "/gateway/uuid": {"id": "/gateway/uuid", "type": "stringValue", "value": "123"},
+    "/gateway/versionFirmware": {
+        "id": "/gateway/versionFirmware",
+        "type": "stringValue",
+        "value": "01.10.03",
+    },
+    "/system/bus": {"id": "/system/bus", "type": "stringValue", "value": "EMS"},
+    "/system/info": {
+        "id": "/system/info",
+        "type": "arrayData",
+        "values": [{"Id": "67"}],
+    },
+}
+
+
+def test_connectors_are_transports():
+    assert isinstance(InMemoryTransport({}), Transport)
+    assert isinstance(
+        HttpConnector(host="127.0.0.1", encryption=IVTEncryption(KEY), loop=None),
+        Transport,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encrypted", [False, True])
+async def test_get_and_put(encrypted):
+    transport = InMemoryTransport(
+        RESPONSES, encryption=IVTEncryption(KEY), encrypted=encrypted
+    )
+    assert (await transport.get("/gateway/uuid"))["value"] == "123"
+    assert await transport.put("/gateway/uuid", "456")
+    assert (await transport.get("/gateway/uuid"))["value"] == "456"
+    assert RESPONSES["/gateway/uuid"]["value"] == "123"
+    assert transport.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_missing_path_does_not_open_breaker():
+    transport = InMemoryTransport({})
+    for _ in range(10):
+        with pytest.raises(DeviceException):
+            await transport.get("/nothing")
+    assert transport.circuit_breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_gateway_with_injected_transport():
+    transport = InMemoryTransport(RESPONSES)
+    gateway = IVTGateway(
+        session_type="HTTP", host="mem", access_token="abc", connector=transport
+    )
+    await gateway.initialize()
+    assert gateway.uuid == "123"
+    assert gateway.device_name == "RC30 Controller"
@@ -0,0 +1,321 @@
+import asyncio
+import base64
+import functools
+import hashlib
+import hmac
+import itertools
+import os
+import json
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+
+from bosch_thermostat_client.connectors.codec import (
+    NO_CONTENT,
+    decode_request,
+    encode_response,
+)
+from bosch_thermostat_client.connectors.litexmpp import LiteXMPPClient
+from bosch_thermostat_client.const import PUT
+
+STREAM_NS = "http://etherx.jabber.org/streams"
+SASL_NS = "urn:ietf:params:xml:ns:xmpp-sasl"
+BIND_NS = "urn:ietf:params:xml:ns:xmpp-bind"
+SM_NS = "urn:xmpp:sm:3"
+CLIENT_NS = "jabber:client"
+
+
+def bosch_responder(encryption, values=None):
+    """Answer Bosch requests like gateway does, GET with value of path."""
+    values = values if values is not None else {}
+
+    def respond(body):
+        request = decode_request(body)
+        if request.method == PUT:
+            return encode_response(204, NO_CONTENT, seqno=request.seqno)
+        value = values.get(request.path, 21.5)
+        data = {"id": request.path, "type": "floatValue", "value": value}
+        body = encryption.encrypt(json.dumps(data)).decode()
+        return encode_response(200, "OK", body, seqno=request.seqno)
+
+    return respond
+
+
+def connect_to(connector, server):
+    """Point XMPP connector at local test server and allow plain login."""
+    client = connector.client
+    if isinstance(client, LiteXMPPClient):
+        client.allow_unencrypted_plain = True
+    else:
+        client["feature_mechanisms"].unencrypted_plain = True
+    address = ("127.0.0.1", server.port)
+    client.connect = functools.partial(client.connect, address=address)
+
+
+class _StreamState:
+    """What server remembers about resumable stream."""
+
+    def __init__(self, jid):
+        self.jid = jid
+        self.handled = 0
+        self.sent = []
+        self.acked = 0
+
+
+class XMPPTestServer:
+    """Minimal XMPP server standing in for Bosch cloud.
+
+    Supports PLAIN login, resource binding and XEP-0198 stream management.
+    With `password` given, logins are checked and SCRAM-SHA-1 is offered
+    before PLAIN. Every chat message is answered with `respond(body)`,
+    None leaves it unanswered. With `resumption` False, server refuses to
+    resume streams, so clients have to log in again from scratch.
+    Everything server writes is delayed by `latency` seconds to stand in
+    for round trips to the cloud.
+    """
+
+    def __init__(self, respond, resumption=True, latency=0, password=None):
+        self._respond = respond
+        self.password = password
+        self.resumption = resumption
+        self.latency = latency
+        self._streams = {}
+        self._ids = itertools.count(1)
+        self._connections = set()
+        self._lose = 0
+        self._server = None
+        self.port = None
+        self.logins = 0
+        self.resumed = 0
+        self.requests = []
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.drop_connections()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop_connections(self):
+        """Break all connections, like flaky internet does."""
+        for connection in list(self._connections):
+            connection.writer.transport.abort()
+
+    def push(self, body):
+        """Send chat message to every logged in client, eg. late answer."""
+        for connection in list(self._connections):
+            if connection.jid:
+                connection.chat(body)
+
+    def lose_next_messages(self, count=1):
+        """Drop connection instead of handling next `count` messages."""
+        self._lose = count
+
+    async def _handle(self, reader, writer):
+        connection = _Connection(self, writer)
+        self._connections.add(connection)
+        try:
+            while data := await reader.read(65536):
+                connection.feed(data)
+        except (ConnectionError, ET.ParseError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+
+class _Connection:
+    def __init__(self, server, writer):
+        self.server = server
+        self.writer = writer
+        self.user = None
+        self.domain = None
+        self.jid = None
+        self.stream = None
+        self.gateway = ""
+        self._scram = None
+        self._restart()
+
+    def _restart(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._depth = 0
+        self._root = None
+        self._restart_pending = False
+
+    def send(self, xml, count=False):
+        if count and self.stream is not None:
+            self.stream.sent.append(xml)
+        if self.server.latency:
+            asyncio.get_running_loop().call_later(
+                self.server.latency, self._write, xml.encode()
+            )
+        else:
+            self._write(xml.encode())
+
+    def _write(self, data):
+        if not self.writer.transport.is_closing():
+            self.writer.write(data)
+
+    def feed(self, data):
+        self._parser.feed(data)
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._depth += 1
+                if element.tag == f"{{{STREAM_NS}}}stream":
+                    self._root = element
+                    self.domain = element.get("to")
+                    self._open_stream()
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._write(b"</stream:stream>")
+                    self.writer.close()
+                    return
+                if self._depth == 1:
+                    self._handle(element)
+                    del self._root[:]
+                    if self._restart_pending:
+                        self._restart()
+                        return
+
+    def _open_stream(self):
+        self.send(
+            "<?xml version='1.0'?><stream:stream xmlns='jabber:client' "
+            f"xmlns:stream='{STREAM_NS}' from='{self.domain}' "
+            f"id='s{next(self.server._ids)}' version='1.0'>"
+        )
+        if self.user is None:
+            mechanisms = ["SCRAM-SHA-1", "PLAIN"] if self.server.password else ["PLAIN"]
+            features = f"<mechanisms xmlns='{SASL_NS}'>" + "".join(
+                f"<mechanism>{mechanism}</mechanism>" for mechanism in mechanisms
+            ) + "</mechanisms>"
+        else:
+            features = f"<bind xmlns='{BIND_NS}'/><sm xmlns='{SM_NS}'/>"
+        self.send(f"<stream:features>{features}</stream:features>")
+
+    def _handle(self, element):
+        tag = element.tag
+        if tag == f"{{{SASL_NS}}}auth":
+            data = base64.b64decode(element.text)
+            if element.get("mechanism") == "SCRAM-SHA-1":
+                self._scram_first(data.decode())
+            else:
+                _, user, password = data.decode().split("\0")
+                self._login(user, self.server.password in (None, password))
+        elif tag == f"{{{SASL_NS}}}response":
+            self._scram_final(base64.b64decode(element.text).decode())
+        elif tag == f"{{{SM_NS}}}enable":
+            sm_id = f"sm{next(self.server._ids)}"
+            self.stream = self.server._streams[sm_id] = _StreamState(self.jid)
+            self.send(f"<enabled xmlns='{SM_NS}' id='{sm_id}' resume='true'/>")
+        elif tag == f"{{{SM_NS}}}resume":
+            self._resume(element)
+        elif tag == f"{{{SM_NS}}}r":
+            self.send(f"<a xmlns='{SM_NS}' h='{self.stream.handled}'/>")
+        elif tag == f"{{{SM_NS}}}a":
+            self.stream.acked = int(element.get("h"))
+        elif tag == f"{{{CLIENT_NS}}}iq":
+            self._count()
+            self._iq(element)
+        elif tag == f"{{{CLIENT_NS}}}presence":
+            self._count()
+        elif tag == f"{{{CLIENT_NS}}}message":
+            if self.server._lose:
+                self.server._lose -= 1
+                self.writer.transport.abort()
+                return
+            self._count()
+            self._message(element)
+
+    def _login(self, user, success, data=b""):
+        if not success:
+            self.send(f"<failure xmlns='{SASL_NS}'><not-authorized/></failure>")
+            return
+        self.user = user
+        self.server.logins += 1
+        self._restart_pending = True
+        success = base64.b64encode(data).decode()
+        self.send(f"<success xmlns='{SASL_NS}'>{success}</success>")
+
+    def _scram_first(self, client_first):
+        bare = client_first.split(",", 2)[2]
+        fields = dict(item.split("=", 1) for item in bare.split(","))
+        salt = os.urandom(16)
+        server_first = (
+            f"r={fields['r']}{base64.b64encode(os.urandom(12)).decode()},"
+            f"s={base64.b64encode(salt).decode()},i=4096"
+        )
+        self._scram = (fields["n"], bare, server_first, salt)
+        challenge = base64.b64encode(server_first.encode()).decode()
+        self.send(f"<challenge xmlns='{SASL_NS}'>{challenge}</challenge>")
+
+    def _scram_final(self, client_final):
+        user, bare, server_first, salt = self._scram
+        final_bare, _, proof = client_final.rpartition(",p=")
+        auth_message = f"{bare},{server_first},{final_bare}".encode()
+        salted = hashlib.pbkdf2_hmac("sha1", self.server.password.encode(), salt, 4096)
+        client_key = hmac.digest(salted, b"Client Key", "sha1")
+        signature = hmac.digest(hashlib.sha1(client_key).digest(), auth_message, "sha1")
+        expected = bytes(a ^ b for a, b in zip(client_key, signature))
+        server_key = hmac.digest(salted, b"Server Key", "sha1")
+        server_signature = hmac.digest(server_key, auth_message, "sha1")
+        self._login(
+            user,
+            base64.b64decode(proof) == expected,
+            b"v=" + base64.b64encode(server_signature),
+        )
+
+    def _count(self):
+        if self.stream is not None:
+            self.stream.handled += 1
+
+    def _resume(self, element):
+        stream = self.server._streams.get(element.get("previd"))
+        if not self.server.resumption or stream is None:
+            self.send(
+                f"<failed xmlns='{SM_NS}'><item-not-found "
+                "xmlns='urn:ietf:params:xml:ns:xmpp-stanzas'/></failed>"
+            )
+            return
+        self.server.resumed += 1
+        self.stream = stream
+        self.jid = stream.jid
+        self.send(
+            f"<resumed xmlns='{SM_NS}' previd='{element.get('previd')}' "
+            f"h='{stream.handled}'/>"
+        )
+        unacked = stream.sent[int(element.get("h")) :]
+        stream.sent = stream.sent[: int(element.get("h"))]
+        for xml in unacked:
+            self.send(xml, count=True)
+
+    def _iq(self, element):
+        iq_id = quoteattr(element.get("id", ""))
+        bind = element.find(f"{{{BIND_NS}}}bind")
+        if bind is not None:
+            resource = bind.findtext(f"{{{BIND_NS}}}resource") or "res"
+            self.jid = f"{self.user}@{self.domain}/{resource}"
+            self.send(
+                f"<iq type='result' id={iq_id}><bind xmlns='{BIND_NS}'>"
+                f"<jid>{self.jid}</jid></bind></iq>",
+                count=True,
+            )
+        elif element.get("type") in ("get", "set"):
+            self.send(f"<iq type='result' id={iq_id}/>", count=True)
+
+    def _message(self, element):
+        body = element.findtext(f"{{{CLIENT_NS}}}body")
+        self.gateway = element.get("to", "")
+        self.server.requests.append(body)
+        response = self.server._respond(body)
+        if response is not None:
+            self.chat(response)
+
+    def chat(self, body):
+        self.send(
+            f"<message from={quoteattr(self.gateway)} "
+            f"to={quoteattr(self.jid)} type='chat'>"
+            f"<body>{escape(body)}</body></message>",
+            count=True,
+        )